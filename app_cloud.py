@@ -43,35 +43,26 @@ if page == "📊 数据概览":
     col1, col2, col3, col4 = st.columns(4)
     
     # 获取统计数据
-    strategies = db.get_strategies()
-    investors = db.get_investors()
-    products = db.get_products()
-    nav_records = db.get_nav_records()
+    counts = db.get_table_counts()
     
     with col1:
-        st.metric("策略数量", len(strategies))
+        st.metric("策略数量", counts['strategies'])
     
     with col2:
-        st.metric("投资人数量", len(investors))
+        st.metric("投资人数量", counts['investors'])
     
     with col3:
-        st.metric("产品数量", len(products))
+        st.metric("产品数量", counts['products'])
     
     with col4:
-        st.metric("净值记录数", len(nav_records))
+        st.metric("净值记录数", counts['nav_records'])
     
     st.markdown("---")
     
     # 最新净值记录
-    if not nav_records.empty:
+    latest_records = db.get_latest_navs()
+    if not latest_records.empty:
         st.subheader("最新净值记录")
-        latest_records = nav_records.groupby('strategy_id').last().reset_index()
-        
-        if not strategies.empty:
-            # 合并策略名称
-            strategies_dict = {row['id']: row['name'] for _, row in strategies.iterrows()}
-            latest_records['strategy_name'] = latest_records['strategy_id'].map(strategies_dict)
-        
         display_df = latest_records[['strategy_name', 'date', 'nav_value', 'return_rate']].copy()
         display_df.columns = ['策略名称', '日期', '净值', '收益率(%)']
         if 'return_rate' in display_df.columns:
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+"""
+应用页面
+每个侧边栏页面是一个模块，提供 render(db)；页面模块在第一次打开时才导入，
+plotly 等只有部分页面使用的库随页面模块导入，不影响启动和其他页面的重新运行
+"""
+
+import importlib
+
+# 侧边栏页面名称 -> 页面模块
+PAGES = {
+    "📊 数据概览": "overview",
+    "🎯 策略管理": "strategies",
+    "📝 净值录入": "nav_entry",
+    "👥 投资人管理": "investors",
+    "📦 产品管理": "products",
+    "📈 图表分析": "charts",
+    "生成示例数据": "sample_data",
+}
+
+def render(page: str, db):
+    """导入（已导入时直接使用）页面模块并渲染"""
+    importlib.import_module(f"{__name__}.{PAGES[page]}").render(db)
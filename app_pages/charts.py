@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+"""图表分析页面：净值曲线、收益率分析、策略对比"""
+
+from datetime import datetime
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from downsample import line_trace
+from nav_engine import strategy_stats
+
+def render(db):
+    st.header("图表分析")
+    
+    # 策略列表和收益率分析用的全部净值互不依赖，同时读取
+    strategies, return_data = db.gather(
+        lambda: db.get_strategies(columns=['id', 'name', 'initial_nav']),
+        lambda: db.get_nav_records(columns=['strategy_id', 'nav_value', 'return_rate'])
+    )
+    
+    if strategies.empty:
+        st.warning("暂无策略数据，请先添加策略和净值记录")
+    else:
+        tab1, tab2, tab3 = st.tabs(["净值曲线", "收益率分析", "策略对比"])
+        
+        with tab1:
+            st.subheader("净值曲线图")
+            
+            # 策略选择
+            strategy_options = dict(zip(strategies['name'], strategies['id']))
+            selected_strategies = st.multiselect(
+                "选择要显示的策略", 
+                options=list(strategy_options.keys()),
+                default=list(strategy_options.keys())[:3]  # 默认选择前3个
+            )
+            
+            if selected_strategies:
+                # 日期范围选择
+                col1, col2 = st.columns(2)
+                with col1:
+                    start_date = st.date_input("开始日期")
+                with col2:
+                    end_date = st.date_input("结束日期", value=datetime.now().date())
+                
+                # 只读取选中策略的净值，从缓存的记录中按日期筛选，调整日期范围不重新查询
+                selected_strategy_ids = [strategy_options[name] for name in selected_strategies]
+                nav_data = db.get_nav_window(start_date=start_date, end_date=end_date,
+                                             columns=['strategy_id', 'strategy_name', 'date', 'nav_value', 'return_rate'],
+                                             strategy_ids=selected_strategy_ids)
+                
+                if not nav_data.empty:
+                    # 绘制净值曲线
+                    fig = go.Figure()
+                    
+                    for strategy_name in selected_strategies:
+                        strategy_id = strategy_options[strategy_name]
+                        strategy_data = nav_data[nav_data['strategy_id'] == strategy_id]
+                        
+                        # 按像素预算降采样，点数多时用 WebGL 绘制
+                        fig.add_trace(line_trace(
+                            strategy_data['date'],
+                            strategy_data['nav_value'],
+                            strategy_name,
+                            mode='lines+markers',
+                            line=dict(width=2),
+                            marker=dict(size=4)
+                        ))
+                    
+                    fig.update_layout(
+                        title="策略净值曲线",
+                        xaxis_title="日期",
+                        yaxis_title="净值",
+                        hovermode='x unified',
+                        height=500
+                    )
+                    
+                    st.plotly_chart(fig, use_container_width=True)
+                    
+                    # 显示净值数据表
+                    st.subheader("净值数据详情")
+                    display_data = nav_data[['strategy_name', 'date', 'nav_value', 'return_rate']].copy()
+                    display_data.columns = ['策略名称', '日期', '净值', '收益率(%)']
+                    display_data['收益率(%)'] = display_data['收益率(%)'].round(2)
+                    st.dataframe(display_data, use_container_width=True)
+                else:
+                    st.info("选定日期范围内没有净值数据")
+        
+        with tab2:
+            st.subheader("收益率分析")
+            
+            # 统计表包含全部策略；策略名称按 id 在本地对应，不随每条记录读取
+            if not return_data.empty:
+                # 计算各策略的统计指标（一次分组归约），按策略列表的顺序显示有收益率的策略
+                stats = strategy_stats(return_data, dict(zip(strategies['id'], strategies['initial_nav'])))
+                stats = strategies[['id', 'name']].merge(stats, left_on='id', right_on='strategy_id')
+                stats = stats[stats['return_count'] > 0]
+                
+                if not stats.empty:
+                    stats_df = pd.DataFrame({
+                        '策略名称': stats['name'],
+                        '累计收益率(%)': stats['cumulative_return'].round(2),
+                        '平均收益率(%)': stats['mean_return'].round(2),
+                        '收益率波动率(%)': stats['return_std'].round(2),
+                        '最大收益率(%)': stats['max_return'].round(2),
+                        '最小收益率(%)': stats['min_return'].round(2),
+                        '记录数量': stats['record_count']
+                    }).reset_index(drop=True)
+                    st.dataframe(stats_df, use_container_width=True)
+                    
+                    # 收益率分布图
+                    if len(selected_strategies) > 0:
+                        selected_strategy_ids = [strategy_options[name] for name in selected_strategies if name in strategy_options]
+                        filtered_returns = return_data[return_data['strategy_id'].isin(selected_strategy_ids) & return_data['return_rate'].notna()]
+                        filtered_returns = filtered_returns.assign(
+                            strategy_name=filtered_returns['strategy_id'].map(dict(zip(strategies['id'], strategies['name']))))
+                        
+                        if not filtered_returns.empty:
+                            fig = px.histogram(
+                                filtered_returns,
+                                x='return_rate',
+                                color='strategy_name',
+                                title="收益率分布图",
+                                nbins=20,
+                                opacity=0.7
+                            )
+                            fig.update_layout(xaxis_title="收益率(%)", yaxis_title="频次")
+                            st.plotly_chart(fig, use_container_width=True)
+                else:
+                    st.info("暂无足够数据进行统计分析")
+            else:
+                st.info("暂无净值数据")
+        
+        with tab3:
+            st.subheader("策略对比分析")
+            
+            if len(strategies) >= 2:
+                # 选择要对比的策略
+                compare_strategies = st.multiselect(
+                    "选择要对比的策略（最多4个）",
+                    options=list(strategy_options.keys()),
+                    default=list(strategy_options.keys())[:2],
+                    max_selections=4
+                )
+                
+                if len(compare_strategies) >= 2:
+                    nav_data = db.get_nav_records(columns=['strategy_id', 'date', 'nav_value'],
+                                                  strategy_ids=[strategy_options[name] for name in compare_strategies])
+                    
+                    if not nav_data.empty:
+                        # 创建对比图表
+                        fig = go.Figure()
+                        
+                        for strategy_name in compare_strategies:
+                            strategy_id = strategy_options[strategy_name]
+                            strategy_data = nav_data[nav_data['strategy_id'] == strategy_id].copy()
+                            
+                            if not strategy_data.empty:
+                                # 计算累计收益率
+                                initial_nav = strategies[strategies['id'] == strategy_id]['initial_nav'].iloc[0]
+                                strategy_data['cumulative_return'] = (strategy_data['nav_value'] / initial_nav - 1) * 100
+                                
+                                fig.add_trace(line_trace(
+                                    strategy_data['date'],
+                                    strategy_data['cumulative_return'],
+                                    strategy_name,
+                                    mode='lines+markers',
+                                    line=dict(width=2),
+                                    marker=dict(size=4)
+                                ))
+                        
+                        fig.update_layout(
+                            title="策略累计收益率对比",
+                            xaxis_title="日期",
+                            yaxis_title="累计收益率(%)",
+                            hovermode='x unified',
+                            height=500
+                        )
+                        
+                        st.plotly_chart(fig, use_container_width=True)
+                        
+                        # 策略相关性分析（如果有足够数据）
+                        if len(compare_strategies) >= 2:
+                            returns_pivot = db.get_nav_panel().returns_matrix(
+                                [strategy_options[name] for name in compare_strategies]
+                            ).dropna()
+                            strategy_names = {strategy_id: name for name, strategy_id in strategy_options.items()}
+                            returns_pivot = returns_pivot.rename(columns=strategy_names)
+                            
+                            if len(returns_pivot) > 1:
+                                correlation_matrix = returns_pivot.corr()
+                                
+                                fig_corr = px.imshow(
+                                    correlation_matrix,
+                                    title="策略收益率相关性矩阵",
+                                    color_continuous_scale="RdBu",
+                                    aspect="auto"
+                                )
+                                
+                                st.plotly_chart(fig_corr, use_container_width=True)
+                    else:
+                        st.info("暂无净值数据")
+                else:
+                    st.info("请至少选择2个策略进行对比")
+            else:
+                st.info("需要至少2个策略才能进行对比分析")
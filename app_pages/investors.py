@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+
+"""投资人管理页面：投资人列表和投资汇总、添加投资人、申购赎回、持仓查询"""
+
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+def render(db):
+    st.header("投资人管理")
+    
+    # 各标签页的列表和汇总互不依赖，同时读取（标签页内容在每次运行时都会渲染）
+    investors, portfolios, products = db.gather(
+        db.get_investors,
+        db.get_all_portfolios,
+        lambda: db.get_products(columns=['id', 'name'])
+    )
+    
+    tab1, tab2, tab3, tab4 = st.tabs(["投资人列表", "添加投资人", "投资申购", "持仓查询"])
+    
+    with tab1:
+        st.subheader("投资人列表")
+        
+        if not investors.empty:
+            display_df = investors[['name', 'contact', 'created_at']].copy()
+            display_df.columns = ['姓名', '联系方式', '创建时间']
+            st.dataframe(display_df, use_container_width=True)
+            
+            # 显示投资汇总信息
+            st.subheader("投资汇总")
+            
+            if not portfolios.empty:
+                summary = portfolios.groupby(['investor_id', 'investor_name'], sort=False).agg(
+                    total_investment=('total_investment', 'sum'),
+                    total_current_value=('current_value', 'sum')
+                ).reset_index()
+                summary['total_profit'] = summary['total_current_value'] - summary['total_investment']
+                invested = summary['total_investment'].where(summary['total_investment'] > 0)
+                summary['total_profit_rate'] = (summary['total_profit'] / invested * 100).fillna(0.0)
+                
+                summary_df = pd.DataFrame({
+                    '投资人': summary['investor_name'],
+                    '总投资金额': summary['total_investment'].map(lambda x: f"¥{x:,.2f}"),
+                    '当前市值': summary['total_current_value'].map(lambda x: f"¥{x:,.2f}"),
+                    '盈亏金额': summary['total_profit'].map(lambda x: f"¥{x:,.2f}"),
+                    '收益率': summary['total_profit_rate'].map(lambda x: f"{x:.2f}%")
+                })
+                st.dataframe(summary_df, use_container_width=True)
+        else:
+            st.info("暂无投资人数据")
+    
+    with tab2:
+        st.subheader("添加投资人")
+        
+        with st.form("add_investor_form"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                investor_name = st.text_input("投资人姓名*", placeholder="请输入投资人姓名")
+            
+            with col2:
+                contact = st.text_input("联系方式", placeholder="电话或邮箱")
+            
+            submitted = st.form_submit_button("添加投资人", type="primary")
+            
+            if submitted:
+                if investor_name:
+                    try:
+                        db.add_investor(investor_name, contact)
+                        st.success(f"投资人 '{investor_name}' 添加成功！")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"添加投资人失败：{str(e)}")
+                else:
+                    st.error("请输入投资人姓名")
+    
+    with tab3:
+        st.subheader("投资申购/赎回")
+        
+        if investors.empty or products.empty:
+            st.warning("请先添加投资人和产品")
+        else:
+            with st.form("investment_form"):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    # 投资人选择
+                    investor_options = dict(zip(investors['name'], investors['id']))
+                    selected_investor = st.selectbox("选择投资人", options=list(investor_options.keys()))
+                
+                with col2:
+                    # 产品选择
+                    product_options = dict(zip(products['name'], products['id']))
+                    selected_product = st.selectbox("选择产品", options=list(product_options.keys()))
+                
+                with col3:
+                    # 交易类型
+                    transaction_type = st.selectbox("交易类型", ["申购", "赎回"])
+                
+                col4, col5, col6 = st.columns(3)
+                
+                with col4:
+                    investment_date = st.date_input("投资日期", value=datetime.now().date())
+                    # 统一将日期转为字符串，避免下游JSON序列化错误
+                    investment_date_str = investment_date.isoformat() if hasattr(investment_date, 'isoformat') else str(investment_date)
+                
+                with col5:
+                    amount = st.number_input("金额", value=1000.0, min_value=0.01, step=1000.0)
+                
+                with col6:
+                    # 显示当前产品净值
+                    if selected_product:
+                        product_id = product_options[selected_product]
+                        try:
+                            current_nav = db.calculate_product_nav(product_id, investment_date_str)
+                        except Exception:
+                            # 若出现序列化错误或网络问题，退回到默认净值
+                            current_nav = 1.0
+                        st.metric("产品净值", f"{current_nav:.3f}")
+                    else:
+                        current_nav = 1.0
+                
+                submitted = st.form_submit_button("确认交易", type="primary")
+                
+                if submitted:
+                    if amount > 0:
+                        try:
+                            investor_id = investor_options[selected_investor]
+                            product_id = product_options[selected_product]
+                            
+                            # 赎回时金额为负数
+                            final_amount = amount if transaction_type == "申购" else -amount
+                            transaction_type_en = "investment" if transaction_type == "申购" else "redemption"
+                            
+                            # 统一传入字符串日期，避免云端API JSON序列化错误
+                            db.add_investment(investor_id, product_id, final_amount, investment_date_str, transaction_type_en)
+                            
+                            shares = final_amount / current_nav
+                            st.success(f"""
+                            {transaction_type}成功！
+                            - 投资人：{selected_investor}
+                            - 产品：{selected_product}
+                            - 金额：¥{amount:,.2f}
+                            - 份额：{shares:.4f}
+                            - 净值：{current_nav:.4f}
+                            """)
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"交易失败：{str(e)}")
+                    else:
+                        st.error("请输入有效金额")
+    
+    with tab4:
+        st.subheader("持仓查询")
+        
+        if investors.empty:
+            st.warning("暂无投资人数据")
+        else:
+            # 投资人选择
+            investor_options = dict(zip(investors['name'], investors['id']))
+            selected_investor = st.selectbox("选择投资人", options=list(investor_options.keys()), key="portfolio_investor")
+            
+            if selected_investor:
+                investor_id = investor_options[selected_investor]
+                
+                # 显示持仓信息
+                portfolio = db.get_investor_portfolio(investor_id)
+                
+                if not portfolio.empty:
+                    st.subheader(f"{selected_investor} 的持仓信息")
+                    
+                    # 格式化显示数据
+                    display_portfolio = portfolio.copy()
+                    display_portfolio['总投资金额'] = display_portfolio['total_investment'].apply(lambda x: f"¥{x:,.2f}")
+                    display_portfolio['持有份额'] = display_portfolio['total_shares'].apply(lambda x: f"{x:.4f}")
+                    display_portfolio['当前净值'] = display_portfolio['current_nav'].apply(lambda x: f"{x:.3f}")
+                    display_portfolio['当前市值'] = display_portfolio['current_value'].apply(lambda x: f"¥{x:,.2f}")
+                    display_portfolio['盈亏金额'] = display_portfolio['profit_loss'].apply(lambda x: f"¥{x:,.2f}")
+                    display_portfolio['收益率'] = display_portfolio['profit_rate'].apply(lambda x: f"{x:.2f}%")
+                    
+                    final_display = display_portfolio[['product_name', '总投资金额', '持有份额', '当前净值', '当前市值', '盈亏金额', '收益率']].copy()
+                    final_display.columns = ['产品名称', '总投资金额', '持有份额', '当前净值', '当前市值', '盈亏金额', '收益率(%)']
+                    
+                    st.dataframe(final_display, use_container_width=True)
+                    
+                    # 投资历史记录
+                    st.subheader("投资历史记录")
+                    investments = db.get_investor_investments(
+                        investor_id, columns=['investment_date', 'product_name', 'type', 'amount', 'shares', 'nav_at_investment'])
+                    
+                    if not investments.empty:
+                        display_investments = investments[['investment_date', 'product_name', 'type', 'amount', 'shares', 'nav_at_investment']].copy()
+                        display_investments.columns = ['投资日期', '产品名称', '交易类型', '金额', '份额', '交易净值']
+                        display_investments['交易类型'] = display_investments['交易类型'].map({'investment': '申购', 'redemption': '赎回'})
+                        display_investments['金额'] = display_investments['金额'].apply(lambda x: f"¥{x:,.2f}")
+                        display_investments['份额'] = display_investments['份额'].apply(lambda x: f"{x:.4f}")
+                        display_investments['交易净值'] = display_investments['交易净值'].apply(lambda x: f"{x:.3f}")
+                        
+                        st.dataframe(display_investments, use_container_width=True)
+                else:
+                    st.info(f"{selected_investor} 暂无持仓")
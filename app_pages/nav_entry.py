@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+"""净值录入页面：单个录入、Excel 批量导入和同一日期多策略快速录入"""
+
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+def render(db):
+    st.header("净值录入")
+    
+    strategies = db.get_strategies()
+    
+    if strategies.empty:
+        st.warning("请先在策略管理页面添加策略")
+    else:
+        tab1, tab2 = st.tabs(["单个录入", "批量录入"])
+        
+        with tab1:
+            st.subheader("单个净值录入")
+            
+            with st.form("add_nav_form"):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    strategy_options = dict(zip(strategies['name'], strategies['id']))
+                    selected_strategy = st.selectbox("选择策略", options=list(strategy_options.keys()))
+                
+                with col2:
+                    nav_date = st.date_input("净值日期", value=datetime.now().date())
+                
+                with col3:
+                    nav_value = st.number_input("净值", value=1.000, min_value=0.001, step=0.001, format="%.3f")
+                
+                submitted = st.form_submit_button("录入净值", type="primary")
+                
+                if submitted:
+                    strategy_id = strategy_options[selected_strategy]
+                    try:
+                        db.add_nav_record(strategy_id, nav_date, nav_value)
+                        st.success(f"策略 '{selected_strategy}' 在 {nav_date} 的净值 {nav_value} 录入成功！")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"录入失败：{str(e)}")
+        
+        with tab2:
+            st.subheader("批量净值录入")
+            st.info("您可以上传Excel文件进行批量录入，或者使用下面的表格进行快速录入")
+            st.caption("支持两种格式：① 包含「策略名称」「日期」「净值」三列；② 包含「日期」列，其余列名为策略名称")
+            
+            # 文件上传
+            uploaded_file = st.file_uploader("上传Excel文件", type=['xlsx', 'xlsm'])
+            
+            if uploaded_file is not None:
+                from nav_import import preview_nav_excel, import_nav_excel
+                
+                try:
+                    st.subheader("文件预览")
+                    st.dataframe(preview_nav_excel(uploaded_file, n=5))
+                    
+                    if st.button("开始批量导入"):
+                        progress_bar = st.progress(0)
+                        status_text = st.empty()
+                        
+                        def show_progress(rows_read, total_rows):
+                            if total_rows:
+                                progress_bar.progress(min(rows_read / total_rows, 1.0))
+                            status_text.text(f"已读取 {rows_read} 行...")
+                        
+                        result = import_nav_excel(db, uploaded_file, progress_callback=show_progress)
+                        progress_bar.progress(1.0)
+                        status_text.empty()
+                        
+                        st.success(f"批量导入完成：成功导入 {result['imported']} 条净值记录")
+                        if result['duplicates']:
+                            st.info(f"文件内重复记录 {result['duplicates']} 条，已保留最后一条")
+                        if result['invalid']:
+                            st.warning(f"跳过无效记录 {result['invalid']} 条")
+                            if result['unknown_strategies']:
+                                st.warning(f"未找到的策略：{'、'.join(sorted(result['unknown_strategies']))}")
+                            with st.expander("查看无效记录明细"):
+                                st.text("\n".join(result['errors']))
+                except Exception as e:
+                    st.error(f"批量导入失败：{str(e)}")
+            
+            # 快速录入表格
+            st.subheader("快速录入（同一日期多个策略）")
+            
+            with st.form("batch_nav_form"):
+                batch_date = st.date_input("录入日期", value=datetime.now().date())
+                
+                st.write("为每个策略输入净值：")
+                nav_inputs = {}
+                
+                cols = st.columns(min(3, len(strategies)))
+                for i, (_, strategy) in enumerate(strategies.iterrows()):
+                    with cols[i % 3]:
+                        nav_inputs[strategy['id']] = st.number_input(
+                            f"{strategy['name']}", 
+                            value=1.000, 
+                            min_value=0.001, 
+                            step=0.001,
+                            format="%.3f",
+                            key=f"nav_{strategy['id']}"
+                        )
+                
+                if st.form_submit_button("批量录入", type="primary"):
+                    # 一次批量写入全部策略的净值（收益率和相邻记录的修复与逐条录入相同）
+                    batch = pd.DataFrame({
+                        'strategy_id': list(nav_inputs.keys()),
+                        'date': batch_date.isoformat(),
+                        'nav_value': list(nav_inputs.values())
+                    })
+                    try:
+                        success_count = db.add_nav_records_bulk(batch)
+                    except Exception as e:
+                        success_count = 0
+                        st.error(f"批量录入失败：{str(e)}")
+                    
+                    if success_count > 0:
+                        st.success(f"成功录入 {success_count} 个策略的净值数据！")
+                        st.rerun()
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+"""数据概览页面：各表记录数和各策略的最新净值"""
+
+import pandas as pd
+import streamlit as st
+
+def render(db):
+    st.header("数据概览")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    # 统计数据和最新净值互不依赖，同时读取
+    counts, latest_records = db.gather(db.get_table_counts, db.get_latest_navs)
+    
+    with col1:
+        st.metric("策略数量", counts['strategies'])
+    
+    with col2:
+        st.metric("投资人数量", counts['investors'])
+    
+    with col3:
+        st.metric("产品数量", counts['products'])
+    
+    with col4:
+        st.metric("净值记录数", counts['nav_records'])
+    
+    st.markdown("---")
+    
+    # 最新净值记录
+    if not latest_records.empty:
+        st.subheader("最新净值记录")
+        display_df = latest_records[['strategy_name', 'date', 'nav_value', 'return_rate']].copy()
+        display_df.columns = ['策略名称', '日期', '净值', '收益率(%)']
+        display_df['收益率(%)'] = pd.to_numeric(display_df['收益率(%)']).round(2)
+        st.dataframe(display_df, use_container_width=True)
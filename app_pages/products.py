@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""产品管理页面：产品列表和产品净值走势、添加产品、策略权重配置"""
+
+from datetime import datetime
+
+import plotly.graph_objects as go
+import streamlit as st
+
+from downsample import line_trace
+
+def render(db):
+    st.header("产品管理")
+    
+    tab1, tab2, tab3 = st.tabs(["产品列表", "添加产品", "策略权重配置"])
+    
+    with tab1:
+        st.subheader("产品列表")
+        
+        products = db.get_products()
+        
+        if not products.empty:
+            display_df = products[['name', 'description', 'created_at']].copy()
+            display_df.columns = ['产品名称', '描述', '创建时间']
+            st.dataframe(display_df, use_container_width=True)
+
+            # 产品净值走势
+            st.subheader("产品净值走势")
+            product_options = dict(zip(products['name'], products['id']))
+            selected_product = st.selectbox("选择产品", options=list(product_options.keys()), key="nav_curve_product")
+            product_nav = db.get_product_nav_series(product_options[selected_product])
+
+            if not product_nav.empty:
+                fig = go.Figure(line_trace(
+                    product_nav['date'],
+                    product_nav['nav_value'],
+                    selected_product,
+                    mode='lines'
+                ))
+                fig.update_layout(xaxis_title="日期", yaxis_title="产品净值", height=400)
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("该产品暂无净值数据，请先配置策略权重并录入净值")
+        else:
+            st.info("暂无产品数据")
+    
+    with tab2:
+        st.subheader("添加产品")
+        
+        with st.form("add_product_form"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                product_name = st.text_input("产品名称*", placeholder="请输入产品名称")
+            
+            with col2:
+                product_description = st.text_area("产品描述", placeholder="请描述产品特点")
+            
+            submitted = st.form_submit_button("添加产品", type="primary")
+            
+            if submitted:
+                if product_name:
+                    try:
+                        db.add_product(product_name, product_description)
+                        st.success(f"产品 '{product_name}' 添加成功！")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"添加产品失败：{str(e)}")
+                else:
+                    st.error("请输入产品名称")
+    
+    with tab3:
+        st.subheader("策略权重配置")
+        
+        products = db.get_products(columns=['id', 'name'])
+        strategies = db.get_strategies(columns=['id', 'name'])
+        
+        if products.empty or strategies.empty:
+            st.warning("请先添加产品和策略")
+        else:
+            # 选择产品
+            product_options = dict(zip(products['name'], products['id']))
+            selected_product = st.selectbox("选择产品", options=list(product_options.keys()))
+            product_id = product_options[selected_product]
+            
+            # 显示当前权重配置
+            current_weights = db.get_product_weights(product_id)
+            
+            if not current_weights.empty:
+                st.subheader("当前权重配置")
+                display_weights = current_weights[['strategy_name', 'weight', 'effective_date']].copy()
+                display_weights.columns = ['策略名称', '权重(%)', '生效日期']
+                display_weights['权重(%)'] = (display_weights['权重(%)'] * 100).round(2)
+                st.dataframe(display_weights, use_container_width=True)
+            
+            st.subheader("设置新权重")
+            
+            with st.form("set_weights_form"):
+                effective_date = st.date_input("生效日期", value=datetime.now().date())
+                
+                st.write("设置各策略权重（%）：")
+                weight_inputs = {}
+                total_weight = 0
+                
+                # 获取当前产品的权重配置作为默认值
+                current_weights_dict = {}
+                if not current_weights.empty:
+                    current_weights_dict = {row['strategy_id']: row['weight'] * 100 for _, row in current_weights.iterrows()}
+                
+                for _, strategy in strategies.iterrows():
+                    # 使用产品ID和策略ID组合的key，并设置当前权重作为默认值
+                    default_weight = current_weights_dict.get(strategy['id'], 0.0)
+                    weight = st.number_input(
+                        f"{strategy['name']}", 
+                        value=default_weight, 
+                        min_value=0.0, 
+                        max_value=100.0, 
+                        step=0.1,
+                        key=f"weight_{product_id}_{strategy['id']}"
+                    )
+                    weight_inputs[strategy['id']] = weight
+                    total_weight += weight
+                
+                st.info(f"总权重：{total_weight:.1f}%")
+                
+                if st.form_submit_button("保存权重配置", type="primary"):
+                    if abs(total_weight - 100.0) < 0.1:
+                        try:
+                            for strategy_id, weight in weight_inputs.items():
+                                if weight > 0:
+                                    db.set_product_strategy_weight(product_id, strategy_id, weight/100, effective_date)
+                            st.success("权重配置保存成功！")
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"保存失败：{str(e)}")
+                    else:
+                        st.error("总权重必须等于100%")
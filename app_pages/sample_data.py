@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""生成示例数据页面：批量写入策略、净值、投资人、产品、权重和投资记录"""
+
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+import streamlit as st
+
+def render(db):
+    st.header("生成丰富的示例数据")
+    st.info("点击下方按钮为系统生成完整的示例数据，包括策略、投资人、产品、净值记录和投资交易。")
+    
+    if st.button("开始生成示例数据", type="primary", use_container_width=True):
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        
+        try:
+            # 1. 添加策略
+            status_text.text("正在添加投资策略...")
+            strategies_data = [
+                ("量化多因子策略", "基于多因子模型的量化选股策略，主要投资A股市场", "2023-01-01", 1.000),
+                ("市场中性策略", "股票多空配对交易，追求绝对收益", "2023-02-01", 1.000),
+                ("CTA趋势策略", "期货趋势跟踪策略，涵盖商品、股指、国债期货", "2023-03-01", 1.000),
+                ("可转债套利", "可转债相对价值套利策略", "2023-04-01", 1.000),
+                ("行业轮动策略", "基于宏观经济周期的行业配置策略", "2023-01-15", 1.000),
+                ("价值成长策略", "精选优质成长股的长期投资策略", "2023-05-01", 1.000),
+                ("事件驱动策略", "基于公司特定事件的投资机会策略", "2023-06-01", 1.000),
+                ("宏观对冲策略", "基于宏观经济判断的多资产配置策略", "2023-02-15", 1.000)
+            ]
+            
+            strategy_ids = []
+            for name, desc, start_date, initial_nav in strategies_data:
+                success = db.add_strategy(name, desc, start_date, initial_nav)
+                if success:
+                    strategies = db.get_strategies()
+                    strategy_id = strategies[strategies['name'] == name].iloc[0]['id']
+                    strategy_ids.append(strategy_id)
+                    st.success(f"✅ 添加策略: {name}")
+            
+            progress_bar.progress(20)
+            
+            # 2. 生成净值数据
+            status_text.text("正在生成净值历史数据...")
+            
+            start_date = datetime(2023, 1, 1).date()
+            end_date = datetime.now().date()
+            
+            nav_rows = []
+            for strategy_id in strategy_ids:
+                current_date = start_date
+                current_nav = 1.000
+                
+                while current_date <= end_date:
+                    if current_date.weekday() < 5:  # 工作日
+                        daily_return = random.normalvariate(0.001, 0.015)
+                        current_nav = current_nav * (1 + daily_return)
+                        current_nav = max(0.1, current_nav)
+                        
+                        if current_date.weekday() == 4:  # 周五录入
+                            nav_rows.append((strategy_id, current_date.isoformat(), round(current_nav, 3)))
+                    
+                    current_date += timedelta(days=1)
+            
+            # 全部净值一次批量写入（按批次分块提交）
+            db.add_nav_records_bulk(pd.DataFrame(nav_rows, columns=['strategy_id', 'date', 'nav_value']))
+            
+            st.success("✅ 净值数据生成完成")
+            progress_bar.progress(50)
+            
+            # 3. 添加投资人
+            status_text.text("正在添加投资人...")
+            investors_data = [
+                ("张三", "13800138000"), ("李四", "13900139000"), ("王五", "13700137000"),
+                ("赵六", "13600136000"), ("钱七", "13500135000"), ("孙八", "13400134000"),
+                ("周九", "13300133000"), ("吴十", "13200132000"), ("郑十一", "13100131000"),
+                ("王十二", "13000130000"), ("机构投资者A", "021-12345678"), ("家族办公室B", "010-87654321"),
+                ("私人银行客户C", "0755-11111111"), ("高净值客户D", "020-22222222"), ("企业年金E", "0571-33333333")
+            ]
+            
+            investor_ids = []
+            for name, contact in investors_data:
+                success = db.add_investor(name, contact)
+                if success:
+                    investors = db.get_investors()
+                    investor_id = investors[investors['name'] == name].iloc[0]['id']
+                    investor_ids.append(investor_id)
+                    st.success(f"✅ 添加投资人: {name}")
+            
+            progress_bar.progress(65)
+            
+            # 4. 添加产品
+            status_text.text("正在创建产品...")
+            products_data = [
+                ("稳健增长1号", "低风险稳健型产品，主要配置市场中性和量化多因子策略"),
+                ("进取增长2号", "中高风险进取型产品，主要配置CTA和事件驱动策略"),
+                ("平衡配置3号", "中等风险平衡型产品，多策略均衡配置"),
+                ("价值精选4号", "专注价值投资的产品，主要配置价值成长策略"),
+                ("宏观配置5号", "基于宏观判断的多资产配置产品"),
+                ("量化精英6号", "纯量化策略产品组合"),
+                ("套利稳健7号", "以套利策略为主的低风险产品")
+            ]
+            
+            product_ids = []
+            for name, desc in products_data:
+                success = db.add_product(name, desc)
+                if success:
+                    products = db.get_products()
+                    product_id = products[products['name'] == name].iloc[0]['id']
+                    product_ids.append(product_id)
+                    st.success(f"✅ 添加产品: {name}")
+            
+            progress_bar.progress(75)
+            
+            # 5. 设置产品策略权重
+            status_text.text("正在配置产品策略权重...")
+            
+            product_strategies = [
+                (product_ids[0], [(strategy_ids[1], 0.4), (strategy_ids[0], 0.3), (strategy_ids[3], 0.3)]),
+                (product_ids[1], [(strategy_ids[2], 0.4), (strategy_ids[6], 0.3), (strategy_ids[4], 0.3)]),
+                (product_ids[2], [(strategy_ids[0], 0.25), (strategy_ids[1], 0.25), (strategy_ids[4], 0.25), (strategy_ids[5], 0.25)]),
+                (product_ids[3], [(strategy_ids[5], 0.7), (strategy_ids[4], 0.3)]),
+                (product_ids[4], [(strategy_ids[7], 0.5), (strategy_ids[2], 0.3), (strategy_ids[1], 0.2)]),
+                (product_ids[5], [(strategy_ids[0], 0.6), (strategy_ids[1], 0.4)]),
+                (product_ids[6], [(strategy_ids[3], 0.8), (strategy_ids[6], 0.2)])
+            ]
+            
+            weight_rows = [
+                (product_id, strategy_id, weight, "2023-01-01")
+                for product_id, strategies in product_strategies
+                for strategy_id, weight in strategies
+            ]
+            db.set_product_strategy_weights_bulk(
+                pd.DataFrame(weight_rows, columns=['product_id', 'strategy_id', 'weight', 'effective_date'])
+            )
+            
+            st.success("✅ 产品策略权重配置完成")
+            progress_bar.progress(85)
+            
+            # 6. 生成投资记录
+            status_text.text("正在生成投资交易记录...")
+            
+            investment_amounts = [100000, 200000, 500000, 1000000, 2000000, 5000000, 10000000]
+            
+            investment_rows = []
+            for investor_id in investor_ids[:12]:
+                num_products = random.randint(1, 3)
+                selected_products = random.sample(product_ids, num_products)
+                
+                for product_id in selected_products:
+                    amount = random.choice(investment_amounts)
+                    investment_date = random.choice([
+                        "2023-01-15", "2023-02-01", "2023-03-01", "2023-04-01", 
+                        "2023-05-01", "2023-06-01", "2023-07-01", "2023-08-01",
+                        "2023-09-01", "2023-10-01", "2023-11-01", "2023-12-01",
+                        "2024-01-01", "2024-02-01", "2024-03-01", "2024-04-01",
+                        "2024-05-01", "2024-06-01", "2024-07-01", "2024-08-01"
+                    ])
+                    
+                    investment_rows.append((investor_id, product_id, amount, investment_date, "investment"))
+                    
+                    if random.random() < 0.5:
+                        additional_amount = amount * random.uniform(0.2, 0.8)
+                        later_date = (datetime.strptime(investment_date, "%Y-%m-%d") + timedelta(days=random.randint(30, 180))).strftime("%Y-%m-%d")
+                        if datetime.strptime(later_date, "%Y-%m-%d").date() <= datetime.now().date():
+                            investment_rows.append((investor_id, product_id, additional_amount, later_date, "investment"))
+                    
+                    if random.random() < 0.2:
+                        redemption_amount = amount * random.uniform(0.1, 0.3)
+                        redemption_date = (datetime.strptime(investment_date, "%Y-%m-%d") + timedelta(days=random.randint(90, 270))).strftime("%Y-%m-%d")
+                        if datetime.strptime(redemption_date, "%Y-%m-%d").date() <= datetime.now().date():
+                            investment_rows.append((investor_id, product_id, -redemption_amount, redemption_date, "redemption"))
+            
+            db.add_investments_bulk(pd.DataFrame(
+                investment_rows, columns=['investor_id', 'product_id', 'amount', 'investment_date', 'type']
+            ))
+            
+            st.success("✅ 投资交易记录生成完成")
+            progress_bar.progress(100)
+            
+            status_text.text("✅ 所有示例数据生成完成！")
+            
+            # 显示统计信息
+            st.subheader("📊 数据统计")
+            col1, col2, col3, col4 = st.columns(4)
+            
+            counts = db.get_table_counts()
+            
+            with col1:
+                st.metric("策略数量", counts['strategies'])
+            
+            with col2:
+                st.metric("投资人数量", counts['investors'])
+            
+            with col3:
+                st.metric("产品数量", counts['products'])
+            
+            with col4:
+                st.metric("净值记录数", counts['nav_records'])
+            
+            st.success("🎉 云端示例数据生成完成！现在您可以体验完整的私募基金管理系统了！")
+            st.info("💡 建议：现在可以访问各个功能页面查看数据，体验系统的完整功能。")
+            
+        except Exception as e:
+            st.error(f"❌ 数据生成失败: {str(e)}")
+            st.info("请确保已正确配置Supabase连接")
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+"""策略管理页面：添加策略、策略列表"""
+
+from datetime import datetime
+
+import streamlit as st
+
+def render(db):
+    st.header("策略管理")
+    
+    tab1, tab2 = st.tabs(["添加策略", "策略列表"])
+    
+    with tab1:
+        st.subheader("添加新策略")
+        
+        with st.form("add_strategy_form"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                strategy_name = st.text_input("策略名称*", placeholder="请输入策略名称")
+                start_date = st.date_input("开始日期", value=datetime.now().date())
+            
+            with col2:
+                description = st.text_area("策略描述", placeholder="请描述策略的投资风格、特点等")
+                initial_nav = st.number_input("初始净值", value=1.0, min_value=0.01, step=0.01)
+            
+            submitted = st.form_submit_button("添加策略", type="primary")
+            
+            if submitted:
+                if strategy_name:
+                    try:
+                        db.add_strategy(strategy_name, description, start_date, initial_nav)
+                        st.success(f"策略 '{strategy_name}' 添加成功！")
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"添加策略失败：{str(e)}")
+                else:
+                    st.error("请输入策略名称")
+    
+    with tab2:
+        st.subheader("策略列表")
+        
+        strategies = db.get_strategies()
+        
+        if not strategies.empty:
+            # 显示策略表格
+            display_df = strategies[['name', 'description', 'start_date', 'initial_nav', 'created_at']].copy()
+            display_df.columns = ['策略名称', '描述', '开始日期', '初始净值', '创建时间']
+            
+            st.dataframe(display_df, use_container_width=True)
+        else:
+            st.info("暂无策略数据，请先添加策略")
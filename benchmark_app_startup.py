@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Streamlit 应用启动和重新运行耗时测试
+用 benchmark_pages.seed 在临时目录生成本地数据库，在新的 Python 进程中用 streamlit.testing 的 AppTest
+运行应用脚本，统计：
+- 冷启动：进程内第一次运行脚本（含导入应用依赖的模块、渲染默认页面）的耗时
+- 各页面重新运行：切换到该页面后再运行 N 次脚本（等同于页面上的一次交互）的耗时 p50
+每轮在新进程中重复 rounds 次，取冷启动的中位数
+
+用法: python benchmark_app_startup.py [应用脚本] [重新运行次数] [轮数]
+对比拆分前后: git show <提交>:app.py > /tmp/app_before.py 后分别以两个脚本运行
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PAGES = ["📊 数据概览", "🎯 策略管理", "📝 净值录入", "👥 投资人管理", "📦 产品管理", "📈 图表分析", "生成示例数据"]
+
+def measure(app_path, reruns):
+    """在当前进程中运行应用，返回 {'cold': 秒, 'pages': {页面: 重新运行 p50 秒}}"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app_path, default_timeout=120)
+    started = time.perf_counter()
+    at.run()
+    cold = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+    pages = {}
+    for page in PAGES:
+        at.sidebar.selectbox[0].select(page).run()
+        timings = []
+        for _ in range(reruns):
+            started = time.perf_counter()
+            at.run()
+            timings.append(time.perf_counter() - started)
+        pages[page] = float(np.median(timings))
+    return {'cold': cold, 'pages': pages}
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        sys.path.insert(0, PACKAGE_DIR)
+        print(json.dumps(measure(sys.argv[2], int(sys.argv[3]))))
+        return
+
+    app_path = os.path.abspath(sys.argv[1]) if len(sys.argv) > 1 else os.path.join(PACKAGE_DIR, "app.py")
+    reruns = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    sys.path.insert(0, PACKAGE_DIR)
+    from benchmark_pages import seed
+
+    # 应用在工作目录下使用 fund_management.db
+    workdir = tempfile.mkdtemp(prefix="app_startup_")
+    seed(os.path.join(workdir, "fund_management.db"), 20, 500)
+    env = {**os.environ, "PYTHONPATH": PACKAGE_DIR}
+
+    results = []
+    for _ in range(rounds):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", app_path, str(reruns)],
+                                cwd=workdir, env=env, capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{app_path}（{rounds} 轮，每页重新运行 {reruns} 次）")
+    print(f"  冷启动 p50 {np.median([r['cold'] for r in results]) * 1000:8.1f} ms")
+    for page in PAGES:
+        print(f"  {page:<8} 重新运行 p50 {np.median([r['pages'][page] for r in results]) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
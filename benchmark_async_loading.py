@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+页面并发读取性能对比脚本
+在本地启动简易的 PostgREST 兼容服务（每个请求附加固定的服务端延迟），对比
+SupabaseManager 逐个读取与 SupabaseManager.gather 并发读取一个页面所需数据的耗时
+
+用法: python benchmark_async_loading.py [页面渲染次数] [请求延迟ms]
+"""
+
+import logging
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+import streamlit as st
+
+from benchmark_http_session import make_handler, make_tables
+from http.server import ThreadingHTTPServer
+from supabase_database import SupabaseManager
+
+def make_page_tables():
+    tables = make_tables()
+    tables["investors"] = [{"id": i, "name": f"投资人{i}"} for i in range(1, 31)]
+    tables["products"] = [{"id": i, "name": f"产品{i}"} for i in range(1, 6)]
+    tables["investments"] = [
+        {"id": i, "investor_id": 1 + i % 30, "product_id": 1 + i % 5, "amount": 100000.0, "shares": 100000.0,
+         "type": "investment", "investment_date": (date(2023, 1, 1) + timedelta(days=i)).isoformat()}
+        for i in range(1, 201)
+    ]
+    return tables
+
+def page_reads(db):
+    """一个页面互不依赖的读取：策略、投资人、产品列表，某个区间的净值，全部投资记录"""
+    return [db.get_strategies, db.get_investors, db.get_products,
+            lambda: db.get_nav_records(start_date="2023-06-01", end_date="2023-06-30"),
+            db.get_investor_investments]
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    request_delay = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 50.0 / 1000
+
+    # 脚本不在 streamlit 中运行，屏蔽 st.error 的上下文警告
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    st.error = lambda *args, **kwargs: None
+
+    random.seed(42)
+    stats = {"connections": 0, "lock": threading.Lock()}
+    handler = make_handler(make_page_tables(), stats, 0.0, 0.0)
+    do_get = handler.do_GET
+
+    def delayed_get(self):
+        time.sleep(request_delay)
+        do_get(self)
+
+    handler.do_GET = delayed_get
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"{repeat} 次页面渲染 × 5 个读取，每个请求服务端延迟 {request_delay * 1000:.0f} ms\n")
+
+    db = SupabaseManager(url, "anon", max_workers=5)
+    reads = page_reads(db)
+    [read() for read in reads]
+    started = time.perf_counter()
+    for _ in range(repeat):
+        sequential_results = [read() for read in reads]
+    sequential_ms = (time.perf_counter() - started) / repeat * 1000
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        concurrent_results = db.gather(*reads)
+    concurrent_ms = (time.perf_counter() - started) / repeat * 1000
+    db.close()
+
+    same = all(a.equals(b) for a, b in zip(sequential_results, concurrent_results))
+    print(f"逐个读取   每页 {sequential_ms:7.1f} ms")
+    print(f"并发读取   每页 {concurrent_ms:7.1f} ms  （结果一致: {same}）")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
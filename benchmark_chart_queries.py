@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+图表分析页面读取对比
+在 mock_postgrest 中生成 100 个以上策略的数据，对比图表分析页面三个标签的读取方式：
+- 过滤前：净值曲线读取日期区间内全部策略的记录后在本地按选中策略筛选，收益率分析和策略对比读取全部记录
+- 过滤后：净值曲线和策略对比只读取选中策略的记录（strategy_ids），收益率分析不再随每条记录读取策略名称
+分别统计 SupabaseManager（经 PostgREST 模拟服务）的请求数、响应字节数、耗时和 DatabaseManager 的耗时、行数
+
+用法: python benchmark_chart_queries.py [策略数] [交易日数] [请求延迟ms] [抖动ms] [重复次数]
+"""
+
+import logging
+import random
+import sys
+import time
+
+import numpy as np
+import streamlit as st
+
+from benchmark_pages import seed
+from database import DatabaseManager
+from mock_postgrest import MockPostgREST
+from supabase_database import SupabaseManager
+
+TAB_COLUMNS = ['strategy_id', 'strategy_name', 'date', 'nav_value', 'return_rate']
+
+def tab_reads(db, dates, selected, compared):
+    """各标签的读取，返回 {标签: {'过滤前': 读取, '过滤后': 读取}}"""
+    return {
+        "净值曲线": {
+            "过滤前": lambda: db.get_nav_records(start_date=dates[-250], end_date=dates[-1], columns=TAB_COLUMNS),
+            "过滤后": lambda: db.get_nav_records(start_date=dates[-250], end_date=dates[-1], columns=TAB_COLUMNS,
+                                                 strategy_ids=selected),
+        },
+        "收益率分析": {
+            "过滤前": lambda: db.get_nav_records(columns=['strategy_id', 'strategy_name', 'nav_value', 'return_rate']),
+            "过滤后": lambda: db.get_nav_records(columns=['strategy_id', 'nav_value', 'return_rate']),
+        },
+        "策略对比": {
+            "过滤前": lambda: db.get_nav_records(columns=['strategy_id', 'date', 'nav_value']),
+            "过滤后": lambda: db.get_nav_records(columns=['strategy_id', 'date', 'nav_value'], strategy_ids=compared),
+        },
+    }
+
+def timed(read, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = read()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, np.percentile(timings, 50)
+
+def main():
+    strategies = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 750
+    latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.03
+    jitter = float(sys.argv[4]) / 1000 if len(sys.argv) > 4 else 0.01
+    repeat = int(sys.argv[5]) if len(sys.argv) > 5 else 3
+
+    # 脚本不在 streamlit 中运行，屏蔽 st.error 的上下文警告
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    st.error = lambda *args, **kwargs: None
+    random.seed(42)
+
+    mock = MockPostgREST(latency=latency, jitter=jitter)
+    dates = seed(mock.db_path, strategies, days)
+    mock.start()
+    # 与页面默认选择一致：净值曲线前 3 个策略，策略对比前 2 个策略
+    selected, compared = [1, 2, 3], [1, 2]
+    print(f"{strategies} 个策略 × {days} 个交易日，请求延迟 {latency * 1000:.0f} ms + 0~{jitter * 1000:.0f} ms 抖动，"
+          f"重复 {repeat} 次取 p50")
+
+    remote = SupabaseManager(mock.url, "anon")
+    local = DatabaseManager(mock.db_path)
+    for tab, variants in tab_reads(remote, dates, selected, compared).items():
+        local_variants = tab_reads(local, dates, selected, compared)[tab]
+        for variant, read in variants.items():
+            mock.reset_stats()
+            _, remote_ms = timed(read, repeat)
+            requests_made = mock.stats['requests'] / repeat
+            kb = mock.stats['bytes'] / repeat / 1024
+            rows, local_ms = timed(local_variants[variant], repeat)
+            print(f"  {tab:<6}{variant}  Supabase p50 {remote_ms:8.1f} ms  请求 {requests_made:5.1f}  "
+                  f"响应 {kb:9.1f} KB  |  SQLite p50 {local_ms:7.1f} ms  {len(rows):7d} 行")
+
+    remote.close()
+    local.close()
+    mock.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+连接池性能对比脚本
+对比旧版"每次调用新建连接"与连接池(WAL)两种方式下
+execute_query / execute_command 的单次调用延迟，以及多线程并发写入时的锁冲突情况
+
+用法: python benchmark_connection_pool.py [调用次数] [并发线程数]
+"""
+
+import os
+import sys
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from database import DatabaseManager
+
+class LegacyDatabaseManager(DatabaseManager):
+    """旧版实现：每次调用都打开并关闭一个新连接"""
+
+    def init_database(self):
+        super().init_database()
+        # 恢复默认的回滚日志模式，与旧版数据库文件保持一致
+        self.pool.close()
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.close()
+
+    def execute_query(self, query, params=None):
+        conn = sqlite3.connect(self.db_path)
+        if params:
+            result = pd.read_sql_query(query, conn, params=params)
+        else:
+            result = pd.read_sql_query(query, conn)
+        conn.close()
+        return result
+
+    def execute_command(self, command, params=None):
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        if params:
+            cursor.execute(command, params)
+        else:
+            cursor.execute(command)
+        conn.commit()
+        lastrowid = cursor.lastrowid
+        conn.close()
+        return lastrowid
+
+def prepare(db, strategies=10, days=250):
+    """准备测试数据"""
+    start = date(2023, 1, 1)
+    for i in range(strategies):
+        strategy_id = db.add_strategy(f"策略{i}", "", start, 1.0)
+        for d in range(days):
+            db.execute_command(
+                "INSERT INTO nav_records (strategy_id, date, nav_value) VALUES (?, ?, ?)",
+                (strategy_id, (start + timedelta(days=d)).isoformat(), 1.0 + d * 0.001)
+            )
+
+def time_calls(func, n):
+    """返回平均单次调用耗时(毫秒)"""
+    started = time.perf_counter()
+    for i in range(n):
+        func(i)
+    return (time.perf_counter() - started) / n * 1000
+
+def concurrent_writes(db, threads, per_thread):
+    """多线程混合读写，返回(总耗时秒, 失败次数)"""
+    errors = []
+
+    def worker(k):
+        for i in range(per_thread):
+            try:
+                db.add_nav_record(1 + k % 10, (date(2030, 1, 1) + timedelta(days=k * per_thread + i)).isoformat(), 1.5)
+                db.get_strategy_nav_at_date(1 + k % 10, "2030-06-01")
+            except sqlite3.OperationalError as e:
+                errors.append(str(e))
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(k,)) for k in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return time.perf_counter() - started, len(errors)
+
+def run(manager_cls, n, threads):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = manager_cls(os.path.join(tmp, "bench.db"))
+        prepare(db)
+
+        query_ms = time_calls(lambda i: db.get_strategy_nav_at_date(1 + i % 10, "2023-06-01"), n)
+        command_ms = time_calls(lambda i: db.execute_command(
+            "UPDATE strategies SET description = ? WHERE id = ?", (str(i), 1 + i % 10)), n)
+        elapsed, errors = concurrent_writes(db, threads, 50)
+        db.close()
+        return query_ms, command_ms, elapsed, errors
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 12
+
+    print(f"单线程调用 {n} 次，并发 {threads} 线程 × 50 次写入+查询\n")
+    print(f"{'实现':<12}{'查询(ms/次)':>14}{'写入(ms/次)':>14}{'并发耗时(s)':>14}{'锁冲突':>8}")
+    for label, cls in (("每次新建连接", LegacyDatabaseManager), ("连接池+WAL", DatabaseManager)):
+        query_ms, command_ms, elapsed, errors = run(cls, n, threads)
+        print(f"{label:<12}{query_ms:>14.3f}{command_ms:>14.3f}{elapsed:>14.2f}{errors:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+HTTP 会话复用性能对比脚本
+在本地启动一个简易的 PostgREST 兼容服务，对比旧版"每次请求新建连接"与
+共享 requests.Session（连接池 + keep-alive + 重试）两种方式下 SupabaseManager 的单次请求延迟、
+服务端建立的 TCP 连接数，以及服务端偶发 503 时的失败次数
+
+用法: python benchmark_http_session.py [请求次数] [握手延迟ms] [503比例]
+  握手延迟用于模拟真实环境中 TCP+TLS 握手的往返耗时（本地回环几乎为 0）
+"""
+
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import requests
+import streamlit as st
+
+from supabase_database import SupabaseManager
+
+STRATEGIES = 20
+DAYS = 250
+
+class LegacySupabaseManager(SupabaseManager):
+    """旧版实现：直接调用 requests.get/post/...，每次请求新建连接"""
+
+    def _make_request(self, method, endpoint, data=None, params=None, headers=None):
+        url = f"{self.supabase_url}/rest/v1/{endpoint}"
+        headers = {**self.headers, **headers} if headers else self.headers
+        try:
+            if method == "GET":
+                response = requests.get(url, headers=headers, params=params)
+            elif method == "POST":
+                response = requests.post(url, headers=headers, json=data, params=params)
+            elif method == "PATCH":
+                response = requests.patch(url, headers=headers, json=data, params=params)
+            elif method == "DELETE":
+                response = requests.delete(url, headers=headers, params=params)
+            if response.status_code in [200, 201]:
+                result = response.json() if response.content else None
+                return pd.DataFrame(result) if result else pd.DataFrame()
+            return pd.DataFrame()
+        except requests.exceptions.RequestException:
+            return pd.DataFrame()
+
+def make_tables():
+    strategies = [{"id": i, "name": f"策略{i}", "created_at": f"2023-01-01T00:00:{i:02d}"}
+                  for i in range(1, STRATEGIES + 1)]
+    nav_records = [
+        {"id": sid * DAYS + d, "strategy_id": sid, "date": (date(2023, 1, 1) + timedelta(days=d)).isoformat(),
+         "nav_value": 1.0 + d / 1000}
+        for sid in range(1, STRATEGIES + 1) for d in range(DAYS)
+    ]
+    return {"strategies": strategies, "nav_records": nav_records}
+
+def make_handler(tables, stats, handshake_delay, failure_rate):
+    """简易 PostgREST：支持 eq/lt/lte/gt/gte/in 过滤（含 and=(...)）、多列 order、limit，返回 JSON 数组"""
+    operators = {
+        "eq": lambda a, b: str(a) == b,
+        "lt": lambda a, b: str(a) < b,
+        "lte": lambda a, b: str(a) <= b,
+        "gt": lambda a, b: str(a) > b,
+        "gte": lambda a, b: str(a) >= b,
+        "in": lambda a, b: str(a) in b.strip("()").split(","),
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # 响应头和响应体分两次写出，关闭 Nagle 避免与延迟确认叠加出 40ms 的等待
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            with stats["lock"]:
+                stats["connections"] += 1
+            time.sleep(handshake_delay)
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            table = url.path.rsplit("/", 1)[-1]
+            if table not in tables:
+                self.send_error(404)
+                return
+            if random.random() < failure_rate:
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            rows = tables[table]
+            query = parse_qs(url.query)
+            filters = [(column, values[0]) for column, values in query.items()
+                       if column not in ("select", "order", "limit", "and")]
+            if "and" in query:
+                filters += [tuple(item.split(".", 1)) for item in query["and"][0].strip("()").split(",")]
+            for column, condition in filters:
+                op, _, value = condition.partition(".")
+                rows = [row for row in rows if operators[op](row.get(column), value)]
+            if "order" in query:
+                # 多列排序：从最后一列开始依次做稳定排序
+                for item in reversed(query["order"][0].split(",")):
+                    column, _, direction = item.partition(".")
+                    rows = sorted(rows, key=lambda row: row[column], reverse=direction == "desc")
+            if "limit" in query:
+                rows = rows[:int(query["limit"][0])]
+
+            body = json.dumps(rows).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+def page_workload(db, i):
+    """模拟一次组合页面渲染：策略列表 + 若干策略的 as-of 净值"""
+    db.get_strategies()
+    for sid in range(1, 6):
+        db.get_strategy_nav_at_date(1 + (i + sid) % STRATEGIES, "2023-06-30")
+
+def run(db, stats, repeat):
+    failures = []
+    original = db._make_request
+
+    def counted(*args, **kwargs):
+        result = original(*args, **kwargs)
+        if result.empty:
+            failures.append(1)
+        return result
+
+    db._make_request = counted
+    with stats["lock"]:
+        stats["connections"] = 0
+    page_workload(db, 0)
+    started = time.perf_counter()
+    for i in range(repeat):
+        page_workload(db, i)
+    elapsed = time.perf_counter() - started
+    requests_made = repeat * 6
+    return elapsed / requests_made * 1000, stats["connections"], len(failures)
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    handshake_delay = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.0
+    failure_rate = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+
+    # 脚本不在 streamlit 中运行，屏蔽 st.error 的上下文警告
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    st.error = lambda *args, **kwargs: None
+
+    random.seed(42)
+    stats = {"connections": 0, "lock": threading.Lock()}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(make_tables(), stats, handshake_delay, failure_rate))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"{repeat} 次页面渲染 × 6 个请求，握手延迟 {handshake_delay * 1000:.0f} ms，503 比例 {failure_rate:.0%}\n")
+    for label, db in [("每次新建连接", LegacySupabaseManager(url, "anon")),
+                      ("共享会话", SupabaseManager(url, "anon", retries=3))]:
+        latency, connections, failures = run(db, stats, repeat)
+        print(f"{label:<8} 单次请求 {latency:7.2f} ms  新建连接 {connections:5d}  失败请求 {failures:4d}")
+        db.close()
+
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
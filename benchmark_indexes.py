@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+索引迁移效果对比脚本
+生成约100万条净值记录的测试库，分别在执行结构迁移前后查看热点查询的
+查询计划 (EXPLAIN QUERY PLAN) 和平均耗时
+
+用法: python benchmark_indexes.py [策略数] [每个策略的天数]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from database import DatabaseManager
+
+class UnmigratedDatabaseManager(DatabaseManager):
+    """只建基础表、不执行迁移，模拟迁移前的数据库"""
+
+    def migrate(self):
+        return 0
+
+def populate(db, strategies, days, investors=5000, products=200):
+    """批量生成测试数据"""
+    random.seed(42)
+    start = date(2000, 1, 1)
+    dates = [(start + timedelta(days=d)).isoformat() for d in range(days)]
+
+    with db.pool.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO strategies (id, name, start_date) VALUES (?, ?, ?)",
+            [(i, f"策略{i}", dates[0]) for i in range(1, strategies + 1)]
+        )
+        for sid in range(1, strategies + 1):
+            conn.executemany(
+                "INSERT INTO nav_records (strategy_id, date, nav_value) VALUES (?, ?, ?)",
+                [(sid, d, 1.0 + random.random()) for d in dates]
+            )
+
+        conn.executemany("INSERT INTO investors (id, name) VALUES (?, ?)",
+                         [(i, f"投资人{i}") for i in range(1, investors + 1)])
+        conn.executemany("INSERT INTO products (id, name) VALUES (?, ?)",
+                         [(i, f"产品{i}") for i in range(1, products + 1)])
+        conn.executemany(
+            "INSERT INTO investments (investor_id, product_id, investment_date, amount, shares, nav_at_investment, type) "
+            "VALUES (?, ?, ?, ?, ?, ?, 'investment')",
+            [(random.randint(1, investors), random.randint(1, products), random.choice(dates), 1e5, 1e5, 1.0)
+             for _ in range(investors * 20)]
+        )
+        # 每个产品每季度调整一次权重
+        conn.executemany(
+            "INSERT INTO product_strategy_weights (product_id, strategy_id, weight, effective_date) VALUES (?, ?, ?, ?)",
+            [(pid, random.randint(1, strategies), 0.25, dates[d])
+             for pid in range(1, products + 1) for d in range(0, days, 90) for _ in range(4)]
+        )
+
+def workloads(strategies, days, investors=5000, products=200):
+    mid = (date(2000, 1, 1) + timedelta(days=days // 2)).isoformat()
+    return [
+        ("get_investor_investments",
+         lambda db, i: db.get_investor_investments(investor_id=1 + i % investors),
+         "SELECT * FROM investments WHERE investor_id = 1 ORDER BY investment_date DESC"),
+        ("get_product_weights",
+         lambda db, i: db.get_product_weights(1 + i % products, mid),
+         f"SELECT * FROM product_strategy_weights WHERE product_id = 1 AND effective_date <= '{mid}'"),
+        ("get_strategy_nav_at_date",
+         lambda db, i: db.get_strategy_nav_at_date(1 + i % strategies, mid),
+         f"SELECT nav_value FROM nav_records WHERE strategy_id = 1 AND date <= '{mid}' ORDER BY date DESC LIMIT 1"),
+        ("get_nav_records(日期区间)",
+         lambda db, i: db.get_nav_records(start_date=mid, end_date=mid),
+         f"SELECT * FROM nav_records WHERE date >= '{mid}' AND date <= '{mid}'"),
+    ]
+
+def measure(db, strategies, days, repeat):
+    results = {}
+    for name, func, sql in workloads(strategies, days):
+        with db.pool.connection() as conn:
+            plan = "; ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql))
+        func(db, 0)
+        started = time.perf_counter()
+        for i in range(repeat):
+            func(db, i)
+        results[name] = ((time.perf_counter() - started) / repeat * 1000, plan)
+    return results
+
+def main():
+    strategies = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 2500
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = UnmigratedDatabaseManager(os.path.join(tmp, "bench.db"))
+        print(f"生成测试数据：{strategies} 个策略 × {days} 天 = {strategies * days:,} 条净值记录...")
+        populate(db, strategies, days)
+
+        before = measure(db, strategies, days, repeat=20)
+        started = time.perf_counter()
+        version = DatabaseManager.migrate(db)
+        print(f"迁移到版本 {version} 耗时 {time.perf_counter() - started:.1f}s\n")
+        after = measure(db, strategies, days, repeat=20)
+        db.close()
+
+    for name in before:
+        print(name)
+        print(f"  迁移前 {before[name][0]:9.2f} ms  {before[name][1]}")
+        print(f"  迁移后 {after[name][0]:9.2f} ms  {after[name][1]}")
+
+if __name__ == "__main__":
+    main()
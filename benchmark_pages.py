@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+页面负载回放脚本
+用 DatabaseManager 的批量接口在 mock_postgrest 的 SQLite 数据库中生成数据，启动带延迟和抖动的
+PostgREST 模拟服务，按 app.py 各页面的读取顺序回放，对比以下方式每次页面渲染的耗时（p50 / p95）、
+请求数和响应字节数：
+- SupabaseManager，产品净值和持仓估值调用数据库函数（RPC）
+- SupabaseManager，不使用 RPC，在客户端计算
+- HybridDatabaseManager（应用实际使用的后端），读取在本地副本上完成
+- SupabaseManager.gather，页面内互不依赖的读取并发执行
+
+用法: python benchmark_pages.py [策略数] [交易日数] [请求延迟ms] [抖动ms] [每页渲染次数]
+"""
+
+import logging
+import random
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from database import DatabaseManager
+from hybrid_database import HybridDatabaseManager
+from mock_postgrest import MockPostgREST
+from supabase_database import SupabaseManager
+
+INVESTORS = 50
+PRODUCTS = 8
+INVESTMENTS = 400
+
+def seed(db_path, strategies, days):
+    """生成策略净值（随机游走）、投资人、产品、产品权重和投资记录"""
+    rng = np.random.default_rng(42)
+    db = DatabaseManager(db_path)
+    start = date.today() - timedelta(days=days * 7 // 5)
+    dates = pd.bdate_range(start, periods=days).strftime('%Y-%m-%d')
+
+    db.bulk_upsert("strategies", [{"name": f"策略{i}", "description": "", "start_date": dates[0], "initial_nav": 1.0}
+                                  for i in range(1, strategies + 1)])
+    db.bulk_upsert("investors", [{"name": f"投资人{i}", "contact": ""} for i in range(1, INVESTORS + 1)])
+    db.bulk_upsert("products", [{"name": f"产品{i}", "description": ""} for i in range(1, PRODUCTS + 1)])
+
+    navs = 1.0 + np.cumsum(rng.normal(0.0003, 0.01, size=(strategies, days)), axis=1)
+    db.add_nav_records_bulk(pd.DataFrame({
+        'strategy_id': np.repeat(np.arange(1, strategies + 1), days),
+        'date': np.tile(dates, strategies),
+        'nav_value': navs.ravel()
+    }))
+
+    weights = []
+    for product_id in range(1, PRODUCTS + 1):
+        members = rng.choice(np.arange(1, strategies + 1), size=min(4, strategies), replace=False)
+        weights += [{'product_id': product_id, 'strategy_id': int(sid), 'weight': 1.0 / len(members),
+                     'effective_date': dates[0]} for sid in members]
+    db.set_product_strategy_weights_bulk(pd.DataFrame(weights))
+
+    db.add_investments_bulk(pd.DataFrame({
+        'investor_id': rng.integers(1, INVESTORS + 1, INVESTMENTS),
+        'product_id': rng.integers(1, PRODUCTS + 1, INVESTMENTS),
+        'amount': rng.integers(10, 100, INVESTMENTS) * 10000.0,
+        'investment_date': rng.choice(dates[days // 10:], INVESTMENTS)
+    }))
+    db.close()
+    return dates
+
+def page_reads(db, dates):
+    """各页面按 app.py 的顺序发出的读取，返回 {页面: [读取, ...]}，每个读取为无参数的可调用对象"""
+    tab_columns = ['strategy_id', 'strategy_name', 'date', 'nav_value', 'return_rate']
+    return {
+        "数据概览": [db.get_table_counts, db.get_latest_navs],
+        "策略管理": [db.get_strategies],
+        "投资人管理": [
+            db.get_investors, db.get_all_portfolios, lambda: db.get_investors(columns=['id', 'name']),
+            lambda: db.get_investor_portfolio(1),
+            lambda: db.get_investor_investments(1, columns=['investment_date', 'product_name', 'type', 'amount',
+                                                            'shares', 'nav_at_investment'])
+        ],
+        "产品管理": [
+            db.get_products, lambda: db.get_product_nav_series(1), lambda: db.get_products(columns=['id', 'name']),
+            lambda: db.get_strategies(columns=['id', 'name']), lambda: db.get_product_weights(1)
+        ],
+        "图表分析": [
+            lambda: db.get_strategies(columns=['id', 'name', 'initial_nav']),
+            lambda: db.get_nav_records(columns=tab_columns, strategy_ids=[1, 2, 3]),
+            lambda: db.get_nav_records(columns=['strategy_id', 'nav_value', 'return_rate']),
+            lambda: db.get_nav_records(columns=['strategy_id', 'date', 'nav_value'], strategy_ids=[1, 2])
+        ],
+    }
+
+def replay(mock, label, db, dates, repeat, concurrent=False):
+    print(f"\n{label}")
+    for page, reads in page_reads(db, dates).items():
+        render = (lambda: db.gather(*reads)) if concurrent else (lambda: [read() for read in reads])
+        render()
+        mock.reset_stats()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append((time.perf_counter() - started) * 1000)
+        p50, p95 = np.percentile(timings, [50, 95])
+        print(f"  {page:<6} p50 {p50:8.1f} ms  p95 {p95:8.1f} ms  "
+              f"请求 {mock.stats['requests'] / repeat:5.1f}  响应 {mock.stats['bytes'] / repeat / 1024:8.1f} KB")
+
+def main():
+    strategies = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.03
+    jitter = float(sys.argv[4]) / 1000 if len(sys.argv) > 4 else 0.01
+    repeat = int(sys.argv[5]) if len(sys.argv) > 5 else 10
+
+    # 脚本不在 streamlit 中运行，屏蔽 st.error 的上下文警告
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    st.error = lambda *args, **kwargs: None
+    random.seed(42)
+
+    mock = MockPostgREST(latency=latency, jitter=jitter)
+    dates = seed(mock.db_path, strategies, days)
+    mock.start()
+    print(f"{strategies} 个策略 × {days} 个交易日，{INVESTORS} 个投资人，{PRODUCTS} 个产品，{INVESTMENTS} 条投资记录")
+    print(f"每个请求延迟 {latency * 1000:.0f} ms + 0~{jitter * 1000:.0f} ms 抖动，每页渲染 {repeat} 次")
+
+    # 不启动后台线程，先完整拉取一次，页面读取期间不与后台同步争用模拟服务
+    hybrid_db = HybridDatabaseManager(SupabaseManager(mock.url, "anon"),
+                                      os.path.join(tempfile.mkdtemp(prefix="replica_"), "replica.db"), start=False)
+    hybrid_db.sync(full=True)
+
+    for label, db, concurrent in [
+        ("SupabaseManager（RPC）", SupabaseManager(mock.url, "anon"), False),
+        ("SupabaseManager（客户端计算）", SupabaseManager(mock.url, "anon", use_rpc=False), False),
+        ("HybridDatabaseManager（本地副本）", hybrid_db, False),
+        ("SupabaseManager.gather（并发读取，RPC）", SupabaseManager(mock.url, "anon"), True),
+    ]:
+        replay(mock, label, db, dates, repeat, concurrent)
+        db.close()
+
+    mock.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+策略收益率统计耗时测试
+生成多个策略的日净值（随机游走，每个策略第一条记录没有收益率，与 compute_return_rates 一致），对比：
+- 逐策略循环：strategies.iterrows() 中每次用布尔掩码筛选全部净值记录，再分别计算各指标（收益率分析页原实现）
+- strategy_stats：一次排序后按分组边界归约
+并检查两者结果一致
+
+用法: python benchmark_strategy_stats.py [策略数] [交易日数] [重复次数]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from nav_engine import strategy_stats
+
+def make_navs(strategies, days):
+    rng = np.random.default_rng(42)
+    dates = pd.bdate_range("2015-01-01", periods=days).strftime('%Y-%m-%d')
+    navs = 1.0 + np.cumsum(rng.normal(0.0003, 0.01, size=(strategies, days)), axis=1)
+    returns = np.full_like(navs, np.nan)
+    returns[:, 1:] = (navs[:, 1:] / navs[:, :-1] - 1) * 100
+    # 与 get_nav_records 一致按日期排序
+    nav_df = pd.DataFrame({
+        'strategy_id': np.tile(np.arange(1, strategies + 1), days),
+        'date': np.repeat(dates, strategies),
+        'nav_value': navs.T.ravel(),
+        'return_rate': returns.T.ravel()
+    })
+    strategy_df = pd.DataFrame({'id': np.arange(1, strategies + 1),
+                                'name': [f"策略{i}" for i in range(1, strategies + 1)],
+                                'initial_nav': 1.0})
+    return nav_df, strategy_df
+
+def loop_stats(nav_data, strategies):
+    stats_data = []
+    for _, strategy in strategies.iterrows():
+        strategy_navs = nav_data[nav_data['strategy_id'] == strategy['id']]
+        if not strategy_navs.empty:
+            returns = strategy_navs['return_rate'].dropna()
+            if len(returns) > 0:
+                stats_data.append({
+                    '策略名称': strategy['name'],
+                    '累计收益率(%)': ((strategy_navs['nav_value'].iloc[-1] / strategy['initial_nav'] - 1) * 100).round(2),
+                    '平均收益率(%)': returns.mean().round(2),
+                    '收益率波动率(%)': returns.std().round(2),
+                    '最大收益率(%)': returns.max().round(2),
+                    '最小收益率(%)': returns.min().round(2),
+                    '记录数量': len(strategy_navs)
+                })
+    return pd.DataFrame(stats_data)
+
+def engine_stats(nav_data, strategies):
+    stats = strategy_stats(nav_data, dict(zip(strategies['id'], strategies['initial_nav'])))
+    stats = strategies[['id', 'name']].merge(stats, left_on='id', right_on='strategy_id')
+    stats = stats[stats['return_count'] > 0]
+    return pd.DataFrame({
+        '策略名称': stats['name'],
+        '累计收益率(%)': stats['cumulative_return'].round(2),
+        '平均收益率(%)': stats['mean_return'].round(2),
+        '收益率波动率(%)': stats['return_std'].round(2),
+        '最大收益率(%)': stats['max_return'].round(2),
+        '最小收益率(%)': stats['min_return'].round(2),
+        '记录数量': stats['record_count']
+    }).reset_index(drop=True)
+
+def timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return result, np.median(timings)
+
+def main():
+    strategies = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 2520
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+
+    nav_df, strategy_df = make_navs(strategies, days)
+    print(f"{strategies} 个策略 × {days} 个交易日，共 {len(nav_df)} 条净值记录，重复 {repeat} 次取中位数")
+
+    expected, loop_ms = timed(lambda: loop_stats(nav_df, strategy_df), repeat)
+    result, engine_ms = timed(lambda: engine_stats(nav_df, strategy_df), repeat)
+    # 不带日期列（收益率分析页读取的列）时按行顺序确定最新净值
+    no_date = nav_df.drop(columns=['date'])
+    _, engine_no_date_ms = timed(lambda: engine_stats(no_date, strategy_df), repeat)
+
+    pd.testing.assert_frame_equal(expected, result, check_dtype=False)
+    print(f"  逐策略循环            {loop_ms:9.1f} ms")
+    print(f"  strategy_stats        {engine_ms:9.1f} ms（{loop_ms / engine_ms:.0f} 倍）")
+    print(f"  strategy_stats 无日期 {engine_no_date_ms:9.1f} ms（{loop_ms / engine_no_date_ms:.0f} 倍）")
+    print("  结果一致")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+带缓存的数据库管理器
+包装 DatabaseManager / SupabaseManager，读取结果按 (方法, 参数) 缓存，
+经本实例的写入按表递增版本号，使依赖该表的缓存失效
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Optional, Dict, Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+ALL_TABLES = ('strategies', 'nav_records', 'investors', 'products', 'product_strategy_weights', 'investments')
+
+# 读取方法 -> 结果依赖的表
+READ_DEPENDENCIES = {
+    'get_strategies': ('strategies',),
+    'get_strategy_by_id': ('strategies',),
+    'get_investors': ('investors',),
+    'get_products': ('products',),
+    'get_table_counts': ALL_TABLES,
+    'get_nav_records': ('nav_records', 'strategies'),
+    'get_latest_navs': ('nav_records', 'strategies'),
+    'get_last_nav': ('nav_records',),
+    'get_strategy_nav_at_date': ('nav_records',),
+    'get_product_weights': ('product_strategy_weights', 'strategies'),
+    'calculate_product_nav': ('product_strategy_weights', 'nav_records'),
+    'get_product_navs': ('product_strategy_weights', 'nav_records'),
+    'get_product_nav_series': ('product_strategy_weights', 'nav_records'),
+    'get_investor_investments': ('investments', 'investors', 'products'),
+    'get_investor_portfolio': ('investments', 'products', 'product_strategy_weights', 'nav_records'),
+    'get_all_portfolios': ('investments', 'investors', 'products', 'product_strategy_weights', 'nav_records'),
+}
+
+# 写入方法 -> 修改的表（bulk_upsert 按第一个参数的表名，execute_command 无法确定，视为修改全部表）
+WRITE_TABLES = {
+    'add_strategy': ('strategies',),
+    'add_nav_record': ('nav_records',),
+    'add_nav_records_bulk': ('nav_records',),
+    'recompute_return_rates': ('nav_records',),
+    'add_investor': ('investors',),
+    'add_product': ('products',),
+    'set_product_strategy_weight': ('product_strategy_weights',),
+    'set_product_strategy_weights_bulk': ('product_strategy_weights',),
+    'add_investment': ('investments',),
+    'add_investments_bulk': ('investments',),
+    'execute_command': ALL_TABLES,
+}
+
+def _freeze(value):
+    """把参数转为可哈希的缓存键，无法转换时抛出 TypeError"""
+    if isinstance(value, (pd.Series, pd.Index, np.ndarray, list, tuple, set)):
+        items = [_freeze(item) for item in value]
+        return tuple(sorted(items)) if isinstance(value, set) else tuple(items)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    hash(value)
+    return value
+
+def _copy(value):
+    """返回缓存结果的副本，调用方修改结果不会影响缓存"""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, (dict, list)):
+        return copy.copy(value)
+    return value
+
+class CachedDatabaseManager:
+    """读取缓存 + 写入失效
+
+    - 每个表有一个版本号，经本实例调用的写入方法（见 WRITE_TABLES）在完成后递增相关表的版本号，
+      并删除依赖这些表的缓存
+    - 缓存条目记录读取开始前各依赖表的版本号，命中时版本号必须一致，
+      读取期间发生的写入不会让旧结果被当作新结果
+    - 最多保留 maxsize 条，超出时淘汰最久未使用的条目；ttl 秒后条目过期，
+      使其他客户端直接写入数据库的数据也能生效（None 表示不过期）
+    - 命中时返回结果的副本；所有状态由锁保护，可在多个会话间共享同一实例
+
+    未列在 READ_DEPENDENCIES / WRITE_TABLES 中的属性和方法直接转发给被包装的管理器。
+    """
+
+    def __init__(self, db, maxsize: int = 256, ttl: Optional[float] = None):
+        self.db = db
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()
+        self._versions = {table: 0 for table in ALL_TABLES}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self.db, name)
+        if not callable(attr):
+            return attr
+        if name in READ_DEPENDENCIES:
+            return self._cached_reader(name, attr)
+        if name in WRITE_TABLES or name == 'bulk_upsert':
+            return self._invalidating_writer(name, attr)
+        return attr
+
+    # 版本号
+    def table_version(self, table: str) -> int:
+        """表的当前版本号，每次经本实例写入该表后加 1"""
+        with self._lock:
+            return self._versions.get(table, 0)
+
+    def table_versions(self, tables=ALL_TABLES) -> Tuple[int, ...]:
+        """多个表的当前版本号，可作为外部缓存键的一部分"""
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+
+    def invalidate(self, tables=ALL_TABLES):
+        """递增表的版本号并删除依赖这些表的缓存（数据被其他途径修改时手动调用）"""
+        tables = set(tables)
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+            stale = [key for key, entry in self._entries.items() if tables.intersection(entry['tables'])]
+            for key in stale:
+                del self._entries[key]
+
+    def clear_cache(self):
+        """清空全部缓存（不影响版本号和统计）"""
+        with self._lock:
+            self._entries.clear()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """命中统计：hits, misses, hit_rate, evictions, size, maxsize"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / total if total else 0.0,
+                'evictions': self._evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+    # 读写包装
+    def _cached_reader(self, name, method):
+        tables = READ_DEPENDENCIES[name]
+
+        def reader(*args, **kwargs):
+            try:
+                key = (name, _freeze(args), _freeze(kwargs))
+            except TypeError:
+                with self._lock:
+                    self._misses += 1
+                return method(*args, **kwargs)
+
+            with self._lock:
+                versions = self.table_versions(tables)
+                entry = self._entries.get(key)
+                if entry is not None and entry['versions'] == versions \
+                        and (self.ttl is None or time.time() - entry['stored_at'] <= self.ttl):
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return _copy(entry['value'])
+                self._misses += 1
+
+            # 读取不持有锁，多个会话可以同时读取数据库
+            value = method(*args, **kwargs)
+
+            with self._lock:
+                # 读取期间有写入时版本号已变化，结果不再缓存
+                if self.table_versions(tables) == versions:
+                    self._entries[key] = {'value': value, 'versions': versions, 'tables': tables,
+                                          'stored_at': time.time()}
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+                        self._evictions += 1
+            return _copy(value)
+
+        reader.__name__ = name
+        reader.__doc__ = method.__doc__
+        return reader
+
+    def _invalidating_writer(self, name, method):
+        def writer(*args, **kwargs):
+            try:
+                return method(*args, **kwargs)
+            finally:
+                # 写入完成（或失败，可能已部分写入）后再递增版本号
+                if name == 'bulk_upsert':
+                    table = args[0] if args else kwargs.get('table')
+                    self.invalidate([table] if table in ALL_TABLES else ALL_TABLES)
+                else:
+                    self.invalidate(WRITE_TABLES[name])
+
+        writer.__name__ = name
+        writer.__doc__ = method.__doc__
+        return writer
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+页面数据访问层
+app.py 每次交互都会从头重新运行，页面通过 DataAccess 读取数据：读取结果存入 st.cache_data，
+缓存键为 (读取方法, 参数, 依赖表的版本号)，版本号由 CachedDatabaseManager 在写入后递增。
+只改变界面状态的重新运行（切换标签、调整日期范围等）不访问数据库
+"""
+
+import threading
+import time
+from typing import Optional, List
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from cached_database import CachedDatabaseManager, READ_DEPENDENCIES
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_read(_db, backend: int, name: str, args: tuple, kwargs: dict, versions: tuple, epoch: int):
+    """读取并缓存结果；_db 不参与缓存键，由 backend（管理器的 id）区分不同的数据库"""
+    return getattr(_db, name)(*args, **kwargs)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_nav_window(_access, backend: int, start_date, end_date, columns: tuple, strategy_ids: Optional[tuple],
+                       versions: tuple, epoch: int):
+    nav_data = _access.get_nav_records(columns=list(dict.fromkeys(columns + ('date',))),
+                                       strategy_ids=None if strategy_ids is None else list(strategy_ids))
+    if nav_data.empty:
+        return nav_data
+    mask = pd.Series(True, index=nav_data.index)
+    if start_date:
+        mask &= nav_data['date'] >= str(start_date)
+    if end_date:
+        mask &= nav_data['date'] <= str(end_date)
+    return nav_data.loc[mask, list(columns)].reset_index(drop=True)
+
+class DataAccess:
+    """页面使用的数据访问接口
+
+    - READ_DEPENDENCIES 中的读取方法经 st.cache_data 缓存，缓存键包含依赖表的当前版本号：经本应用的
+      写入（add_* / set_* 等，由 CachedDatabaseManager 递增版本号）后相关读取自动重新查询
+    - ttl 秒为一个时间窗口，窗口变化后重新查询，使其他客户端直接写入数据库的数据也能生效（None 表示
+      只在版本号变化时重新查询）
+    - gather 并发执行页面内互不依赖的读取（由底层的 DatabaseManager / SupabaseManager 执行）
+    - 其他属性和方法（写入、get_nav_panel 等）直接转发给 CachedDatabaseManager
+    """
+
+    def __init__(self, db: CachedDatabaseManager, ttl: Optional[float] = 300):
+        self.db = db
+        self.ttl = ttl
+
+    def __getattr__(self, name):
+        attr = getattr(self.db, name)
+        if name not in READ_DEPENDENCIES or not callable(attr):
+            return attr
+
+        def reader(*args, **kwargs):
+            return _cached_read(self.db, id(self.db), name, args, kwargs,
+                                self.db.table_versions(READ_DEPENDENCIES[name]), self._epoch())
+
+        reader.__name__ = name
+        reader.__doc__ = attr.__doc__
+        return reader
+
+    def gather(self, *calls) -> list:
+        """并发执行多个互不依赖的读取，按参数顺序返回结果
+
+        calls 为无参数的可调用对象，如 db.gather(db.get_table_counts, db.get_latest_navs)；缓存命中的读取
+        直接返回，未命中的在底层管理器的 gather 线程中同时查询。工作线程沿用当前脚本的运行上下文，
+        st.cache_data 和错误信息与在脚本线程中调用时相同。
+        """
+        ctx = get_script_run_ctx(suppress_warning=True)
+
+        def run(call):
+            if ctx is not None:
+                add_script_run_ctx(threading.current_thread(), ctx)
+            return call()
+
+        return self.db.gather(*[lambda call=call: run(call) for call in calls])
+
+    def _epoch(self) -> int:
+        return int(time.time() // self.ttl) if self.ttl else 0
+
+    def get_nav_window(self, start_date=None, end_date=None, columns: Optional[List[str]] = None,
+                       strategy_ids: Optional[List[int]] = None) -> pd.DataFrame:
+        """日期区间内的净值记录（列和 strategy_ids 同 get_nav_records）
+
+        从缓存的全部净值记录（strategy_ids 不为 None 时为这些策略的全部记录）中按日期筛选，
+        调整日期范围不会重新查询数据库。
+        """
+        columns = tuple(columns or ('strategy_id', 'strategy_name', 'date', 'nav_value', 'return_rate'))
+        strategy_ids = None if strategy_ids is None else tuple(sorted(int(sid) for sid in strategy_ids))
+        return _cached_nav_window(self, id(self.db), start_date, end_date, columns, strategy_ids,
+                                  self.db.table_versions(READ_DEPENDENCIES['get_nav_records']), self._epoch())
@@ -1,17 +1,230 @@
 import sqlite3
+import queue
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 import os
 
+from nav_panel import NavPanel
+from nav_engine import (
+    normalize_nav_frame, compute_return_rates, stale_return_rates, compute_product_nav_series,
+    compute_product_navs_at, value_portfolios
+)
+
+# 数据库结构迁移：(版本号, 说明, 语句列表)
+# 按版本号顺序执行，已发布的迁移不要修改，结构变更一律追加新版本
+MIGRATIONS = [
+    (1, "热点查询索引", [
+        # get_investor_investments / get_all_portfolios 按投资人、产品过滤并按日期排序
+        "CREATE INDEX IF NOT EXISTS idx_investments_investor_date ON investments(investor_id, investment_date)",
+        "CREATE INDEX IF NOT EXISTS idx_investments_product_date ON investments(product_id, investment_date)",
+        # get_product_weights 按产品和生效日期过滤
+        "CREATE INDEX IF NOT EXISTS idx_psw_product_date ON product_strategy_weights(product_id, effective_date)",
+        # get_nav_records 按日期区间扫描（按策略+日期的查询使用 UNIQUE(strategy_id, date) 索引）
+        "CREATE INDEX IF NOT EXISTS idx_nav_records_date ON nav_records(date)",
+        "ANALYZE",
+    ]),
+    (2, "策略最新净值汇总表", [
+        """
+        CREATE TABLE IF NOT EXISTS strategy_latest_nav (
+            strategy_id INTEGER PRIMARY KEY,
+            date DATE NOT NULL,
+            nav_value REAL NOT NULL,
+            return_rate REAL,
+            FOREIGN KEY (strategy_id) REFERENCES strategies (id)
+        )
+        """,
+        """
+        INSERT OR REPLACE INTO strategy_latest_nav (strategy_id, date, nav_value, return_rate)
+        SELECT nr.strategy_id, nr.date, nr.nav_value, nr.return_rate
+        FROM nav_records nr
+        WHERE nr.date = (SELECT MAX(p.date) FROM nav_records p WHERE p.strategy_id = nr.strategy_id)
+        """,
+        # 新增净值：日期不早于当前最新净值时替换（INSERT OR REPLACE 覆盖旧记录时同样走这里）
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_nav_records_latest_insert
+        AFTER INSERT ON nav_records
+        BEGIN
+            INSERT INTO strategy_latest_nav (strategy_id, date, nav_value, return_rate)
+            VALUES (NEW.strategy_id, NEW.date, NEW.nav_value, NEW.return_rate)
+            ON CONFLICT (strategy_id) DO UPDATE SET
+                date = excluded.date,
+                nav_value = excluded.nav_value,
+                return_rate = excluded.return_rate
+            WHERE excluded.date >= strategy_latest_nav.date;
+        END
+        """,
+        # 修改或删除净值：按策略重新取最新一条
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_nav_records_latest_update
+        AFTER UPDATE ON nav_records
+        BEGIN
+            DELETE FROM strategy_latest_nav WHERE strategy_id IN (OLD.strategy_id, NEW.strategy_id);
+            INSERT INTO strategy_latest_nav (strategy_id, date, nav_value, return_rate)
+            SELECT strategy_id, date, nav_value, return_rate FROM nav_records
+            WHERE strategy_id = OLD.strategy_id ORDER BY date DESC LIMIT 1;
+            INSERT OR IGNORE INTO strategy_latest_nav (strategy_id, date, nav_value, return_rate)
+            SELECT strategy_id, date, nav_value, return_rate FROM nav_records
+            WHERE strategy_id = NEW.strategy_id ORDER BY date DESC LIMIT 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_nav_records_latest_delete
+        AFTER DELETE ON nav_records
+        BEGIN
+            DELETE FROM strategy_latest_nav WHERE strategy_id = OLD.strategy_id;
+            INSERT INTO strategy_latest_nav (strategy_id, date, nav_value, return_rate)
+            SELECT strategy_id, date, nav_value, return_rate FROM nav_records
+            WHERE strategy_id = OLD.strategy_id ORDER BY date DESC LIMIT 1;
+        END
+        """,
+    ]),
+    # 修正版本 2 的 trg_nav_records_latest_update：由 UPSERT（INSERT ... ON CONFLICT DO UPDATE，
+    # 如 bulk_upsert）触发时，外层语句的冲突处理会覆盖触发器内的 OR IGNORE，导致同一策略被插入两次而报错；
+    # 改为一条语句同时重建新旧策略的最新净值
+    (3, "修正最新净值更新触发器", [
+        "DROP TRIGGER IF EXISTS trg_nav_records_latest_update",
+        """
+        CREATE TRIGGER trg_nav_records_latest_update
+        AFTER UPDATE ON nav_records
+        BEGIN
+            DELETE FROM strategy_latest_nav WHERE strategy_id IN (OLD.strategy_id, NEW.strategy_id);
+            INSERT INTO strategy_latest_nav (strategy_id, date, nav_value, return_rate)
+            SELECT nr.strategy_id, nr.date, nr.nav_value, nr.return_rate FROM nav_records nr
+            WHERE nr.strategy_id IN (OLD.strategy_id, NEW.strategy_id)
+              AND nr.date = (SELECT MAX(p.date) FROM nav_records p WHERE p.strategy_id = nr.strategy_id);
+        END
+        """,
+    ]),
+]
+
+class SQLiteConnectionPool:
+    """SQLite连接池
+    
+    复用已打开的连接，避免每次查询都重新建立连接。连接以WAL模式打开，
+    读操作不会被写操作阻塞；写事务使用 BEGIN IMMEDIATE 提前获取写锁，
+    并发写入时按 busy_timeout 等待而不是直接报 "database is locked"。
+    """
+    
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",     # WAL模式下NORMAL即可保证数据库不损坏
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-16000",      # 每个连接约16MB页缓存
+        "PRAGMA mmap_size=134217728",    # 128MB内存映射读
+    )
+    
+    def __init__(self, db_path, pool_size=8, busy_timeout=10.0):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        # 空闲连接队列，最多保留 pool_size 个连接，多余的用完即关闭
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+    
+    def _connect(self):
+        """新建一个已设置好PRAGMA的连接"""
+        # isolation_level=None: 由 transaction() 显式管理事务
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        """从池中借出一个连接，使用完毕后自动归还"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+    
+    @contextmanager
+    def transaction(self):
+        """在一个写事务中执行多条语句，异常时整体回滚"""
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+    
+    def close(self):
+        """关闭所有空闲连接"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
 class DatabaseManager:
-    def __init__(self, db_path="fund_management.db"):
+    def __init__(self, db_path="fund_management.db", pool_size=8, max_workers=4):
         self.db_path = db_path
+        self.pool = SQLiteConnectionPool(db_path, pool_size=pool_size)
+        self.max_workers = max_workers
+        self.nav_panel = None
+        self.nav_panel_max_age = None
         self.init_database()
     
     def init_database(self):
         """初始化数据库表"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.pool.transaction() as conn:
+            self._create_tables(conn.cursor())
+        self.migrate()
+    
+    def migrate(self):
+        """执行尚未应用的结构迁移，返回迁移后的版本号"""
+        with self.pool.transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version INTEGER PRIMARY KEY,
+                    description TEXT,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            current = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations").fetchone()[0]
+            
+            for version, description, statements in MIGRATIONS:
+                if version <= current:
+                    continue
+                for statement in statements:
+                    if callable(statement):
+                        statement(conn)
+                    else:
+                        conn.execute(statement)
+                conn.execute(
+                    "INSERT INTO schema_migrations (version, description) VALUES (?, ?)",
+                    (version, description)
+                )
+                current = version
+        
+        return current
+    
+    def get_schema_version(self):
+        """获取当前数据库结构版本"""
+        result = self.execute_query("SELECT COALESCE(MAX(version), 0) AS version FROM schema_migrations")
+        return int(result['version'].iloc[0])
+    
+    def _create_tables(self, cursor):
+        """创建基础表结构"""
         
         # 策略表
         cursor.execute('''
@@ -88,32 +301,127 @@ class DatabaseManager:
                 FOREIGN KEY (strategy_id) REFERENCES strategies (id)
             )
         ''')
+    
+    def close(self):
+        """关闭连接池中的连接"""
+        self.pool.close()
+    
+    def gather(self, *calls):
+        """并发执行多个互不依赖的读取，按参数顺序返回结果（与 SupabaseManager.gather 相同）
         
-        conn.commit()
-        conn.close()
+        calls 为无参数的可调用对象；各调用在最多 max_workers 个线程中执行，分别从连接池借出连接，
+        WAL 模式下读取互不阻塞。
+        """
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(calls)))) as executor:
+            return list(executor.map(lambda call: call(), calls))
     
     def execute_query(self, query, params=None):
         """执行查询"""
-        conn = sqlite3.connect(self.db_path)
-        if params:
-            result = pd.read_sql_query(query, conn, params=params)
-        else:
-            result = pd.read_sql_query(query, conn)
-        conn.close()
-        return result
+        with self.pool.connection() as conn:
+            if params:
+                return pd.read_sql_query(query, conn, params=params)
+            return pd.read_sql_query(query, conn)
     
     def execute_command(self, command, params=None):
         """执行命令（INSERT, UPDATE, DELETE）"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        if params:
-            cursor.execute(command, params)
-        else:
-            cursor.execute(command)
-        conn.commit()
-        lastrowid = cursor.lastrowid
-        conn.close()
-        return lastrowid
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            if params:
+                cursor.execute(command, params)
+            else:
+                cursor.execute(command)
+            return cursor.lastrowid
+    
+    def _table_columns(self, table):
+        """表的列名集合，表不存在时为空"""
+        with self.pool.connection() as conn:
+            return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    
+    def _projection(self, table, columns=None, alias=None, joined=None):
+        """SELECT 列表
+        
+        columns 为 None 时为表的全部列加 joined 中的联表列，否则只包含 columns；
+        joined 为 {输出列名: SQL 表达式}（如 {'strategy_name': 's.name'}），列名不存在时抛出 ValueError。
+        """
+        prefix = f"{alias}." if alias else ""
+        joined = joined or {}
+        if columns is None:
+            return ", ".join([f"{prefix}*"] + [f"{expr} as {name}" for name, expr in joined.items()])
+        table_columns = self._table_columns(table)
+        unknown = [col for col in columns if col not in table_columns and col not in joined]
+        if unknown:
+            raise ValueError(f"表 {table} 缺少列: {', '.join(map(str, unknown))}")
+        return ", ".join(f"{joined[col]} as {col}" if col in joined else f"{prefix}{col}" for col in columns)
+    
+    def get_table_counts(self, tables=("strategies", "investors", "products", "nav_records")):
+        """获取各表记录数，返回 {表名: 记录数}"""
+        query = "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {table}) AS {table}" for table in tables)
+        result = self.execute_query(query)
+        return {table: int(result[table].iloc[0]) for table in tables}
+    
+    # 批量写入
+    def bulk_upsert(self, table, rows, on_conflict=None, batch_size=1000):
+        """分批写入多条记录
+        
+        rows 为 DataFrame 或字典列表。每 batch_size 条在一个事务中用 executemany 写入；
+        指定 on_conflict（如 "strategy_id,date"，需为表上的唯一约束）时冲突的记录更新其余列，否则直接插入。
+        某一批失败只回滚该批，不影响其他批次。写入 nav_records 的 nav_value 时，受影响策略此后各条的收益率
+        随后按已存储的净值重新计算（与 add_nav_records_bulk 的结果一致）。
+        返回 {'written': 成功写入条数, 'failed': 失败条数, 'errors': 各失败批次的说明}，与 SupabaseManager 一致。
+        """
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+        result = {'written': 0, 'failed': 0, 'errors': []}
+        if df.empty:
+            return result
+        
+        table_columns = self._table_columns(table)
+        conflict_columns = [col.strip() for col in on_conflict.split(",")] if on_conflict else []
+        unknown = [col for col in list(df.columns) + conflict_columns if col not in table_columns]
+        if not table_columns or unknown:
+            raise ValueError(f"表 {table} 不存在或缺少列: {', '.join(map(str, unknown))}")
+        
+        columns = list(df.columns)
+        command = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})"
+        if conflict_columns:
+            updates = [col for col in columns if col not in conflict_columns]
+            action = "DO UPDATE SET " + ", ".join(f"{col} = excluded.{col}" for col in updates) if updates else "DO NOTHING"
+            command += f" ON CONFLICT ({', '.join(conflict_columns)}) {action}"
+        
+        df = df.copy()
+        for column in columns:
+            if pd.api.types.is_datetime64_any_dtype(df[column]):
+                df[column] = df[column].dt.strftime('%Y-%m-%d')
+        values = list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+        
+        for start in range(0, len(values), batch_size):
+            chunk = values[start:start + batch_size]
+            try:
+                with self.pool.transaction() as conn:
+                    conn.executemany(command, chunk)
+                result['written'] += len(chunk)
+            except sqlite3.Error as e:
+                result['failed'] += len(chunk)
+                result['errors'].append(f"{table} 第{start + 1}-{start + len(chunk)}条写入失败: {str(e)}")
+        
+        if table == 'nav_records' and 'nav_value' in columns and result['written']:
+            self._after_nav_upsert(df)
+        return result
+    
+    def _after_nav_upsert(self, df):
+        """bulk_upsert 直接写入净值后，修复受影响策略此后的收益率并同步内存面板
+        
+        没有 strategy_id / date 列（如按 id 更新）时无法确定范围，重新计算全部收益率。
+        """
+        if not {'strategy_id', 'date'}.issubset(df.columns):
+            self.recompute_return_rates()
+            if self.nav_panel is not None:
+                self.nav_panel.load(self._nav_panel_records())
+            return
+        
+        navs = df[['strategy_id', 'date', 'nav_value']].dropna()
+        self.recompute_return_rates(strategy_ids=navs['strategy_id'].unique(), since=navs['date'].min())
+        if self.nav_panel is not None:
+            self.nav_panel.update_many(navs)
     
     # 策略相关方法
     def add_strategy(self, name, description="", start_date=None, initial_nav=1.0):
@@ -127,9 +435,9 @@ class DatabaseManager:
         """
         return self.execute_command(command, (name, description, start_date, initial_nav))
     
-    def get_strategies(self):
-        """获取所有策略"""
-        query = "SELECT * FROM strategies ORDER BY created_at"
+    def get_strategies(self, columns=None):
+        """获取所有策略，columns 指定只读取的列（默认全部列）"""
+        query = f"SELECT {self._projection('strategies', columns)} FROM strategies ORDER BY created_at"
         return self.execute_query(query)
     
     def get_strategy_by_id(self, strategy_id):
@@ -139,21 +447,148 @@ class DatabaseManager:
     
     # 净值记录相关方法
     def add_nav_record(self, strategy_id, date, nav_value):
-        """添加净值记录"""
-        # 计算收益率
-        last_nav = self.get_last_nav(strategy_id, date)
-        return_rate = None
-        if last_nav is not None:
-            return_rate = (nav_value - last_nav) / last_nav * 100
+        """添加净值记录
+        
+        补录或修正历史净值时，紧随其后的一条净值的收益率会在同一事务中一并更新。
+        """
+        # 收益率始终按数据库中的净值计算，不使用可能过期的内存面板
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT nav_value FROM nav_records 
+                WHERE strategy_id = ? AND date < ? 
+                ORDER BY date DESC LIMIT 1
+            """, (strategy_id, date))
+            row = cursor.fetchone()
+            return_rate = None
+            if row is not None:
+                last_nav = row[0]
+                return_rate = (nav_value - last_nav) / last_nav * 100
+            
+            cursor.execute("""
+                INSERT OR REPLACE INTO nav_records (strategy_id, date, nav_value, return_rate)
+                VALUES (?, ?, ?, ?)
+            """, (strategy_id, date, nav_value, return_rate))
+            lastrowid = cursor.lastrowid
+            
+            # 修复下一条净值的收益率（按日期顺序追加时不存在下一条）
+            cursor.execute("""
+                UPDATE nav_records
+                SET return_rate = (nav_value - ?) / ? * 100
+                WHERE id = (
+                    SELECT id FROM nav_records
+                    WHERE strategy_id = ? AND date > ?
+                    ORDER BY date LIMIT 1
+                )
+            """, (nav_value, nav_value, strategy_id, date))
+        
+        if self.nav_panel is not None:
+            self.nav_panel.update(strategy_id, date, nav_value)
+        return lastrowid
+    
+    def add_nav_records_bulk(self, df):
+        """批量添加净值记录
+        
+        df 需包含 strategy_id, date, nav_value 三列。收益率按每个策略已存储的净值向量化计算，
+        紧跟在新记录之后的已有净值的收益率也会重新计算，全部在一个事务中写入，
+        结果与逐条调用 add_nav_record 相同（与写入顺序无关）。
+        返回写入的记录数。
+        """
+        batch = normalize_nav_frame(df)
+        if batch.empty:
+            return 0
+        
+        bounds = batch.groupby('strategy_id')['date'].agg(['min', 'max']).reset_index()
+        values = ", ".join(["(?, ?, ?)"] * len(bounds))
+        # 每个策略取本批最早日期之前的最后一条净值、本批日期范围内的已有净值，
+        # 以及本批最晚日期之后的第一条净值（其收益率可能需要修复）
+        query = f"""
+            WITH bounds(strategy_id, lo, hi) AS (VALUES {values})
+            SELECT nr.strategy_id, nr.date, nr.nav_value
+            FROM nav_records nr
+            JOIN bounds b ON nr.strategy_id = b.strategy_id
+            WHERE nr.date <= COALESCE(
+                  (SELECT MIN(n.date) FROM nav_records n
+                   WHERE n.strategy_id = b.strategy_id AND n.date > b.hi),
+                  b.hi)
+              AND nr.date >= COALESCE(
+                  (SELECT MAX(p.date) FROM nav_records p
+                   WHERE p.strategy_id = b.strategy_id AND p.date < b.lo),
+                  b.lo)
+        """
+        params = [value for row in bounds.itertuples(index=False) for value in (int(row[0]), row[1], row[2])]
         
         command = """
             INSERT OR REPLACE INTO nav_records (strategy_id, date, nav_value, return_rate)
             VALUES (?, ?, ?, ?)
         """
-        return self.execute_command(command, (strategy_id, date, nav_value, return_rate))
+        with self.pool.transaction() as conn:
+            existing = pd.read_sql_query(query, conn, params=params)
+            records, repairs = compute_return_rates(batch, existing)
+            rows = [
+                (int(sid), nav_date, float(nav), None if pd.isna(rate) else float(rate))
+                for sid, nav_date, nav, rate in records.itertuples(index=False)
+            ]
+            conn.executemany(command, rows)
+            self._update_return_rates(conn, repairs)
+        
+        if self.nav_panel is not None:
+            self.nav_panel.update_many(records)
+        return len(rows)
+    
+    def _update_return_rates(self, conn, records):
+        """按 (strategy_id, date) 更新收益率"""
+        conn.executemany(
+            "UPDATE nav_records SET return_rate = ? WHERE strategy_id = ? AND date = ?",
+            [
+                (None if pd.isna(rate) else float(rate), int(sid), nav_date)
+                for sid, nav_date, rate in records[['strategy_id', 'date', 'return_rate']].itertuples(index=False)
+            ]
+        )
+    
+    def recompute_return_rates(self, strategy_id=None, since=None, strategy_ids=None):
+        """按已存储的净值重新计算收益率
+        
+        strategy_id 为 None 时处理全部策略（strategy_ids 为策略 id 列表时只处理这些策略）；
+        since 为 None 时处理全部历史，否则只修复该日期及之后的记录。
+        只更新与净值序列不一致的记录，返回更新的记录数。
+        """
+        conditions = []
+        params = []
+        if strategy_id is not None:
+            conditions.append("nr.strategy_id = ?")
+            params.append(strategy_id)
+        if strategy_ids is not None:
+            strategy_ids = [int(sid) for sid in strategy_ids]
+            conditions.append(f"nr.strategy_id IN ({', '.join('?' * len(strategy_ids))})")
+            params.extend(strategy_ids)
+        if since is not None:
+            # 包含 since 之前的最后一条净值，作为第一条的上期净值
+            conditions.append("""nr.date >= COALESCE(
+                (SELECT MAX(p.date) FROM nav_records p
+                 WHERE p.strategy_id = nr.strategy_id AND p.date < ?),
+                ?)""")
+            params.extend([since, since])
+        
+        query = "SELECT nr.strategy_id, nr.date, nr.nav_value, nr.return_rate FROM nav_records nr"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        
+        with self.pool.transaction() as conn:
+            navs = pd.read_sql_query(query, conn, params=params)
+            stale = stale_return_rates(navs, since)
+            self._update_return_rates(conn, stale)
+        return len(stale)
     
     def get_last_nav(self, strategy_id, before_date):
         """获取指定日期前的最后一个净值"""
+        panel = self._active_nav_panel()
+        if panel is not None:
+            return panel.nav_asof(strategy_id, before_date, inclusive=False)
+        return self._query_last_nav(strategy_id, before_date)
+    
+    def _query_last_nav(self, strategy_id, before_date):
+        """从数据库查询指定日期前的最后一个净值"""
         query = """
             SELECT nav_value FROM nav_records 
             WHERE strategy_id = ? AND date < ? 
@@ -162,10 +597,15 @@ class DatabaseManager:
         result = self.execute_query(query, (strategy_id, before_date))
         return result['nav_value'].iloc[0] if not result.empty else None
     
-    def get_nav_records(self, strategy_id=None, start_date=None, end_date=None):
-        """获取净值记录"""
-        query = """
-            SELECT nr.*, s.name as strategy_name 
+    def get_nav_records(self, strategy_id=None, start_date=None, end_date=None, columns=None, strategy_ids=None):
+        """获取净值记录
+        
+        columns 指定只读取的列（可包含 strategy_name），默认为全部列加 strategy_name；
+        strategy_ids 为策略 id 列表时只读取这些策略的记录。
+        """
+        projection = self._projection('nav_records', columns, alias='nr', joined={'strategy_name': 's.name'})
+        query = f"""
+            SELECT {projection}
             FROM nav_records nr
             JOIN strategies s ON nr.strategy_id = s.id
         """
@@ -176,6 +616,11 @@ class DatabaseManager:
             conditions.append("nr.strategy_id = ?")
             params.append(strategy_id)
         
+        if strategy_ids is not None:
+            strategy_ids = [int(sid) for sid in strategy_ids]
+            conditions.append(f"nr.strategy_id IN ({', '.join('?' * len(strategy_ids))})")
+            params.extend(strategy_ids)
+        
         if start_date:
             conditions.append("nr.date >= ?")
             params.append(start_date)
@@ -191,15 +636,51 @@ class DatabaseManager:
         
         return self.execute_query(query, params if params else None)
     
+    def get_latest_navs(self):
+        """获取每个策略的最新净值（读取触发器维护的 strategy_latest_nav 汇总表）"""
+        query = """
+            SELECT l.strategy_id, s.name as strategy_name, l.date, l.nav_value, l.return_rate
+            FROM strategy_latest_nav l
+            JOIN strategies s ON l.strategy_id = s.id
+            ORDER BY l.strategy_id
+        """
+        return self.execute_query(query)
+    
+    # 内存净值面板
+    def enable_nav_panel(self, max_age=None):
+        """启用内存净值面板
+        
+        启用后 get_last_nav / get_strategy_nav_at_date 等 as-of 查询直接读内存，
+        经本实例写入的净值会增量更新到面板。其他进程写入的数据在 max_age 秒后
+        面板于后台自动重新加载时生效（None 表示不自动重新加载）。
+        """
+        self.nav_panel_max_age = max_age
+        self.nav_panel = NavPanel(self._nav_panel_records())
+        return self.nav_panel
+    
+    def get_nav_panel(self):
+        """获取内存净值面板，未启用时先启用"""
+        return self._active_nav_panel() or self.enable_nav_panel()
+    
+    def _active_nav_panel(self):
+        """返回已启用的面板，超过 max_age 时在后台重新加载（本次仍读取现有面板）"""
+        panel = self.nav_panel
+        if panel is not None:
+            panel.refresh_if_stale(self._nav_panel_records, self.nav_panel_max_age)
+        return panel
+    
+    def _nav_panel_records(self):
+        return self.execute_query("SELECT strategy_id, date, nav_value FROM nav_records")
+    
     # 投资人相关方法
     def add_investor(self, name, contact=""):
         """添加投资人"""
         command = "INSERT INTO investors (name, contact) VALUES (?, ?)"
         return self.execute_command(command, (name, contact))
     
-    def get_investors(self):
-        """获取所有投资人"""
-        query = "SELECT * FROM investors ORDER BY name"
+    def get_investors(self, columns=None):
+        """获取所有投资人，columns 指定只读取的列（默认全部列）"""
+        query = f"SELECT {self._projection('investors', columns)} FROM investors ORDER BY name"
         return self.execute_query(query)
     
     # 产品相关方法
@@ -208,9 +689,9 @@ class DatabaseManager:
         command = "INSERT INTO products (name, description) VALUES (?, ?)"
         return self.execute_command(command, (name, description))
     
-    def get_products(self):
-        """获取所有产品"""
-        query = "SELECT * FROM products ORDER BY name"
+    def get_products(self, columns=None):
+        """获取所有产品，columns 指定只读取的列（默认全部列）"""
+        query = f"SELECT {self._projection('products', columns)} FROM products ORDER BY name"
         return self.execute_query(query)
     
     def set_product_strategy_weight(self, product_id, strategy_id, weight, effective_date=None):
@@ -225,6 +706,18 @@ class DatabaseManager:
         """
         return self.execute_command(command, (product_id, strategy_id, weight, effective_date))
     
+    def set_product_strategy_weights_bulk(self, df):
+        """批量设置产品策略权重
+        
+        df 需包含 product_id, strategy_id, weight, effective_date 四列，通过 bulk_upsert 写入。
+        返回写入的记录数。
+        """
+        if df.empty:
+            return 0
+        weights = df[['product_id', 'strategy_id', 'weight', 'effective_date']].copy()
+        weights['effective_date'] = pd.to_datetime(weights['effective_date']).dt.strftime('%Y-%m-%d')
+        return self.bulk_upsert("product_strategy_weights", weights)['written']
+    
     def get_product_weights(self, product_id, date=None):
         """获取产品策略权重"""
         if date is None:
@@ -264,10 +757,40 @@ class DatabaseManager:
         """
         return self.execute_command(command, (investor_id, product_id, investment_date, amount, shares, nav_at_investment, investment_type))
     
-    def get_investor_investments(self, investor_id=None, product_id=None):
-        """获取投资记录"""
-        query = """
-            SELECT i.*, inv.name as investor_name, p.name as product_name
+    def add_investments_bulk(self, df):
+        """批量添加投资记录
+        
+        df 需包含 investor_id, product_id, amount, investment_date 列，可选 type 列（默认 investment）。
+        投资时的产品净值按日期批量计算（每个日期一次 get_product_navs），份额计算与 add_investment 一致。
+        通过 bulk_upsert 写入，返回写入的记录数。
+        """
+        if df.empty:
+            return 0
+        investments = df.copy()
+        if 'type' not in investments.columns:
+            investments['type'] = 'investment'
+        investments['investment_date'] = pd.to_datetime(investments['investment_date']).dt.strftime('%Y-%m-%d')
+        
+        navs = []
+        for investment_date, group in investments.groupby('investment_date', sort=False):
+            product_navs = self.get_product_navs(group['product_id'].unique(), investment_date)
+            navs.append(group['product_id'].map(product_navs))
+        investments['nav_at_investment'] = pd.concat(navs).reindex(investments.index).astype('float64')
+        investments['shares'] = (investments['amount'] / investments['nav_at_investment']).where(
+            investments['nav_at_investment'] > 0, 0.0)
+        
+        columns = ['investor_id', 'product_id', 'investment_date', 'amount', 'shares', 'nav_at_investment', 'type']
+        return self.bulk_upsert("investments", investments[columns])['written']
+    
+    def get_investor_investments(self, investor_id=None, product_id=None, columns=None):
+        """获取投资记录
+        
+        columns 指定只读取的列（可包含 investor_name, product_name），默认为全部列加这两列。
+        """
+        projection = self._projection('investments', columns, alias='i',
+                                      joined={'investor_name': 'inv.name', 'product_name': 'p.name'})
+        query = f"""
+            SELECT {projection}
             FROM investments i
             JOIN investors inv ON i.investor_id = inv.id
             JOIN products p ON i.product_id = p.id
@@ -317,8 +840,56 @@ class DatabaseManager:
         
         return total_nav / total_weight if total_weight > 0 else 1.0
     
+    def get_product_nav_series(self, product_id, start_date=None, end_date=None):
+        """获取产品在日期区间内的净值序列
+        
+        一次性读取产品的全部生效权重和相关策略净值，在内存中按日期对齐计算，
+        结果与逐日调用 calculate_product_nav 相同。计算日期为区间内各策略有净值的日期。
+        返回 date, nav_value 两列。
+        """
+        if end_date is None:
+            end_date = datetime.now().date()
+        
+        weights_query = """
+            SELECT psw.id, psw.strategy_id, psw.weight, psw.effective_date
+            FROM product_strategy_weights psw
+            JOIN strategies s ON psw.strategy_id = s.id
+            WHERE psw.product_id = ? AND psw.effective_date <= ?
+        """
+        # 区间内的净值，加上每个策略在开始日期当天或之前的最后一条净值
+        navs_query = """
+            SELECT nr.strategy_id, nr.date, nr.nav_value
+            FROM nav_records nr
+            WHERE nr.strategy_id IN (
+                SELECT strategy_id FROM product_strategy_weights WHERE product_id = ?
+            )
+              AND nr.date <= ?
+        """
+        navs_params = [product_id, end_date]
+        if start_date is not None:
+            navs_query += """
+              AND nr.date >= COALESCE(
+                  (SELECT MAX(p.date) FROM nav_records p
+                   WHERE p.strategy_id = nr.strategy_id AND p.date <= ?),
+                  ?)
+            """
+            navs_params += [start_date, start_date]
+        
+        with self.pool.connection() as conn:
+            weights = pd.read_sql_query(weights_query, conn, params=(product_id, end_date))
+            navs = pd.read_sql_query(navs_query, conn, params=navs_params)
+        
+        dates = navs['date']
+        if start_date is not None:
+            dates = dates[pd.to_datetime(dates) >= pd.to_datetime(start_date)]
+        return compute_product_nav_series(weights, navs, dates)
+    
     def get_strategy_nav_at_date(self, strategy_id, date):
         """获取策略在指定日期的净值"""
+        panel = self._active_nav_panel()
+        if panel is not None:
+            return panel.nav_asof(strategy_id, date)
+        
         query = """
             SELECT nav_value FROM nav_records 
             WHERE strategy_id = ? AND date <= ? 
@@ -359,3 +930,77 @@ class DatabaseManager:
                 portfolio.loc[idx, 'profit_rate'] = profit_rate
         
         return portfolio
+    
+    def get_product_navs(self, product_ids, date=None):
+        """批量计算多个产品在指定日期的净值，返回 {product_id: 净值}"""
+        if date is None:
+            date = datetime.now().date()
+        
+        product_ids = [int(pid) for pid in product_ids]
+        if not product_ids:
+            return {}
+        
+        placeholders = ", ".join(["?"] * len(product_ids))
+        weights_query = f"""
+            SELECT psw.id, psw.product_id, psw.strategy_id, psw.weight, psw.effective_date
+            FROM product_strategy_weights psw
+            JOIN strategies s ON psw.strategy_id = s.id
+            WHERE psw.product_id IN ({placeholders}) AND psw.effective_date <= ?
+        """
+        # 每个相关策略在该日期当天或之前的最后一条净值
+        navs_query = f"""
+            SELECT nr.strategy_id, nr.date, nr.nav_value
+            FROM nav_records nr
+            WHERE nr.strategy_id IN (
+                SELECT strategy_id FROM product_strategy_weights WHERE product_id IN ({placeholders})
+            )
+              AND nr.date = (
+                  SELECT MAX(p.date) FROM nav_records p
+                  WHERE p.strategy_id = nr.strategy_id AND p.date <= ?
+              )
+        """
+        params = product_ids + [date]
+        
+        with self.pool.connection() as conn:
+            weights = pd.read_sql_query(weights_query, conn, params=params)
+            navs = pd.read_sql_query(navs_query, conn, params=params)
+        
+        product_navs = compute_product_navs_at(weights, navs, date)
+        return {pid: product_navs.get(pid, 1.0) for pid in product_ids}
+    
+    def get_all_portfolios(self, as_of=None):
+        """获取所有投资人的持仓信息
+        
+        一条聚合查询汇总所有 (投资人, 产品) 的投资金额和份额，每个产品只估值一次。
+        as_of 为估值日期（默认今天），同时只统计该日期及之前的交易。
+        各列含义与 get_investor_portfolio 相同，另含 investor_id, investor_name。
+        """
+        query = """
+            SELECT 
+                i.investor_id,
+                inv.name as investor_name,
+                p.name as product_name,
+                p.id as product_id,
+                SUM(CASE WHEN i.type = 'investment' THEN i.amount ELSE -i.amount END) as total_investment,
+                SUM(CASE WHEN i.type = 'investment' THEN i.shares ELSE -i.shares END) as total_shares,
+                COUNT(*) as transaction_count
+            FROM investments i
+            JOIN investors inv ON i.investor_id = inv.id
+            JOIN products p ON i.product_id = p.id
+        """
+        params = None
+        if as_of is not None:
+            query += " WHERE i.investment_date <= ?"
+            params = (as_of,)
+        query += """
+            GROUP BY i.investor_id, inv.name, p.id, p.name
+            HAVING total_shares > 0
+            ORDER BY inv.name, i.investor_id, p.name
+        """
+        
+        holdings = self.execute_query(query, params)
+        if holdings.empty:
+            return holdings
+        
+        product_navs = self.get_product_navs(holdings['product_id'].unique(), as_of)
+        return value_portfolios(holdings, product_navs)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+增量拉取的水位线
+按 id 超过已拉取的最大 id、或 created_at 在上次拉取之后读取新记录（HybridDatabaseManager 的定期拉取使用），
+其他客户端的修改和删除由定期全量对账同步
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict
+
+def utc_now() -> datetime:
+    """当前 UTC 时间（不带时区，与表中 created_at 的 TIMESTAMP 类型一致）"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def delta_params(max_id: Optional[int], fetched_at: Optional[datetime], lag: float) -> Dict[str, str]:
+    """增量读取的查询参数：id 超过 max_id，或 created_at 在 fetched_at（上次读取开始的 UTC 时间）前 lag 秒之后
+
+    id 在插入时分配、在提交时才可见，created_at 的回看窗口用于补上 id 较小但在上次读取之后才提交的记录，
+    lag 需覆盖最长的写入事务和本机与数据库的时钟偏差；重复读到的记录按 id 合并。
+    """
+    if max_id is None:
+        return {"select": "*"}
+    if fetched_at is None:
+        return {"select": "*", "id": f"gt.{max_id}"}
+    since = (fetched_at - timedelta(seconds=lag)).strftime('%Y-%m-%d %H:%M:%S')
+    return {"select": "*", "or": f"(id.gt.{max_id},created_at.gte.{since})"}
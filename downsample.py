@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+图表数据降采样
+净值、收益率曲线在生成 plotly 图表前按像素预算降采样（Largest-Triangle-Three-Buckets），
+并保留最高点、最低点和最大回撤的起止点，使曲线形状和回撤在降采样后保持不变
+"""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+# 每条曲线保留的点数上限，约为图表宽度的像素数
+MAX_POINTS = 1500
+# 原始（去掉空值后）点数超过该值时使用 WebGL（Scattergl）绘制：需要降采样的长曲线往往和其他长曲线
+# 叠加在同一张图中，WebGL 重绘和缩放更快，但在部分浏览器中线条不如 SVG 平滑；与 MAX_POINTS 相同，
+# 即按默认点数降采样过的曲线都用 WebGL，未降采样的短曲线用 SVG（Scatter）
+WEBGL_THRESHOLD = MAX_POINTS
+
+def _numeric_x(x) -> np.ndarray:
+    """横轴转为数值（日期转为纳秒时间戳）"""
+    values = np.asarray(x)
+    if np.issubdtype(values.dtype, np.number):
+        return values.astype('float64')
+    return pd.to_datetime(values).values.astype('int64').astype('float64')
+
+def lttb_indices(x, y, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets 选出的 threshold 个点的下标（升序）
+
+    首尾两点必选，其余点均分为 threshold - 2 个桶，每个桶选出与上一个选中点和下一个桶均值
+    构成的三角形面积最大的点。x 需升序，点数不超过 threshold 时返回全部下标。
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = _numeric_x(x)
+    y = np.asarray(y, dtype='float64')
+    every = (n - 2) / (threshold - 2)
+    # 第 i 个桶为 [bounds[i], bounds[i + 1])，最后一个“桶”为末尾一点
+    bounds = np.minimum((np.arange(threshold - 1) * every).astype('int64') + 1, n - 1)
+    bounds = np.append(bounds, n)
+
+    selected = np.empty(threshold, dtype='int64')
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = bounds[i], bounds[i + 1]
+        next_start, next_end = bounds[i + 1], max(bounds[i + 2], bounds[i + 1] + 1)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+def extreme_indices(y) -> np.ndarray:
+    """最高点、最低点和最大回撤起止点（回撤按与此前最高点的差值计算）的下标"""
+    y = np.asarray(y, dtype='float64')
+    if len(y) == 0:
+        return np.array([], dtype='int64')
+    trough = int(np.argmin(y - np.maximum.accumulate(y)))
+    peak = int(np.argmax(y[:trough + 1]))
+    return np.unique([int(np.argmin(y)), int(np.argmax(y)), peak, trough])
+
+def downsample(x, y, max_points: int = MAX_POINTS) -> Tuple[np.ndarray, np.ndarray]:
+    """把曲线降到约 max_points 个点（LTTB 加上 extreme_indices 的点），返回 (x, y)
+
+    y 为空值的点先去掉；点数不超过 max_points 时原样返回。
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype='float64')
+    valid = ~np.isnan(y)
+    if not valid.all():
+        x, y = x[valid], y[valid]
+    if len(y) <= max_points:
+        return x, y
+    indices = np.union1d(lttb_indices(x, y, max_points), extreme_indices(y))
+    return x[indices], y[indices]
+
+def line_trace(x, y, name: str, max_points: int = MAX_POINTS, webgl_threshold: int = WEBGL_THRESHOLD, **kwargs):
+    """降采样后的曲线 trace
+
+    原始非空点数超过 webgl_threshold 时使用 Scattergl；LTTB 实际去掉了点的曲线不画点标记
+    （mode 改为 lines，只去掉空值时保持原样）。其余参数传给 go.Scatter / go.Scattergl。
+    """
+    import plotly.graph_objects as go
+
+    points = int(np.count_nonzero(~np.isnan(np.asarray(y, dtype='float64'))))
+    x, y = downsample(x, y, max_points)
+    if len(y) < points:
+        kwargs['mode'] = 'lines'
+        kwargs.pop('marker', None)
+    trace = go.Scattergl if points > webgl_threshold else go.Scatter
+    return trace(x=x, y=y, name=name, **kwargs)
@@ -0,0 +1,630 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+离线优先的混合数据库管理器
+读取全部在本地 SQLite 副本上完成（与 DatabaseManager 相同的表结构和方法）；
+写入先落到本地副本，同时由触发器记录到持久化的 outbox 表，后台线程分批推送到 Supabase，
+并定期从 Supabase 拉取其他客户端写入的数据。云端不可达时照常读写，恢复后自动补推
+"""
+
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Callable
+
+import pandas as pd
+import requests
+
+from cached_database import WRITE_TABLES
+from database import DatabaseManager
+from delta_sync import delta_params, utc_now
+from supabase_database import SupabaseManager, _json_loads
+
+# 同步的表，按外键依赖排序（先父表后子表）
+REPLICA_TABLES = ('strategies', 'investors', 'products', 'nav_records', 'product_strategy_weights', 'investments')
+
+# 带唯一约束的表：推送新记录时按该约束合并到云端已有的记录（后写入的生效）
+NATURAL_KEYS = {
+    'strategies': ('name',),
+    'products': ('name',),
+    'nav_records': ('strategy_id', 'date'),
+}
+
+# 其余表的幂等键列（见 supabase_sync_keys.sql）：本地新记录首次推送前生成 UUID 并写入本地副本，
+# 推送时按该列合并，响应丢失后重试不会重复插入，并按该列对应云端分配的 id
+SYNC_KEY = 'sync_key'
+SYNC_KEY_TABLES = tuple(table for table in REPLICA_TABLES if table not in NATURAL_KEYS)
+
+# 子表外键列 -> 父表
+FOREIGN_KEYS = {
+    'nav_records': {'strategy_id': 'strategies'},
+    'product_strategy_weights': {'product_id': 'products', 'strategy_id': 'strategies'},
+    'investments': {'investor_id': 'investors', 'product_id': 'products'},
+}
+
+# 只写入一条记录、DatabaseManager 返回 lastrowid 的方法；本地新记录的 id 在推送后会改变，改为返回是否成功
+SINGLE_ROW_WRITERS = ('add_strategy', 'add_nav_record', 'add_investor', 'add_product',
+                      'set_product_strategy_weight', 'add_investment')
+
+# 不写入 outbox 的列：id 由云端分配，created_at 使用云端默认值
+LOCAL_ONLY_COLUMNS = ('id', 'created_at')
+
+def _replica_schema():
+    """outbox、同步状态表和记录本地写入的触发器（可重复执行）"""
+    statements = [
+        """
+        CREATE TABLE IF NOT EXISTS sync_outbox (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL CHECK(op IN ('insert', 'update', 'delete')),
+            status TEXT NOT NULL DEFAULT 'pending' CHECK(status IN ('pending', 'conflict')),
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_sync_outbox_status ON sync_outbox(status, seq)",
+        "CREATE INDEX IF NOT EXISTS idx_sync_outbox_row ON sync_outbox(table_name, row_id)",
+        """
+        CREATE TABLE IF NOT EXISTS sync_state (
+            table_name TEXT PRIMARY KEY,
+            max_id INTEGER,
+            pulled_at TIMESTAMP,
+            reconciled_at REAL
+        )
+        """,
+        # 已替换的临时 id，用于修正之后仍引用旧临时 id 的写入
+        """
+        CREATE TABLE IF NOT EXISTS sync_id_map (
+            table_name TEXT NOT NULL,
+            temp_id INTEGER NOT NULL,
+            real_id INTEGER NOT NULL,
+            PRIMARY KEY (table_name, temp_id)
+        )
+        """,
+        # capture = 0 时（拉取云端数据、替换临时 id）本地写入不记录到 outbox；temp_id 为上一个分配的临时 id
+        """
+        CREATE TABLE IF NOT EXISTS sync_control (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            capture INTEGER NOT NULL,
+            temp_id INTEGER NOT NULL
+        )
+        """,
+        "INSERT OR IGNORE INTO sync_control (id, capture, temp_id) VALUES (1, 1, 0)",
+    ]
+    capture = "(SELECT capture FROM sync_control WHERE id = 1) = 1"
+    for table in REPLICA_TABLES:
+        statements += [
+            # 本地新记录改用负数临时 id（递减分配、不重复使用），避免与云端分配的 id 冲突，推送后替换为云端 id
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_outbox_{table}_insert
+            AFTER INSERT ON {table}
+            WHEN {capture}
+            BEGIN
+                UPDATE sync_control SET temp_id = temp_id - 1 WHERE id = 1 AND NEW.id > 0;
+                UPDATE {table} SET id = (SELECT temp_id FROM sync_control WHERE id = 1) WHERE id = NEW.id AND NEW.id > 0;
+                INSERT INTO sync_outbox (table_name, row_id, op)
+                VALUES ('{table}', CASE WHEN NEW.id > 0 THEN (SELECT temp_id FROM sync_control WHERE id = 1)
+                                        ELSE NEW.id END, 'insert');
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_outbox_{table}_update
+            AFTER UPDATE ON {table}
+            WHEN {capture} AND NEW.id = OLD.id
+            BEGIN
+                INSERT INTO sync_outbox (table_name, row_id, op) VALUES ('{table}', NEW.id, 'update');
+            END
+            """,
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_outbox_{table}_delete
+            AFTER DELETE ON {table}
+            WHEN {capture}
+            BEGIN
+                INSERT INTO sync_outbox (table_name, row_id, op) VALUES ('{table}', OLD.id, 'delete');
+            END
+            """,
+        ]
+    return statements
+
+def _add_sync_keys(conn):
+    """为本地副本的 SYNC_KEY_TABLES 添加幂等键列（可重复执行）；普通的 DatabaseManager 数据库不含该列"""
+    for table in SYNC_KEY_TABLES:
+        if SYNC_KEY not in [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {SYNC_KEY} TEXT")
+        conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_{SYNC_KEY} ON {table}({SYNC_KEY})")
+
+def _sqlite_values(df: pd.DataFrame) -> List[tuple]:
+    return list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+
+class PushError(Exception):
+    """推送失败：transient 为 True 时（网络错误、5xx、429）保留待推送状态稍后重试，否则记为冲突"""
+
+    def __init__(self, message: str, transient: bool):
+        super().__init__(message)
+        self.transient = transient
+
+class HybridDatabaseManager:
+    """本地副本 + 写入队列
+
+    - 读取和写入都由本地副本（DatabaseManager）完成，方法与 DatabaseManager 相同，未列出的属性直接转发
+    - 本地写入由触发器记录到 sync_outbox（与数据在同一事务中提交，进程退出后不会丢失）；本地新记录
+      使用负数临时 id，推送成功后替换为云端分配的 id，并同步更新子表外键
+    - 后台线程每 push_interval 秒（本地写入后立即）把待推送的变更按表分批推送：同一记录的多次修改只推送
+      最新状态；新记录按唯一约束（NATURAL_KEYS，其余表为 SYNC_KEY）合并到云端已有记录，重试推送是幂等的，
+      修改按 id 合并（后写入的生效），
+      云端已删除的记录不再写回；一批被拒绝时逐条重试，仍被拒绝的记为冲突（conflicts() 查看），
+      网络错误时保留在队列中稍后重试
+    - 每 pull_interval 秒按 id / created_at 水位线拉取云端的新记录，每 reconcile_interval 秒全量对账
+      一次，同步其他客户端的修改和删除；有待推送变更的记录以本地为准
+    - 拉取或替换临时 id 后调用 subscribe 注册的回调（参数为变化的表），可用于让上层缓存失效
+    - 首次启动（本地副本从未全量对账）时由后台线程先完整拉取一次，构造时不等待网络；完成前
+      sync_status()['online'] 为 None
+
+    db_path 应为专用的副本文件：全量对账会删除本地有、云端没有且没有待推送变更的记录。
+    """
+
+    def __init__(self, remote: SupabaseManager, db_path: str = "fund_management_replica.db",
+                 push_interval: float = 2.0, pull_interval: float = 30.0, reconcile_interval: Optional[float] = 600.0,
+                 batch_size: int = 500, watermark_lag: float = 30.0, start: bool = True):
+        self.remote = remote
+        self.local = DatabaseManager(db_path)
+        self.push_interval = push_interval
+        self.pull_interval = pull_interval
+        self.reconcile_interval = reconcile_interval
+        self.batch_size = batch_size
+        self.watermark_lag = watermark_lag
+
+        with self.local.pool.transaction() as conn:
+            for statement in _replica_schema():
+                conn.execute(statement)
+            _add_sync_keys(conn)
+        self._columns = {table: self._table_columns(table) for table in REPLICA_TABLES}
+
+        self._sync_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._listeners = []
+        self._thread = None
+        self.online = None
+        self.last_error = None
+        # 云端缺少 SYNC_KEY 列时的提示（见 _has_sync_key）
+        self.schema_error = None
+        self._sync_key_tables = set()
+        self.last_push = None
+        self.last_pull = None
+
+        if start:
+            self.start()
+
+    def __getattr__(self, name):
+        attr = getattr(self.local, name)
+        if not callable(attr) or (name not in WRITE_TABLES and name != 'bulk_upsert'):
+            return attr
+
+        def writer(*args, **kwargs):
+            try:
+                result = attr(*args, **kwargs)
+            finally:
+                self._wake.set()
+            return bool(result) if name in SINGLE_ROW_WRITERS else result
+
+        writer.__name__ = name
+        writer.__doc__ = attr.__doc__
+        return writer
+
+    def _table_columns(self, table: str) -> List[str]:
+        with self.local.pool.connection() as conn:
+            return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+    # 后台同步
+    def start(self):
+        """启动后台同步线程"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="hybrid-sync", daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """停止后台线程（未推送的变更保留在 outbox 中，下次启动时继续推送）并关闭连接"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        self.local.close()
+        self.remote.close()
+
+    def subscribe(self, callback: Callable):
+        """注册数据变化回调，参数为变化的表名元组"""
+        self._listeners.append(callback)
+
+    def _notify(self, tables):
+        if not tables:
+            return
+        tables = tuple(sorted(set(tables)))
+        if self.local.nav_panel is not None and {'nav_records', 'strategies'} & set(tables):
+            self.local.nav_panel.load(self.local._nav_panel_records())
+        for callback in self._listeners:
+            callback(tables)
+
+    def _run(self):
+        # 首次启动时先完整拉取一次，失败时（离线）照常使用本地已有的数据，下一轮重试
+        full = self._state('strategies')['reconciled_at'] is None
+        while not self._stop.is_set():
+            if self.sync(full=full):
+                full = False
+            self._wake.wait(self.push_interval)
+            self._wake.clear()
+
+    def sync(self, full: bool = False) -> bool:
+        """推送 outbox 后拉取云端数据（到期或 full=True 时全量对账），返回是否成功"""
+        with self._sync_lock:
+            try:
+                self.push()
+                now = time.time()
+                if full or self.last_pull is None or now - self.last_pull >= self.pull_interval:
+                    reconcile = full or self.reconcile_interval is not None and any(
+                        self._state(table)['reconciled_at'] is None
+                        or now - self._state(table)['reconciled_at'] >= self.reconcile_interval
+                        for table in REPLICA_TABLES
+                    )
+                    self.pull(full=reconcile)
+                    self.last_pull = now
+                self.online = True
+                self.last_error = None
+                return True
+            except (requests.exceptions.RequestException, PushError) as e:
+                self.online = False
+                self.last_error = str(e)
+                return False
+
+    def sync_status(self) -> Dict[str, Any]:
+        """同步状态：pending（待推送记录数）, conflicts, online, last_push, last_pull, last_error, schema_error"""
+        counts = self.local.execute_query(
+            "SELECT status, COUNT(DISTINCT table_name || ':' || row_id) AS n FROM sync_outbox GROUP BY status")
+        counts = dict(zip(counts['status'], counts['n']))
+        return {
+            'pending': int(counts.get('pending', 0)),
+            'conflicts': int(counts.get('conflict', 0)),
+            'online': self.online,
+            'last_push': self.last_push,
+            'last_pull': self.last_pull,
+            'last_error': self.last_error,
+            'schema_error': self.schema_error
+        }
+
+    def conflicts(self) -> pd.DataFrame:
+        """被云端拒绝的变更（下次全量对账时本地记录恢复为云端的状态）"""
+        return self.local.execute_query(
+            "SELECT seq, table_name, row_id, op, error, created_at FROM sync_outbox WHERE status = 'conflict' ORDER BY seq")
+
+    def clear_conflicts(self) -> int:
+        """删除冲突记录，返回删除条数"""
+        with self.local.pool.transaction() as conn:
+            return conn.execute("DELETE FROM sync_outbox WHERE status = 'conflict'").rowcount
+
+    # 本地副本
+    @contextmanager
+    def _replicating(self):
+        """在一个事务中写入本地副本，写入不记录到 outbox"""
+        with self.local.pool.transaction() as conn:
+            conn.execute("UPDATE sync_control SET capture = 0 WHERE id = 1")
+            yield conn
+            conn.execute("UPDATE sync_control SET capture = 1 WHERE id = 1")
+
+    def _state(self, table: str) -> Dict[str, Any]:
+        with self.local.pool.connection() as conn:
+            row = conn.execute("SELECT max_id, pulled_at, reconciled_at FROM sync_state WHERE table_name = ?",
+                               (table,)).fetchone()
+        if row is None:
+            return {'max_id': None, 'pulled_at': None, 'reconciled_at': None}
+        return {'max_id': row[0], 'pulled_at': pd.Timestamp(row[1]).to_pydatetime() if row[1] else None,
+                'reconciled_at': row[2]}
+
+    def _read_rows(self, conn, table: str, ids) -> Dict[int, Dict]:
+        columns = self._columns[table]
+        rows = {}
+        ids = list(ids)
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            cursor = conn.execute(f"SELECT * FROM {table} WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            for values in cursor:
+                rows[values[0]] = dict(zip(columns, values))
+        return rows
+
+    # 推送
+    def push(self) -> Dict[str, int]:
+        """把 outbox 中待推送的变更分批写入 Supabase，返回 {'pushed': 记录数, 'conflicts': 记录数}
+
+        网络错误或云端暂时不可用时抛出 PushError / requests 异常，未推送的变更保留在 outbox 中。
+        云端表缺少 SYNC_KEY 列时该表的新增和修改暂不推送（保留在 outbox 中），原因记在 schema_error，
+        其他表照常推送。
+        """
+        with self.local.pool.connection() as conn:
+            entries = conn.execute(
+                "SELECT seq, table_name, row_id FROM sync_outbox WHERE status = 'pending' ORDER BY seq").fetchall()
+        if not entries:
+            self.schema_error = None
+            return {'pushed': 0, 'conflicts': 0}
+
+        # 同一记录的多次变更合并，按首次变更的顺序推送（父记录先于引用它的子记录）
+        changes = {}
+        for seq, table, row_id in entries:
+            changes.setdefault((table, row_id), []).append(seq)
+
+        with self.local.pool.connection() as conn:
+            existing = {table: set(self._read_rows(conn, table, [row_id for t, row_id in changes if t == table]))
+                        for table in {table for table, _ in changes}}
+
+        # 连续的同表同类变更组成一批
+        batches = []
+        for (table, row_id), seqs in changes.items():
+            if row_id in existing[table]:
+                kind = 'insert' if row_id < 0 else 'update'
+            else:
+                kind = 'drop' if row_id < 0 else 'delete'
+            if batches and batches[-1][0] == (table, kind) and len(batches[-1][1]) < self.batch_size:
+                batches[-1][1].append((row_id, seqs))
+            else:
+                batches.append(((table, kind), [(row_id, seqs)]))
+
+        result = {'pushed': 0, 'conflicts': 0}
+        changed = set()
+        blocked = set()
+        try:
+            for (table, kind), items in batches:
+                if kind in ('insert', 'update') and table in SYNC_KEY_TABLES and not self._has_sync_key(table):
+                    blocked.add(table)
+                    continue
+                pushed, conflicts = self._push_batch(table, kind, items)
+                result['pushed'] += pushed
+                result['conflicts'] += conflicts
+                if kind == 'insert' and pushed:
+                    changed.update([table] + [child for child, keys in FOREIGN_KEYS.items() if table in keys.values()])
+        finally:
+            self.last_push = time.time()
+            self._notify(changed)
+        self.schema_error = (f"云数据库的 {', '.join(sorted(blocked))} 表缺少 {SYNC_KEY} 列，这些表的本地修改暂不推送；"
+                             f"请在 Supabase 的 SQL Editor 中运行 supabase_sync_keys.sql" if blocked else None)
+        return result
+
+    def _has_sync_key(self, table: str) -> bool:
+        """云端表是否已有 SYNC_KEY 列（supabase_sync_keys.sql 添加）；确认存在后不再检查"""
+        if table not in self._sync_key_tables:
+            try:
+                self._send("GET", table, params={"select": SYNC_KEY, "limit": 0})
+            except PushError as e:
+                # 42703：列不存在
+                if e.transient or '42703' not in str(e):
+                    raise
+                return False
+            self._sync_key_tables.add(table)
+        return True
+
+    def _send(self, method: str, table: str, data=None, params=None, prefer: Optional[str] = None):
+        """发送请求，返回解析后的 JSON；被拒绝时抛出 PushError"""
+        headers = {"Prefer": prefer} if prefer else None
+        response = self.remote._send(method, table, data, params, headers)
+        if response.status_code >= 500 or response.status_code == 429:
+            raise PushError(f"{table} {response.status_code} - {response.text}", transient=True)
+        if response.status_code >= 300:
+            raise PushError(f"{response.status_code} - {response.text}", transient=False)
+        return _json_loads(response.content) if response.content else None
+
+    def _done(self, seqs):
+        with self.local.pool.transaction() as conn:
+            conn.executemany("DELETE FROM sync_outbox WHERE seq = ?", [(seq,) for seq in seqs])
+
+    def _conflict(self, seqs, error: str):
+        with self.local.pool.transaction() as conn:
+            conn.executemany("UPDATE sync_outbox SET status = 'conflict', error = ? WHERE seq = ?",
+                             [(error, seq) for seq in seqs])
+
+    def _push_batch(self, table: str, kind: str, items) -> tuple:
+        """推送一批变更，返回 (成功记录数, 冲突记录数)"""
+        seqs = [seq for _, row_seqs in items for seq in row_seqs]
+        ids = [row_id for row_id, _ in items]
+
+        if kind == 'drop':
+            # 本地新建后又删除的记录，无需推送
+            self._done(seqs)
+            return len(items), 0
+        if kind == 'delete':
+            self._send("DELETE", table, params={"id": f"in.({','.join(map(str, ids))})"}, prefer="return=minimal")
+            self._done(seqs)
+            return len(items), 0
+
+        with self.local.pool.connection() as conn:
+            rows = self._read_rows(conn, table, ids)
+        items = [(row_id, row_seqs) for row_id, row_seqs in items if row_id in rows]
+        items = self._resolvable(table, rows, items)
+        if not items:
+            return 0, 0
+
+        try:
+            self._push_rows(table, kind, rows, items)
+            return len(items), 0
+        except PushError as e:
+            if e.transient or len(items) == 1:
+                if e.transient:
+                    raise
+                self._conflict(items[0][1], str(e))
+                return 0, 1
+
+        # 整批被拒绝时逐条推送，找出被拒绝的记录
+        pushed = conflicts = 0
+        for item in items:
+            try:
+                self._push_rows(table, kind, rows, [item])
+                pushed += 1
+            except PushError as e:
+                if e.transient:
+                    raise
+                self._conflict(item[1], str(e))
+                conflicts += 1
+        return pushed, conflicts
+
+    def _resolvable(self, table: str, rows: Dict[int, Dict], items):
+        """处理引用本地临时 id 的记录
+
+        临时 id 已替换为云端 id（页面持有旧 id 时写入）的改为云端 id；父记录还在等待推送的暂不推送；
+        父记录已无法推送（冲突或已删除）的记为冲突。
+        """
+        parents = FOREIGN_KEYS.get(table, {})
+        ready, orphans = [], []
+        with self._replicating() as conn:
+            for row_id, seqs in items:
+                row = rows[row_id]
+                status = 'ready'
+                for column, parent in parents.items():
+                    if row[column] is None or row[column] >= 0:
+                        continue
+                    mapped = conn.execute("SELECT real_id FROM sync_id_map WHERE table_name = ? AND temp_id = ?",
+                                          (parent, row[column])).fetchone()
+                    if mapped:
+                        conn.execute(f"UPDATE {table} SET {column} = ? WHERE id = ?", (mapped[0], row_id))
+                        row[column] = mapped[0]
+                    elif conn.execute("SELECT 1 FROM sync_outbox WHERE status = 'pending' AND table_name = ? "
+                                      "AND row_id = ? LIMIT 1", (parent, row[column])).fetchone():
+                        status = 'waiting'
+                    else:
+                        status = 'orphan'
+                        break
+                if status == 'ready':
+                    ready.append((row_id, seqs))
+                elif status == 'orphan':
+                    orphans += seqs
+        if orphans:
+            self._conflict(orphans, "引用的记录未能同步到云端")
+        return ready
+
+    def _push_rows(self, table: str, kind: str, rows: Dict[int, Dict], items):
+        columns = [column for column in self._columns[table] if column not in LOCAL_ONLY_COLUMNS]
+        ids = [row_id for row_id, _ in items]
+        seqs = [seq for _, row_seqs in items for seq in row_seqs]
+
+        if kind == 'update':
+            # 云端已删除的记录不再写回，记为冲突，对账时本地记录随之删除
+            remote_ids = self._send("GET", table, params={"select": "id", "id": f"in.({','.join(map(str, ids))})"})
+            remote_ids = {row['id'] for row in remote_ids or []}
+            missing = [(row_id, row_seqs) for row_id, row_seqs in items if row_id not in remote_ids]
+            for _, row_seqs in missing:
+                self._conflict(row_seqs, "云端记录已被删除")
+            items = [(row_id, row_seqs) for row_id, row_seqs in items if row_id in remote_ids]
+            if items:
+                payload = [{'id': row_id, **{column: rows[row_id][column] for column in columns}}
+                           for row_id, _ in items]
+                self._send("POST", table, payload, params={"on_conflict": "id"},
+                           prefer="resolution=merge-duplicates,return=minimal")
+                self._done([seq for _, row_seqs in items for seq in row_seqs])
+            return
+
+        keys = NATURAL_KEYS.get(table, (SYNC_KEY,))
+        if keys == (SYNC_KEY,):
+            self._assign_sync_keys(table, rows, ids)
+        payload = [{column: rows[row_id][column] for column in columns} for row_id in ids]
+        created = self._send("POST", table, payload, params={"on_conflict": ",".join(keys)},
+                             prefer="resolution=merge-duplicates,return=representation")
+        by_key = {tuple(str(row[key]) for key in keys): row['id'] for row in created}
+        mapping = {row_id: by_key[tuple(str(rows[row_id][key]) for key in keys)] for row_id in ids}
+        self._remap(table, mapping, seqs)
+
+    def _assign_sync_keys(self, table: str, rows: Dict[int, Dict], ids):
+        """为还没有 SYNC_KEY 的记录生成 UUID，先提交到本地副本再推送，重试时沿用同一个值"""
+        keys = {row_id: str(uuid.uuid4()) for row_id in ids if not rows[row_id][SYNC_KEY]}
+        if not keys:
+            return
+        with self._replicating() as conn:
+            conn.executemany(f"UPDATE {table} SET {SYNC_KEY} = ? WHERE id = ?",
+                             [(key, row_id) for row_id, key in keys.items()])
+        for row_id, key in keys.items():
+            rows[row_id][SYNC_KEY] = key
+
+    def _remap(self, table: str, mapping: Dict[int, int], seqs):
+        """把本地临时 id 替换为云端 id，同步更新子表外键和 outbox 中之后的变更，并删除已推送的变更"""
+        with self._replicating() as conn:
+            for temp_id, real_id in mapping.items():
+                conn.execute(f"DELETE FROM {table} WHERE id = ?", (real_id,))
+                conn.execute(f"UPDATE {table} SET id = ? WHERE id = ?", (real_id, temp_id))
+                for child, keys in FOREIGN_KEYS.items():
+                    for column, parent in keys.items():
+                        if parent == table:
+                            # 子表中与云端已有记录唯一约束冲突的以本地（待推送）为准
+                            conn.execute(f"UPDATE OR REPLACE {child} SET {column} = ? WHERE {column} = ?",
+                                         (real_id, temp_id))
+                conn.execute("UPDATE sync_outbox SET row_id = ? WHERE table_name = ? AND row_id = ?",
+                             (real_id, table, temp_id))
+                conn.execute("INSERT OR REPLACE INTO sync_id_map (table_name, temp_id, real_id) VALUES (?, ?, ?)",
+                             (table, temp_id, real_id))
+            conn.executemany("DELETE FROM sync_outbox WHERE seq = ?", [(seq,) for seq in seqs])
+
+    # 拉取
+    def pull(self, full: bool = False) -> int:
+        """从 Supabase 拉取新记录（full=True 时全量对账），返回写入本地的记录数
+
+        有待推送变更的记录保持本地版本；全量对账时删除本地有、云端没有且没有待推送变更的记录。
+        """
+        written = 0
+        changed = []
+        for table in REPLICA_TABLES:
+            state = self._state(table)
+            started = utc_now()
+            # 本地表没有 created_at 列（product_strategy_weights）时只按 id 水位线增量读取
+            pulled_at = state['pulled_at'] if 'created_at' in self._columns[table] else None
+            params = {"select": "*"} if full else delta_params(state['max_id'], pulled_at, self.watermark_lag)
+            rows = self.remote._fetch_rows(table, params)
+            count = self._apply(table, rows, full, started, state['max_id'])
+            if count:
+                written += count
+                changed.append(table)
+        self._notify(changed)
+        return written
+
+    def _apply(self, table: str, rows: pd.DataFrame, full: bool, started, max_id: Optional[int]) -> int:
+        columns = [column for column in self._columns[table] if column in rows.columns]
+        with self._replicating() as conn:
+            pending = {row[0] for row in conn.execute(
+                "SELECT row_id FROM sync_outbox WHERE status = 'pending' AND table_name = ?", (table,))}
+            count = 0
+            if not rows.empty:
+                rows = rows[~rows['id'].isin(pending)][columns].copy()
+                keys = NATURAL_KEYS.get(table, (SYNC_KEY,))
+                if pending and all(key in columns for key in keys):
+                    # 唯一约束与待推送的本地记录相同的云端记录（如推送成功但响应丢失），等本地记录推送合并后再同步
+                    local = self._read_rows(conn, table, pending)
+                    taken = {tuple(str(row[key]) for key in keys) for row in local.values()
+                             if all(row[key] is not None for key in keys)}
+                    rows = rows[[tuple(map(str, key)) not in taken
+                                 for key in rows[list(keys)].itertuples(index=False, name=None)]]
+                if 'created_at' in rows.columns:
+                    rows['created_at'] = rows['created_at'].astype(str).str.replace('T', ' ').str.slice(0, 19)
+                # 与本地记录的唯一约束冲突时以云端为准
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                    _sqlite_values(rows)
+                )
+                count = len(rows)
+                max_id = max(max_id or 0, int(rows['id'].max())) if count else max_id
+
+            if full:
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS remote_ids (id INTEGER PRIMARY KEY)")
+                conn.execute("DELETE FROM remote_ids")
+                if len(rows):
+                    conn.executemany("INSERT OR IGNORE INTO remote_ids (id) VALUES (?)",
+                                     [(int(row_id),) for row_id in rows['id']])
+                conn.executemany("INSERT OR IGNORE INTO remote_ids (id) VALUES (?)", [(row_id,) for row_id in pending])
+                count += conn.execute(
+                    f"DELETE FROM {table} WHERE id NOT IN (SELECT id FROM remote_ids)").rowcount
+
+            conn.execute(
+                """
+                INSERT INTO sync_state (table_name, max_id, pulled_at, reconciled_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (table_name) DO UPDATE SET
+                    max_id = excluded.max_id, pulled_at = excluded.pulled_at,
+                    reconciled_at = COALESCE(excluded.reconciled_at, sync_state.reconciled_at)
+                """,
+                (table, max_id, started.strftime('%Y-%m-%d %H:%M:%S'), time.time() if full else None)
+            )
+        return count
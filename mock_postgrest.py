@@ -0,0 +1,582 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+本地 PostgREST 兼容模拟服务
+以 SQLite 数据库（表结构与 DatabaseManager 相同）为后端，实现 SupabaseManager 用到的 PostgREST 子集，
+用于离线测试和性能对比，无需连接云端项目：
+
+- GET / HEAD /rest/v1/<表>：列过滤（eq, neq, gt, gte, lt, lte, like, ilike, in, is, not.），
+  and=(...) / or=(...)，order，limit / offset，Range 请求头与 Prefer: count=exact，
+  select 中的列别名（别名:列）、联表（表(列)）和展开联表（...表(别名:列)）
+- POST /rest/v1/<表>：单条或批量插入，on_conflict + Prefer: resolution=merge-duplicates / ignore-duplicates，
+  Prefer: return=representation / minimal
+- PATCH / DELETE /rest/v1/<表>：按过滤条件更新或删除
+- POST /rest/v1/rpc/<函数>：内置 supabase_product_nav.sql、supabase_nav_neighbors.sql 中的函数，也可以注册自定义函数
+
+每个请求可附加固定延迟和随机抖动，模拟网络往返。
+
+用法: python mock_postgrest.py [数据库文件] [端口] [延迟ms] [抖动ms]
+"""
+
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, List, Callable
+from urllib.parse import parse_qsl, unquote, urlparse
+
+import pandas as pd
+
+from database import DatabaseManager
+from hybrid_database import SYNC_KEY_TABLES
+from nav_engine import compute_product_nav_series, compute_product_navs_at, value_portfolios
+
+REST_PREFIX = "/rest/v1"
+RESERVED_PARAMS = ("select", "order", "limit", "offset", "on_conflict", "columns", "and", "or")
+SQL_OPERATORS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=", "like": "LIKE", "ilike": "LIKE"}
+
+class PostgRESTError(Exception):
+    """按 PostgREST 的错误格式返回给客户端"""
+
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+def _split_top(text: str) -> List[str]:
+    """按顶层逗号拆分（括号内的逗号不拆分）"""
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current).strip())
+    return [part for part in parts if part]
+
+def parse_select(text: Optional[str]) -> List[tuple]:
+    """解析 select 参数
+
+    返回 ('*',)、('column', 输出名, 列名) 或 ('embed', 输出名, 关联表, 是否展开, 子字段列表) 组成的列表。
+    """
+    items = []
+    for part in _split_top(text or "*"):
+        spread = part.startswith("...")
+        if spread:
+            part = part[3:]
+        if "(" in part:
+            head, _, rest = part.partition("(")
+            alias, _, relation = head.rpartition(":")
+            relation = relation.split("!")[0].strip()
+            items.append(("embed", alias.strip() or relation, relation, spread, parse_select(rest[:-1])))
+        elif part == "*":
+            items.append(("*",))
+        else:
+            alias, _, name = part.rpartition(":")
+            name = name.split("::")[0].strip()
+            items.append(("column", alias.strip() or name, name))
+    return items
+
+def _parse_prefer(header: Optional[str]) -> Dict[str, str]:
+    prefer = {}
+    for token in (header or "").split(","):
+        key, _, value = token.strip().partition("=")
+        if key:
+            prefer[key] = value
+    return prefer
+
+def _today() -> str:
+    return datetime.now().date().isoformat()
+
+# 内置 RPC 函数，计算规则与 supabase_product_nav.sql 相同
+def rpc_product_navs_at(conn, p_product_ids, p_date=None):
+    date = p_date or _today()
+    product_ids = [int(pid) for pid in p_product_ids]
+    if not product_ids:
+        return []
+    placeholders = ",".join("?" * len(product_ids))
+    weights = pd.read_sql_query(
+        f"SELECT id, product_id, strategy_id, weight, effective_date FROM product_strategy_weights "
+        f"WHERE product_id IN ({placeholders}) AND effective_date <= ?",
+        conn, params=product_ids + [date]
+    )
+    navs = pd.read_sql_query(
+        f"""
+        SELECT nr.strategy_id, nr.date, nr.nav_value FROM nav_records nr
+        WHERE nr.strategy_id IN (SELECT strategy_id FROM product_strategy_weights WHERE product_id IN ({placeholders}))
+          AND nr.date = (SELECT MAX(p.date) FROM nav_records p WHERE p.strategy_id = nr.strategy_id AND p.date <= ?)
+        """,
+        conn, params=product_ids + [date]
+    )
+    product_navs = compute_product_navs_at(weights, navs, date) if not weights.empty else {}
+    return [{"product_id": pid, "nav_value": product_navs.get(pid, 1.0)} for pid in product_ids]
+
+def rpc_product_nav_at(conn, p_product_id, p_date=None):
+    return rpc_product_navs_at(conn, [p_product_id], p_date)[0]["nav_value"]
+
+def rpc_product_nav_series(conn, p_product_id, p_start_date=None, p_end_date=None):
+    end_date = p_end_date or _today()
+    weights = pd.read_sql_query(
+        "SELECT id, strategy_id, weight, effective_date FROM product_strategy_weights "
+        "WHERE product_id = ? AND effective_date <= ?",
+        conn, params=[int(p_product_id), end_date]
+    )
+    if weights.empty:
+        return []
+    strategy_ids = [int(sid) for sid in weights["strategy_id"].unique()]
+    navs = pd.read_sql_query(
+        f"SELECT strategy_id, date, nav_value FROM nav_records "
+        f"WHERE strategy_id IN ({','.join('?' * len(strategy_ids))}) AND date <= ?",
+        conn, params=strategy_ids + [end_date]
+    )
+    dates = navs["date"].drop_duplicates()
+    if p_start_date:
+        dates = dates[dates >= p_start_date]
+    series = compute_product_nav_series(weights, navs, dates)
+    return series.to_dict("records")
+
+def rpc_investor_portfolios(conn, p_investor_id=None, p_as_of=None):
+    holdings = pd.read_sql_query(
+        """
+        SELECT i.investor_id, i.product_id,
+               COALESCE(SUM(CASE WHEN i.type = 'investment' THEN i.amount END), 0)
+                   - ABS(COALESCE(SUM(CASE WHEN i.type = 'redemption' THEN i.amount END), 0)) AS total_investment,
+               COALESCE(SUM(CASE WHEN i.type = 'investment' THEN i.shares END), 0)
+                   - ABS(COALESCE(SUM(CASE WHEN i.type = 'redemption' THEN i.shares END), 0)) AS total_shares,
+               COUNT(*) AS transaction_count,
+               inv.name AS investor_name, p.name AS product_name
+        FROM investments i
+        LEFT JOIN investors inv ON inv.id = i.investor_id
+        LEFT JOIN products p ON p.id = i.product_id
+        WHERE (? IS NULL OR i.investor_id = ?) AND (? IS NULL OR i.investment_date <= ?)
+        GROUP BY i.investor_id, i.product_id
+        HAVING total_shares > 0
+        ORDER BY inv.name, i.investor_id, p.name
+        """,
+        conn, params=[p_investor_id, p_investor_id, p_as_of, p_as_of]
+    )
+    if holdings.empty:
+        return []
+    navs = rpc_product_navs_at(conn, holdings["product_id"].unique().tolist(), p_as_of)
+    portfolio = value_portfolios(holdings, {row["product_id"]: row["nav_value"] for row in navs})
+    columns = ["investor_id", "investor_name", "product_id", "product_name", "total_investment", "total_shares",
+               "transaction_count", "current_nav", "current_value", "profit_loss", "profit_rate"]
+    return json.loads(portfolio[columns].to_json(orient="records"))
+
+def rpc_nav_record_neighbors(conn, p_strategy_ids, p_before, p_after=None):
+    """与 supabase_nav_neighbors.sql 相同：各策略在 p_before 之前的最后一条和 p_after 之后的第一条净值"""
+    rows = []
+    for strategy_id in sorted(int(sid) for sid in p_strategy_ids):
+        queries = [("date < ? ORDER BY date DESC", p_before)]
+        if p_after is not None:
+            queries.append(("date > ? ORDER BY date", p_after))
+        for condition, value in queries:
+            row = conn.execute(
+                f"SELECT strategy_id, date, nav_value, return_rate FROM nav_records "
+                f"WHERE strategy_id = ? AND {condition} LIMIT 1", (strategy_id, value)
+            ).fetchone()
+            if row is not None:
+                rows.append(dict(row))
+    return sorted(rows, key=lambda row: (row["strategy_id"], row["date"]))
+
+DEFAULT_RPC = {
+    "product_navs_at": rpc_product_navs_at,
+    "product_nav_at": rpc_product_nav_at,
+    "product_nav_series": rpc_product_nav_series,
+    "investor_portfolios": rpc_investor_portfolios,
+    "nav_record_neighbors": rpc_nav_record_neighbors,
+}
+
+class MockPostgREST:
+    """以 SQLite 为后端的 PostgREST 模拟服务
+
+    - db_path 为 None 时在临时目录中新建数据库；表结构由 DatabaseManager 创建，可以先用 DatabaseManager
+      写入测试数据再启动服务
+    - latency / jitter 为每个请求附加的固定延迟和 0~jitter 的随机延迟（秒），延迟期间不占用数据库
+    - max_rows 为单次响应的最大行数（对应 PostgREST 的 db-max-rows）
+    - rpc 为 {函数名: 函数(conn, **参数)}，默认为 DEFAULT_RPC；传入 {} 模拟数据库中没有这些函数
+    - sync_keys 为 True 时与 supabase_sync_keys.sql 相同，为 SYNC_KEY_TABLES 添加唯一的 sync_key 列；
+      传入 False 模拟云数据库还没有执行该文件
+    - stats 记录请求数、各方法请求数、返回的行数和字节数
+    """
+
+    def __init__(self, db_path: Optional[str] = None, latency: float = 0.0, jitter: float = 0.0,
+                 max_rows: int = 1000, rpc: Optional[Dict[str, Callable]] = None, sync_keys: bool = True,
+                 host: str = "127.0.0.1", port: int = 0):
+        if db_path is None:
+            db_path = os.path.join(tempfile.mkdtemp(prefix="mock_postgrest_"), "mock.db")
+        DatabaseManager(db_path).close()
+        self.db_path = db_path
+        self.latency = latency
+        self.jitter = jitter
+        self.max_rows = max_rows
+        self.rpc = DEFAULT_RPC if rpc is None else rpc
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        if sync_keys:
+            for table in SYNC_KEY_TABLES:
+                if "sync_key" not in [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN sync_key TEXT")
+                self.conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_sync_key ON {table}(sync_key)")
+        self._lock = threading.Lock()
+        self._columns = {}
+        self.stats = Counter()
+
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockPostgREST":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-postgrest", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.conn.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = Counter()
+
+    # 表结构
+    def _table_columns(self, table: str) -> List[str]:
+        if table not in self._columns:
+            columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+            if not columns:
+                raise PostgRESTError(404, "PGRST205", f"Could not find the table 'public.{table}' in the schema cache")
+            self._columns[table] = columns
+        return self._columns[table]
+
+    def _column(self, table: str, column: str) -> str:
+        if column not in self._table_columns(table):
+            raise PostgRESTError(400, "42703", f"column {table}.{column} does not exist")
+        return f'"{column}"'
+
+    def _relation(self, table: str, relation: str):
+        """返回 (关联表, 本表列, 关联表列, 是否一对多)"""
+        self._table_columns(relation)
+        for row in self.conn.execute(f"PRAGMA foreign_key_list({table})"):
+            if row[2] == relation:
+                return relation, row[3], row[4] or "id", False
+        for row in self.conn.execute(f"PRAGMA foreign_key_list({relation})"):
+            if row[2] == table:
+                return relation, row[4] or "id", row[3], True
+        raise PostgRESTError(400, "PGRST200", f"Could not find a relationship between '{table}' and '{relation}'")
+
+    # 过滤条件
+    def _condition(self, table: str, column: str, expression: str, params: list) -> str:
+        negate = expression.startswith("not.")
+        if negate:
+            expression = expression[4:]
+        op, _, value = expression.partition(".")
+        sql_column = self._column(table, column)
+
+        if op == "in":
+            values = [item.strip('"') for item in _split_top(value.strip()[1:-1])]
+            params.extend(values)
+            sql = f"{sql_column} IN ({','.join('?' * len(values))})"
+        elif op == "is":
+            keyword = {"null": "NULL", "true": "1", "false": "0"}.get(value.lower())
+            if keyword is None:
+                raise PostgRESTError(400, "PGRST100", f"unknown is. value: {value}")
+            sql = f"{sql_column} IS {keyword}"
+        elif op in SQL_OPERATORS:
+            if op in ("like", "ilike"):
+                value = value.replace("*", "%")
+            params.append(value)
+            sql = f"{sql_column} {SQL_OPERATORS[op]} ?"
+        else:
+            raise PostgRESTError(400, "PGRST100", f"unknown operator: {op}")
+        return f"NOT ({sql})" if negate else sql
+
+    def _logic(self, table: str, operator: str, text: str, params: list) -> str:
+        """and=(...) / or=(...) 中的条件，支持嵌套 and(...) / or(...)"""
+        conditions = []
+        for part in _split_top(text.strip()[1:-1]):
+            negate = part.startswith("not.")
+            inner = part[4:] if negate else part
+            if inner.startswith(("and(", "or(")):
+                nested_op, _, rest = inner.partition("(")
+                sql = self._logic(table, nested_op, "(" + rest, params)
+                conditions.append(f"NOT {sql}" if negate else sql)
+            else:
+                column, _, expression = part.partition(".")
+                conditions.append(self._condition(table, column, expression, params))
+        return "(" + f" {operator.upper()} ".join(conditions) + ")"
+
+    def _where(self, table: str, query: List[tuple], params: list) -> str:
+        conditions = []
+        for key, value in query:
+            if key in ("and", "or"):
+                conditions.append(self._logic(table, key, value, params))
+            elif key not in RESERVED_PARAMS:
+                conditions.append(self._condition(table, key, value, params))
+        return " WHERE " + " AND ".join(conditions) if conditions else ""
+
+    def _order(self, table: str, order: Optional[str]) -> str:
+        if not order:
+            return ""
+        terms = []
+        for item in order.split(","):
+            parts = item.strip().split(".")
+            descending = "desc" in parts[1:]
+            nulls = "NULLS LAST" if "nullslast" in parts[1:] else "NULLS FIRST" if "nullsfirst" in parts[1:] \
+                else "NULLS FIRST" if descending else "NULLS LAST"
+            terms.append(f"{self._column(table, parts[0])} {'DESC' if descending else 'ASC'} {nulls}")
+        return " ORDER BY " + ", ".join(terms)
+
+    # select 投影
+    def _output_keys(self, table: str, items: List[tuple]) -> List[str]:
+        keys = []
+        for item in items:
+            if item[0] == "*":
+                keys.extend(self._table_columns(table))
+            elif item[0] == "column":
+                keys.append(item[1])
+            elif item[3]:
+                keys.extend(self._output_keys(item[2], item[4]))
+            else:
+                keys.append(item[1])
+        return keys
+
+    def _project(self, table: str, rows: List[Dict], items: List[tuple]) -> List[Dict]:
+        result = [{} for _ in rows]
+        for item in items:
+            if item[0] == "*":
+                for out, row in zip(result, rows):
+                    out.update(row)
+            elif item[0] == "column":
+                self._column(table, item[2])
+                for out, row in zip(result, rows):
+                    out[item[1]] = row[item[2]]
+            else:
+                _, alias, relation, spread, children = item
+                target, local_key, target_key, to_many = self._relation(table, relation)
+                keys = sorted({row[local_key] for row in rows if row[local_key] is not None})
+                related = {}
+                if keys:
+                    target_rows = [dict(row) for row in self.conn.execute(
+                        f'SELECT * FROM {target} WHERE "{target_key}" IN ({",".join("?" * len(keys))})', keys)]
+                    for target_row, projected in zip(target_rows, self._project(target, target_rows, children)):
+                        related.setdefault(target_row[target_key], []).append(projected)
+                empty = dict.fromkeys(self._output_keys(target, children))
+                for out, row in zip(result, rows):
+                    matches = related.get(row[local_key], [])
+                    if to_many:
+                        out[alias] = matches
+                    elif spread:
+                        out.update(matches[0] if matches else empty)
+                    else:
+                        out[alias] = matches[0] if matches else None
+        return result
+
+    # 请求处理
+    def _select_rows(self, table: str, query: List[tuple], headers, count: bool):
+        params = dict(query)
+        sql_params = []
+        where = self._where(table, query, sql_params)
+        order = self._order(table, params.get("order"))
+
+        offset = int(params.get("offset", 0))
+        limit = self.max_rows
+        if "limit" in params:
+            limit = min(limit, int(params["limit"]))
+        range_header = headers.get("Range")
+        if range_header:
+            start, _, end = range_header.partition("-")
+            offset += int(start)
+            if end:
+                limit = min(limit, int(end) - int(start) + 1)
+
+        rows = [dict(row) for row in self.conn.execute(
+            f"SELECT * FROM {table}{where}{order} LIMIT ? OFFSET ?", sql_params + [limit, offset])]
+        total = None
+        if count:
+            total = self.conn.execute(f"SELECT COUNT(*) FROM {table}{where}", sql_params).fetchone()[0]
+        return self._project(table, rows, parse_select(params.get("select"))), offset, total
+
+    def _get(self, table: str, query: List[tuple], headers, head: bool = False):
+        prefer = _parse_prefer(headers.get("Prefer"))
+        rows, offset, total = self._select_rows(table, query, headers, prefer.get("count") == "exact")
+        total_text = "*" if total is None else str(total)
+        content_range = f"{offset}-{offset + len(rows) - 1}/{total_text}" if rows else f"*/{total_text}"
+        status = 206 if total is not None and offset + len(rows) < total else 200
+        return status, (None if head else rows), {"Content-Range": content_range}
+
+    def _write_response(self, table: str, rows: List[Dict], query: List[tuple], prefer: Dict[str, str], status: int):
+        if prefer.get("return") != "representation":
+            return (201 if status == 201 else 204), None, {}
+        return status, self._project(table, rows, parse_select(dict(query).get("select"))), {}
+
+    def _post(self, table: str, query: List[tuple], headers, body):
+        prefer = _parse_prefer(headers.get("Prefer"))
+        rows = body if isinstance(body, list) else [body]
+        if not rows:
+            return self._write_response(table, [], query, prefer, 201)
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        sql_columns = [self._column(table, column) for column in columns]
+
+        command = f"INSERT INTO {table} ({', '.join(sql_columns)}) VALUES ({', '.join('?' * len(columns))})"
+        resolution = prefer.get("resolution")
+        if resolution:
+            on_conflict = dict(query).get("on_conflict", "id")
+            conflict = [self._column(table, column.strip()) for column in on_conflict.split(",")]
+            updates = [col for col, name in zip(sql_columns, columns) if name not in on_conflict.split(",")]
+            if resolution == "merge-duplicates" and updates:
+                action = "DO UPDATE SET " + ", ".join(f"{col} = excluded.{col}" for col in updates)
+            else:
+                action = "DO NOTHING"
+            command += f" ON CONFLICT ({', '.join(conflict)}) {action}"
+        command += " RETURNING *"
+
+        written = []
+        self.conn.execute("BEGIN")
+        try:
+            for row in rows:
+                written.extend(dict(item) for item in self.conn.execute(command, [row.get(col) for col in columns]))
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return self._write_response(table, written, query, prefer, 201)
+
+    def _patch(self, table: str, query: List[tuple], headers, body):
+        prefer = _parse_prefer(headers.get("Prefer"))
+        sql_params = [body[column] for column in body]
+        assignments = ", ".join(f"{self._column(table, column)} = ?" for column in body)
+        where = self._where(table, query, sql_params)
+        rows = [dict(row) for row in self.conn.execute(f"UPDATE {table} SET {assignments}{where} RETURNING *", sql_params)]
+        return self._write_response(table, rows, query, prefer, 200)
+
+    def _delete(self, table: str, query: List[tuple], headers):
+        prefer = _parse_prefer(headers.get("Prefer"))
+        sql_params = []
+        where = self._where(table, query, sql_params)
+        rows = [dict(row) for row in self.conn.execute(f"DELETE FROM {table}{where} RETURNING *", sql_params)]
+        return self._write_response(table, rows, query, prefer, 200)
+
+    def _call_rpc(self, function: str, body):
+        if function not in self.rpc:
+            raise PostgRESTError(404, "PGRST202", f"Could not find the function public.{function} in the schema cache")
+        try:
+            return 200, self.rpc[function](self.conn, **(body or {})), {}
+        except TypeError as e:
+            raise PostgRESTError(400, "PGRST202", str(e))
+
+    def handle(self, method: str, path: str, headers, body: bytes):
+        """处理一个请求，返回 (状态码, JSON 对象或 None, 响应头)"""
+        url = urlparse(path)
+        if not url.path.startswith(REST_PREFIX + "/"):
+            raise PostgRESTError(404, "PGRST125", f"Invalid path: {url.path}")
+        resource = unquote(url.path[len(REST_PREFIX) + 1:])
+        query = parse_qsl(url.query, keep_blank_values=True)
+        payload = json.loads(body) if body else None
+
+        with self._lock:
+            if resource.startswith("rpc/"):
+                return self._call_rpc(resource[4:], payload)
+            self._table_columns(resource)
+            if method in ("GET", "HEAD"):
+                return self._get(resource, query, headers, head=method == "HEAD")
+            if method == "POST":
+                return self._post(resource, query, headers, payload)
+            if method == "PATCH":
+                return self._patch(resource, query, headers, payload or {})
+            if method == "DELETE":
+                return self._delete(resource, query, headers)
+        raise PostgRESTError(405, "PGRST117", f"Unsupported HTTP method: {method}")
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _serve(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                delay = mock.latency + random.uniform(0, mock.jitter) if mock.jitter else mock.latency
+                if delay:
+                    time.sleep(delay)
+
+                extra_headers = {}
+                try:
+                    status, result, extra_headers = mock.handle(self.command, self.path, self.headers, body)
+                except PostgRESTError as e:
+                    status, result = e.status, {"code": e.code, "message": e.message, "details": None, "hint": None}
+                except sqlite3.IntegrityError as e:
+                    code = "23503" if "FOREIGN KEY" in str(e) else "23505"
+                    status, result = 409, {"code": code, "message": str(e), "details": None, "hint": None}
+                except (sqlite3.Error, ValueError) as e:
+                    status, result = 400, {"code": "PGRST100", "message": str(e), "details": None, "hint": None}
+
+                payload = b"" if result is None else json.dumps(result, ensure_ascii=False).encode("utf-8")
+                with mock._lock:
+                    mock.stats["requests"] += 1
+                    mock.stats[self.command] += 1
+                    mock.stats["bytes"] += len(payload)
+                    if isinstance(result, list):
+                        mock.stats["rows"] += len(result)
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                for key, value in extra_headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(payload)
+
+            do_GET = do_HEAD = do_POST = do_PATCH = do_DELETE = _serve
+
+        return Handler
+
+def main():
+    db_path = sys.argv[1] if len(sys.argv) > 1 else None
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+    latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.0
+    jitter = float(sys.argv[4]) / 1000 if len(sys.argv) > 4 else 0.0
+
+    mock = MockPostgREST(db_path, latency=latency, jitter=jitter, port=port)
+    print(f"PostgREST 模拟服务: {mock.url}{REST_PREFIX}  数据库: {mock.db_path}")
+    print(f'连接方式: SupabaseManager("{mock.url}", "anon")')
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        mock.stop()
+
+if __name__ == "__main__":
+    main()
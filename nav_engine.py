@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+净值计算引擎
+与具体数据库无关的向量化净值计算，供 DatabaseManager 和 SupabaseManager 共用
+"""
+
+import numpy as np
+import pandas as pd
+
+NAV_COLUMNS = ['strategy_id', 'date', 'nav_value']
+
+def normalize_nav_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """整理待写入的净值数据
+
+    统一列类型（日期转为 YYYY-MM-DD 字符串），同一策略同一日期出现多次时保留最后一条，
+    与逐条 INSERT OR REPLACE 的结果一致。结果按策略、日期排序。
+    """
+    missing = [col for col in NAV_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"净值数据缺少列: {', '.join(missing)}")
+
+    result = df[NAV_COLUMNS].copy()
+    result['strategy_id'] = result['strategy_id'].astype('int64')
+    result['date'] = pd.to_datetime(result['date']).dt.strftime('%Y-%m-%d')
+    result['nav_value'] = result['nav_value'].astype('float64')
+
+    result = result.drop_duplicates(subset=['strategy_id', 'date'], keep='last')
+    return result.sort_values(['strategy_id', 'date'], kind='mergesort').reset_index(drop=True)
+
+def _normalize_existing(existing: pd.DataFrame) -> pd.DataFrame:
+    columns = NAV_COLUMNS + (['return_rate'] if 'return_rate' in existing.columns else [])
+    existing = existing[columns].copy()
+    existing['strategy_id'] = existing['strategy_id'].astype('int64')
+    existing['date'] = pd.to_datetime(existing['date']).dt.strftime('%Y-%m-%d')
+    existing['nav_value'] = existing['nav_value'].astype('float64')
+    return existing
+
+def _pct_change(navs: pd.DataFrame) -> pd.Series:
+    """按策略计算相对上一条净值的收益率(%)，navs 需已按策略、日期排序"""
+    last_nav = navs.groupby('strategy_id', sort=False)['nav_value'].shift(1)
+    return (navs['nav_value'] - last_nav) / last_nav * 100
+
+def compute_return_rates(batch: pd.DataFrame, existing: pd.DataFrame):
+    """批量计算收益率
+
+    batch 为 normalize_nav_frame 整理后的新净值；existing 为数据库中已有的净值记录
+    （至少包含每个策略在本批最早日期之前的最后一条、本批日期范围内的记录，以及本批最晚日期之后的第一条）。
+    同日期的已有记录会被本批数据覆盖。收益率 = (本期净值 - 上期净值) / 上期净值 * 100，
+    上期净值取合并后序列中的前一条。
+
+    返回 (records, repairs)：records 为本批记录及其收益率；repairs 为紧跟在新记录之后的已有记录，
+    其上期净值已变化，收益率需要一并更新（补录或修正历史净值时出现）。
+    """
+    batch = batch.assign(_new=True)
+
+    if existing is not None and not existing.empty:
+        existing = _normalize_existing(existing)[NAV_COLUMNS].assign(_new=False)
+        combined = pd.concat([existing, batch], ignore_index=True)
+        # 已有记录在前，保留最后一条即让本批数据覆盖同日期的已有记录
+        combined = combined.drop_duplicates(subset=['strategy_id', 'date'], keep='last')
+        combined = combined.sort_values(['strategy_id', 'date'], kind='mergesort')
+    else:
+        combined = batch
+
+    combined = combined.assign(return_rate=_pct_change(combined))
+    after_new = combined.groupby('strategy_id', sort=False)['_new'].shift(1, fill_value=False).astype(bool)
+
+    columns = NAV_COLUMNS + ['return_rate']
+    records = combined[combined['_new']].reset_index(drop=True)[columns]
+    repairs = combined[~combined['_new'] & after_new].reset_index(drop=True)[columns]
+    return records, repairs
+
+def stale_return_rates(navs: pd.DataFrame, since=None) -> pd.DataFrame:
+    """找出存储的收益率与净值序列不一致的记录
+
+    navs 包含 strategy_id, date, nav_value, return_rate，需包含每个策略在 since 之前的最后一条净值
+    （since 为 None 时为全部历史）。返回需要更新的记录（strategy_id, date, return_rate 为重新计算的值）。
+    """
+    if navs.empty:
+        return pd.DataFrame(columns=['strategy_id', 'date', 'return_rate'])
+
+    navs = _normalize_existing(navs)
+    navs = navs.sort_values(['strategy_id', 'date'], kind='mergesort')
+    expected = _pct_change(navs)
+    stored = pd.to_numeric(navs['return_rate'], errors='coerce').astype('float64')
+
+    same = np.isclose(stored, expected, rtol=1e-12, atol=1e-12) | (stored.isna() & expected.isna())
+    stale = ~same
+    if since is not None:
+        stale &= navs['date'] >= pd.Timestamp(since).strftime('%Y-%m-%d')
+
+    result = navs.loc[stale, ['strategy_id', 'date']].assign(return_rate=expected[stale])
+    return result.reset_index(drop=True)
+
+def _to_days(values) -> np.ndarray:
+    """日期序列转为 datetime64[D] 数组，便于 searchsorted"""
+    return pd.to_datetime(pd.Series(values)).values.astype('datetime64[D]')
+
+def compute_product_nav_series(weights: pd.DataFrame, navs: pd.DataFrame, dates=None) -> pd.DataFrame:
+    """按生效日期权重计算产品净值序列
+
+    weights 包含 strategy_id, weight, effective_date（可选 id，用于同一生效日期多条时取最后写入的一条）；
+    navs 包含 strategy_id, date, nav_value，需包含每个策略在首个计算日期当天或之前的最后一条净值。
+    dates 为需要计算的日期，默认取 navs 中的全部日期。
+
+    每个日期上，各策略取生效日期不晚于该日的最新权重、日期不晚于该日的最新净值，
+    对有净值的策略按权重加权平均；没有可用权重或净值时为 1.0，与 calculate_product_nav 一致。
+    返回 date, nav_value 两列。
+    """
+    if dates is None:
+        dates = navs['date'] if not navs.empty else []
+    dates = np.unique(_to_days(dates)) if len(dates) else np.array([], dtype='datetime64[D]')
+    if len(dates) == 0:
+        return pd.DataFrame({'date': pd.Series(dtype=object), 'nav_value': pd.Series(dtype='float64')})
+
+    weights = weights.dropna(subset=['effective_date'])
+    sort_cols = ['strategy_id', 'effective_date'] + (['id'] if 'id' in weights.columns else [])
+    weights = weights.assign(effective_date=_to_days(weights['effective_date']) if not weights.empty else [])
+    weights = weights.sort_values(sort_cols, kind='mergesort')
+
+    navs = navs.assign(date=_to_days(navs['date']) if not navs.empty else [])
+    navs = navs.sort_values(['strategy_id', 'date'], kind='mergesort')
+    nav_groups = {sid: group for sid, group in navs.groupby('strategy_id', sort=False)}
+
+    strategy_ids = weights['strategy_id'].unique()
+    weight_matrix = np.full((len(dates), len(strategy_ids)), np.nan)
+    nav_matrix = np.full((len(dates), len(strategy_ids)), np.nan)
+
+    # 逐策略做 as-of 对齐，日期维度全部向量化
+    for j, (sid, group) in enumerate(weights.groupby('strategy_id', sort=True)):
+        pos = np.searchsorted(group['effective_date'].values, dates, side='right') - 1
+        weight_matrix[:, j] = np.where(pos >= 0, group['weight'].values.astype('float64')[np.maximum(pos, 0)], np.nan)
+
+        strategy_navs = nav_groups.get(sid)
+        if strategy_navs is not None:
+            pos = np.searchsorted(strategy_navs['date'].values, dates, side='right') - 1
+            values = strategy_navs['nav_value'].values.astype('float64')
+            nav_matrix[:, j] = np.where(pos >= 0, values[np.maximum(pos, 0)], np.nan)
+
+    valid = ~np.isnan(weight_matrix) & ~np.isnan(nav_matrix)
+    total_weight = np.where(valid, weight_matrix, 0.0).sum(axis=1)
+    total_nav = np.where(valid, weight_matrix * nav_matrix, 0.0).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        product_nav = np.where(total_weight > 0, total_nav / total_weight, 1.0)
+
+    return pd.DataFrame({
+        'date': pd.to_datetime(dates).strftime('%Y-%m-%d'),
+        'nav_value': product_nav
+    })
+
+def compute_product_navs_at(weights: pd.DataFrame, navs: pd.DataFrame, date) -> dict:
+    """计算多个产品在同一日期的净值
+
+    weights 需额外包含 product_id 列；navs 只需包含各策略在该日期当天或之前的最后一条净值。
+    返回 {product_id: 产品净值}，没有权重配置的产品不在结果中（按 1.0 处理）。
+    """
+    result = {}
+    for product_id, product_weights in weights.groupby('product_id'):
+        strategy_navs = navs[navs['strategy_id'].isin(product_weights['strategy_id'])]
+        series = compute_product_nav_series(product_weights, strategy_navs, [date])
+        result[product_id] = float(series['nav_value'].iloc[0])
+    return result
+
+def value_portfolios(holdings: pd.DataFrame, product_navs: dict) -> pd.DataFrame:
+    """按产品净值计算持仓市值和盈亏
+
+    holdings 包含 product_id, total_investment, total_shares 列，
+    追加 current_nav, current_value, profit_loss, profit_rate 列。
+    """
+    holdings = holdings.copy()
+    holdings['current_nav'] = holdings['product_id'].map(product_navs).fillna(1.0).astype('float64')
+    holdings['current_value'] = holdings['total_shares'] * holdings['current_nav']
+    holdings['profit_loss'] = holdings['current_value'] - holdings['total_investment']
+    invested = holdings['total_investment'].where(holdings['total_investment'] > 0)
+    holdings['profit_rate'] = (holdings['profit_loss'] / invested * 100).fillna(0.0)
+    return holdings
+
+STATS_COLUMNS = ['strategy_id', 'record_count', 'return_count', 'last_nav', 'cumulative_return',
+                 'mean_return', 'return_std', 'max_return', 'min_return']
+
+def strategy_stats(nav_df: pd.DataFrame, initial_navs=None) -> pd.DataFrame:
+    """各策略的净值和收益率统计
+
+    nav_df 包含 strategy_id, nav_value, return_rate（%）列，有 date 列时按日期确定最新净值，否则按行顺序；
+    initial_navs 为 {strategy_id: 初始净值} 或以 strategy_id 为索引的 Series，未提供时以各策略第一条净值为初始净值。
+    一次排序后按策略的分组边界归约（reduceat），所有指标共用同一组排序后的数组，不逐策略筛选。
+    返回每个策略一行（按 strategy_id 排序）：record_count, return_count（有收益率的记录数）, last_nav,
+    cumulative_return（最新净值 / 初始净值 - 1，%）, mean_return, return_std（样本标准差）, max_return, min_return；
+    没有收益率的策略收益率统计为 NaN，只有一条收益率时 return_std 为 NaN，与 pandas 的 mean/std/max/min 一致。
+    """
+    if nav_df.empty:
+        return pd.DataFrame({column: pd.Series(dtype='int64' if column in STATS_COLUMNS[:3] else 'float64')
+                             for column in STATS_COLUMNS})
+
+    order = ['strategy_id', 'date'] if 'date' in nav_df.columns else ['strategy_id']
+    navs = nav_df.sort_values(order, kind='mergesort')
+    ids = navs['strategy_id'].to_numpy()
+    nav_values = navs['nav_value'].to_numpy(dtype='float64')
+    returns = pd.to_numeric(navs['return_rate']).to_numpy(dtype='float64')
+
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    ends = np.r_[starts[1:], len(ids)]
+    valid = ~np.isnan(returns)
+    return_count = np.add.reduceat(valid.astype('int64'), starts)
+    has_returns = return_count > 0
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.add.reduceat(np.where(valid, returns, 0.0), starts) / return_count
+        deviation = np.where(valid, returns - np.repeat(mean, ends - starts), 0.0)
+        std = np.where(return_count > 1,
+                       np.sqrt(np.add.reduceat(deviation ** 2, starts) / np.maximum(return_count - 1, 1)), np.nan)
+    max_return = np.where(has_returns, np.maximum.reduceat(np.where(valid, returns, -np.inf), starts), np.nan)
+    min_return = np.where(has_returns, np.minimum.reduceat(np.where(valid, returns, np.inf), starts), np.nan)
+
+    last_nav = nav_values[ends - 1]
+    if initial_navs is None:
+        initial = nav_values[starts]
+    else:
+        initial = pd.Series(ids[starts]).map(initial_navs).to_numpy(dtype='float64')
+
+    return pd.DataFrame({
+        'strategy_id': ids[starts],
+        'record_count': ends - starts,
+        'return_count': return_count,
+        'last_nav': last_nav,
+        'cumulative_return': (last_nav / initial - 1) * 100,
+        'mean_return': mean,
+        'return_std': std,
+        'max_return': max_return,
+        'min_return': min_return
+    })
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel净值批量导入
+以只读流式方式逐行读取工作簿，按块校验、去重后通过批量写入接口入库，
+内存占用只与块大小有关，与文件大小无关
+
+支持两种表格格式（每个工作表独立识别表头）：
+- 纵表：包含 策略名称 / 日期 / 净值 三列
+- 横表：包含 日期 列，其余列名为策略名称，单元格为对应净值
+"""
+
+from itertools import islice
+
+import pandas as pd
+from openpyxl import load_workbook
+
+STRATEGY_HEADERS = ('策略名称', '策略', 'strategy', 'strategy_name')
+DATE_HEADERS = ('日期', '净值日期', 'date')
+NAV_HEADERS = ('净值', '单位净值', 'nav', 'nav_value')
+
+# 表头最多在前几行中查找
+HEADER_SCAN_ROWS = 10
+# 最多保留的错误明细条数
+MAX_ERRORS = 100
+
+def _find_column(header, names):
+    for idx, cell in enumerate(header):
+        if cell is not None and str(cell).strip().lower() in names:
+            return idx
+    return None
+
+def _detect_layout(header, strategy_names):
+    """识别表头，返回 (格式, 列信息)，无法识别时返回 None"""
+    date_col = _find_column(header, DATE_HEADERS)
+    if date_col is None:
+        return None
+
+    strategy_col = _find_column(header, STRATEGY_HEADERS)
+    nav_col = _find_column(header, NAV_HEADERS)
+    if strategy_col is not None and nav_col is not None:
+        return 'long', (strategy_col, date_col, nav_col)
+
+    wide_cols = [
+        (idx, str(cell).strip()) for idx, cell in enumerate(header)
+        if idx != date_col and cell is not None and str(cell).strip() in strategy_names
+    ]
+    if wide_cols:
+        return 'wide', (date_col, wide_cols)
+    return None
+
+def iter_nav_rows(file, strategy_names=()):
+    """流式读取工作簿，逐条产出 (工作表, 行号, 策略名称, 日期, 净值)"""
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            rows = sheet.iter_rows(values_only=True)
+            layout = None
+            row_number = 0
+            for row in islice(rows, HEADER_SCAN_ROWS):
+                row_number += 1
+                layout = _detect_layout(row, strategy_names)
+                if layout:
+                    break
+            if layout is None:
+                continue
+
+            kind, columns = layout
+            for row in rows:
+                row_number += 1
+                if kind == 'long':
+                    strategy_col, date_col, nav_col = columns
+                    if max(columns) >= len(row):
+                        continue
+                    if row[strategy_col] is None and row[date_col] is None and row[nav_col] is None:
+                        continue
+                    yield sheet.title, row_number, row[strategy_col], row[date_col], row[nav_col]
+                else:
+                    date_col, wide_cols = columns
+                    if date_col >= len(row) or row[date_col] is None:
+                        continue
+                    for idx, name in wide_cols:
+                        if idx < len(row) and row[idx] is not None:
+                            yield sheet.title, row_number, name, row[date_col], row[idx]
+    finally:
+        workbook.close()
+
+def count_rows(file):
+    """根据工作表尺寸估算总行数（用于进度显示），无法获取时返回 None"""
+    workbook = load_workbook(file, read_only=True)
+    try:
+        total = 0
+        for sheet in workbook.worksheets:
+            if sheet.max_row is None:
+                return None
+            total += sheet.max_row
+        return total
+    finally:
+        workbook.close()
+        if hasattr(file, 'seek'):
+            file.seek(0)
+
+def preview_nav_excel(file, n=10):
+    """读取每个工作表的前 n 行用于预览"""
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        frames = []
+        for sheet in workbook.worksheets:
+            rows = list(sheet.iter_rows(values_only=True, max_row=n + 1))
+            if rows:
+                frame = pd.DataFrame(rows[1:], columns=[str(c) if c is not None else '' for c in rows[0]])
+                frame.insert(0, '工作表', sheet.title)
+                frames.append(frame)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    finally:
+        workbook.close()
+        if hasattr(file, 'seek'):
+            file.seek(0)
+
+def _validate_chunk(chunk, strategy_map, result):
+    """校验并去重一个数据块，返回可写入的 DataFrame（块内同一策略同一日期保留最后一条）"""
+    df = pd.DataFrame(chunk, columns=['sheet', 'row', 'strategy_name', 'date', 'nav_value'])
+    df['strategy_id'] = df['strategy_name'].astype(str).str.strip().map(strategy_map)
+    df['date'] = pd.to_datetime(df['date'], errors='coerce', format='mixed')
+    df['nav_value'] = pd.to_numeric(df['nav_value'], errors='coerce')
+
+    invalid = df['strategy_id'].isna() | df['date'].isna() | df['nav_value'].isna() | (df['nav_value'] <= 0)
+    if invalid.any():
+        bad = df[invalid]
+        result['invalid'] += len(bad)
+        unknown = bad.loc[bad['strategy_id'].isna(), 'strategy_name'].dropna().astype(str).unique()
+        result['unknown_strategies'].update(unknown)
+        room = MAX_ERRORS - len(result['errors'])
+        for row in bad.head(max(room, 0)).itertuples(index=False):
+            if pd.isna(row.strategy_id):
+                reason = f"未知策略: {row.strategy_name}"
+            elif pd.isna(row.date):
+                reason = "日期无效"
+            else:
+                reason = "净值无效"
+            result['errors'].append(f"{row.sheet} 第{row.row}行: {reason}")
+
+    valid = df[~invalid]
+    deduped = valid.drop_duplicates(subset=['strategy_id', 'date'], keep='last')
+    result['duplicates'] += len(valid) - len(deduped)
+    return deduped[['strategy_id', 'date', 'nav_value']]
+
+def import_nav_excel(db, file, chunk_size=5000, progress_callback=None):
+    """流式导入Excel中的净值数据
+
+    db 为 DatabaseManager 或 SupabaseManager；策略名称到ID的映射只查询一次。
+    每读满 chunk_size 条即校验、去重并调用 db.add_nav_records_bulk 写入：块内同一策略同一日期
+    只写入最后一条，其余计入 duplicates；分布在不同块中的由批量写入按 (策略, 日期) 覆盖，
+    同样以文件中最后一条为准，imported 为写入的条数（含覆盖同一文件前面块的记录）。
+    progress_callback(已读取行数, 估算总行数) 在每块写入后调用。
+    返回导入统计信息。
+    """
+    strategies = db.get_strategies()
+    strategy_map = {} if strategies.empty else dict(zip(strategies['name'].astype(str), strategies['id']))
+
+    total_rows = count_rows(file)
+    rows_read = {}
+    result = {
+        'processed': 0,
+        'imported': 0,
+        'invalid': 0,
+        'duplicates': 0,
+        'unknown_strategies': set(),
+        'errors': []
+    }
+
+    def flush(chunk):
+        batch = _validate_chunk(chunk, strategy_map, result)
+        if not batch.empty:
+            result['imported'] += db.add_nav_records_bulk(batch)
+        result['processed'] += len(chunk)
+        if progress_callback:
+            progress_callback(sum(rows_read.values()), total_rows)
+
+    chunk = []
+    for record in iter_nav_rows(file, strategy_map.keys()):
+        chunk.append(record)
+        rows_read[record[0]] = record[1]
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+
+    return result
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+内存净值面板
+把全部净值记录对齐成 日期 × 策略 的矩阵，并为每个策略保存按日期排序的数组，
+as-of 查询和区间查询都用 searchsorted 完成，不再逐次访问数据库
+"""
+
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+def _to_day(value) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+def _to_days(values) -> np.ndarray:
+    return pd.to_datetime(pd.Series(values)).values.astype('datetime64[D]')
+
+class NavPanel:
+    """净值面板
+
+    - dates: 所有策略净值日期的并集（升序）
+    - strategy_ids: 矩阵列对应的策略ID
+    - matrix: len(dates) × len(strategy_ids) 的净值矩阵，当天没有净值为 NaN
+    - 每个策略另存一份 (日期数组, 净值数组)，用于 O(log n) 的 as-of 查询
+
+    通过 update / update_many 增量更新，读写之间用锁保护，可在多个会话间共享；
+    refresh_if_stale 在后台线程中定期重新加载（其他进程写入的数据）。
+    """
+
+    def __init__(self, records: Optional[pd.DataFrame] = None):
+        self._lock = threading.RLock()
+        self._series = {}
+        self.dates = np.array([], dtype='datetime64[D]')
+        self.strategy_ids = []
+        self._columns = {}
+        self.matrix = np.empty((0, 0))
+        # dates / matrix 是这两个缓冲区的前 len(dates) 行，追加日期时按倍数扩容
+        self._date_buffer = self.dates
+        self._matrix_buffer = self.matrix
+        self.built_at = time.time()
+        # 后台重新加载期间写入的净值，加载完成后重新应用
+        self._refreshing = False
+        self._journal = None
+        if records is not None:
+            self.load(records)
+
+    def load(self, records: pd.DataFrame):
+        """从净值记录（strategy_id, date, nav_value）全量构建面板"""
+        with self._lock:
+            self._series = {}
+            if records is not None and not records.empty:
+                df = pd.DataFrame({
+                    'strategy_id': records['strategy_id'].astype('int64').values,
+                    'date': _to_days(records['date']),
+                    'nav_value': records['nav_value'].astype('float64').values
+                })
+                df = df.drop_duplicates(subset=['strategy_id', 'date'], keep='last')
+                df = df.sort_values(['strategy_id', 'date'], kind='mergesort')
+                for sid, group in df.groupby('strategy_id', sort=True):
+                    self._series[int(sid)] = (group['date'].values, group['nav_value'].values)
+            self._rebuild_matrix()
+            self.built_at = time.time()
+
+    def _rebuild_matrix(self):
+        self.strategy_ids = sorted(self._series)
+        self._columns = {sid: j for j, sid in enumerate(self.strategy_ids)}
+        if self._series:
+            self.dates = np.unique(np.concatenate([dates for dates, _ in self._series.values()]))
+        else:
+            self.dates = np.array([], dtype='datetime64[D]')
+        self.matrix = np.full((len(self.dates), len(self.strategy_ids)), np.nan)
+        for sid, (dates, values) in self._series.items():
+            self.matrix[np.searchsorted(self.dates, dates), self._columns[sid]] = values
+        self._date_buffer = self.dates
+        self._matrix_buffer = self.matrix
+
+    def _append_dates(self, new_dates):
+        """在末尾追加晚于现有全部日期的行（当天没有净值为 NaN），缓冲区不足时按倍数扩容"""
+        n = len(self.dates)
+        m = n + len(new_dates)
+        if m > len(self._date_buffer):
+            capacity = max(m, 2 * len(self._date_buffer), 64)
+            date_buffer = np.empty(capacity, dtype='datetime64[D]')
+            date_buffer[:n] = self.dates
+            matrix_buffer = np.empty((capacity, len(self.strategy_ids)))
+            matrix_buffer[:n] = self.matrix
+            self._date_buffer, self._matrix_buffer = date_buffer, matrix_buffer
+        self._date_buffer[n:m] = new_dates
+        self._matrix_buffer[n:m] = np.nan
+        self.dates = self._date_buffer[:m]
+        self.matrix = self._matrix_buffer[:m]
+
+    def update(self, strategy_id, date, nav_value):
+        """写入或覆盖一条净值"""
+        self.update_many(pd.DataFrame({'strategy_id': [strategy_id], 'date': [date], 'nav_value': [nav_value]}))
+
+    def update_many(self, records: pd.DataFrame):
+        """增量写入多条净值，同一策略同一日期以最后一条为准
+
+        只涉及已有策略、且新日期都晚于面板中全部日期时（按日追加净值的常见情况）在矩阵末尾追加行；
+        出现新策略或补录中间日期时重建矩阵。
+        """
+        if records is None or records.empty:
+            return
+        df = pd.DataFrame({
+            'strategy_id': records['strategy_id'].astype('int64').values,
+            'date': _to_days(records['date']),
+            'nav_value': records['nav_value'].astype('float64').values
+        }).drop_duplicates(subset=['strategy_id', 'date'], keep='last')
+
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(df)
+            self._apply(df)
+
+    def _apply(self, df: pd.DataFrame):
+        new_strategy = False
+        for sid, group in df.groupby('strategy_id', sort=False):
+            sid = int(sid)
+            new_dates, new_values = group['date'].values, group['nav_value'].values
+            series = self._series.get(sid)
+            if series is not None and len(series[0]) and new_dates.min() > series[0][-1]:
+                order = np.argsort(new_dates, kind='mergesort')
+                self._series[sid] = (np.concatenate([series[0], new_dates[order]]),
+                                     np.concatenate([series[1], new_values[order]]))
+            else:
+                dates, values = series if series is not None else (np.array([], dtype='datetime64[D]'), np.array([]))
+                merged = pd.concat([pd.Series(values, index=dates), pd.Series(new_values, index=new_dates)])
+                merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+                self._series[sid] = (merged.index.values.astype('datetime64[D]'), merged.values.astype('float64'))
+            new_strategy = new_strategy or sid not in self._columns
+
+        new_dates = np.setdiff1d(df['date'].values, self.dates)
+        if new_strategy or (len(new_dates) and len(self.dates) and new_dates[0] <= self.dates[-1]):
+            self._rebuild_matrix()
+            return
+        if len(new_dates):
+            self._append_dates(new_dates)
+        rows = np.searchsorted(self.dates, df['date'].values)
+        cols = df['strategy_id'].map(self._columns).values
+        self.matrix[rows, cols] = df['nav_value'].values
+
+    def refresh_if_stale(self, fetch, max_age: Optional[float]):
+        """距上次加载超过 max_age 秒时在后台线程中重新加载，不阻塞调用方
+
+        fetch() 返回全部净值记录（strategy_id, date, nav_value），失败时抛出异常；加载期间经 update /
+        update_many 写入的净值在加载完成后重新应用。加载失败时保留现有数据，max_age 秒后再试。
+        max_age 为 None 或已在加载时不做任何事。
+        """
+        with self._lock:
+            if max_age is None or self._refreshing or time.time() - self.built_at <= max_age:
+                return
+            self._refreshing = True
+            self._journal = []
+        threading.Thread(target=self._refresh, args=(fetch,), name="nav-panel-refresh", daemon=True).start()
+
+    def _refresh(self, fetch):
+        try:
+            records = fetch()
+        except Exception:
+            with self._lock:
+                self._journal = None
+                self._refreshing = False
+                self.built_at = time.time()
+            return
+        with self._lock:
+            journal, self._journal = self._journal, None
+            self.load(records)
+            for df in journal:
+                self._apply(df)
+            self._refreshing = False
+
+    def nav_asof(self, strategy_id, date, inclusive=True) -> Optional[float]:
+        """策略在指定日期（inclusive=False 时为该日期之前）的最后一个净值，没有则返回 None"""
+        with self._lock:
+            series = self._series.get(int(strategy_id))
+        if series is None:
+            return None
+        dates, values = series
+        pos = np.searchsorted(dates, _to_day(date), side='right' if inclusive else 'left') - 1
+        return float(values[pos]) if pos >= 0 else None
+
+    def navs_asof(self, strategy_ids, dates) -> pd.DataFrame:
+        """多个策略在多个日期的 as-of 净值，返回 日期 × 策略 的 DataFrame"""
+        day_index = _to_days(dates)
+        result = np.full((len(day_index), len(strategy_ids)), np.nan)
+        with self._lock:
+            for j, sid in enumerate(strategy_ids):
+                series = self._series.get(int(sid))
+                if series is None:
+                    continue
+                series_dates, values = series
+                pos = np.searchsorted(series_dates, day_index, side='right') - 1
+                result[:, j] = np.where(pos >= 0, values[np.maximum(pos, 0)], np.nan)
+        return pd.DataFrame(result, index=pd.to_datetime(day_index), columns=list(strategy_ids))
+
+    def _slice(self, start, end):
+        lo = 0 if start is None else np.searchsorted(self.dates, _to_day(start), side='left')
+        hi = len(self.dates) if end is None else np.searchsorted(self.dates, _to_day(end), side='right')
+        return lo, hi
+
+    def nav_matrix(self, strategy_ids=None, start_date=None, end_date=None) -> pd.DataFrame:
+        """日期区间内的 日期 × 策略 净值矩阵，当天没有净值为 NaN"""
+        with self._lock:
+            ids = self.strategy_ids if strategy_ids is None else [int(sid) for sid in strategy_ids]
+            lo, hi = self._slice(start_date, end_date)
+            cols = [self._columns.get(sid) for sid in ids]
+            block = np.full((hi - lo, len(ids)), np.nan)
+            for j, col in enumerate(cols):
+                if col is not None:
+                    block[:, j] = self.matrix[lo:hi, col]
+            index = pd.to_datetime(self.dates[lo:hi])
+        return pd.DataFrame(block, index=index, columns=ids)
+
+    def records(self, strategy_ids=None, start_date=None, end_date=None) -> pd.DataFrame:
+        """日期区间内的净值记录（strategy_id, date, nav_value, return_rate），按日期排序
+
+        return_rate 按策略自身的上一条净值计算（区间开始前的净值也会参与计算）。
+        """
+        frames = []
+        with self._lock:
+            ids = sorted(self._series) if strategy_ids is None else [int(sid) for sid in strategy_ids]
+            start = None if start_date is None else _to_day(start_date)
+            end = None if end_date is None else _to_day(end_date)
+            for sid in ids:
+                series = self._series.get(sid)
+                if series is None:
+                    continue
+                dates, values = series
+                lo = 0 if start is None else np.searchsorted(dates, start, side='left')
+                hi = len(dates) if end is None else np.searchsorted(dates, end, side='right')
+                if hi <= lo:
+                    continue
+                previous = np.empty(hi - lo)
+                previous[1:] = values[lo:hi - 1]
+                previous[0] = values[lo - 1] if lo > 0 else np.nan
+                frames.append(pd.DataFrame({
+                    'strategy_id': sid,
+                    'date': pd.to_datetime(dates[lo:hi]).strftime('%Y-%m-%d'),
+                    'nav_value': values[lo:hi],
+                    'return_rate': (values[lo:hi] - previous) / previous * 100
+                }))
+        if not frames:
+            return pd.DataFrame(columns=['strategy_id', 'date', 'nav_value', 'return_rate'])
+        result = pd.concat(frames, ignore_index=True)
+        return result.sort_values(['date', 'strategy_id'], kind='mergesort').reset_index(drop=True)
+
+    def returns_matrix(self, strategy_ids=None, start_date=None, end_date=None) -> pd.DataFrame:
+        """日期区间内的 日期 × 策略 收益率(%)矩阵，用于相关性分析"""
+        records = self.records(strategy_ids, start_date, end_date)
+        if records.empty:
+            return pd.DataFrame()
+        return records.pivot(index='date', columns='strategy_id', values='return_rate')
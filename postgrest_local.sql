@@ -0,0 +1,15 @@
+-- 本地 PostgREST 环境的角色与权限（仅用于 docker-compose.postgrest.yml，Supabase 已内置这些配置）
+-- 请求以 anon 角色执行，对应 docker-compose.postgrest.yml 中的本地密钥
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT FROM pg_roles WHERE rolname = 'anon') THEN
+        CREATE ROLE anon NOLOGIN;
+    END IF;
+END
+$$;
+
+GRANT USAGE ON SCHEMA public TO anon;
+GRANT SELECT, INSERT, UPDATE, DELETE ON ALL TABLES IN SCHEMA public TO anon;
+GRANT USAGE, SELECT ON ALL SEQUENCES IN SCHEMA public TO anon;
+GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA public TO anon;
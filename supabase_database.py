@@ -7,64 +7,394 @@ Supabase云数据库管理器
 """
 
 import streamlit as st
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from functools import partial
+from itertools import chain
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Union
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # 未安装 orjson 时使用标准库解析
+    _json_loads = json.loads
+
+from nav_panel import NavPanel
+from nav_engine import (
+    normalize_nav_frame, compute_return_rates, stale_return_rates, compute_product_nav_series,
+    compute_product_navs_at, value_portfolios
+)
+
+# 幂等请求（GET/HEAD/PUT/DELETE 等）遇到这些状态码时自动重试
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# 解码响应时直接转为 float64 / int64 数组的列
+FLOAT_COLUMNS = frozenset({'nav_value', 'return_rate', 'initial_nav', 'weight', 'amount', 'shares', 'nav_at_investment'})
+INT_COLUMNS = frozenset({'id', 'strategy_id', 'investor_id', 'product_id'})
+
+# 联表得到的名称列，用 PostgREST 的展开语法（...表(别名:列)）直接返回为顶层字段
+STRATEGY_EMBEDS = {'strategy_name': '...strategies(strategy_name:name)'}
+INVESTMENT_EMBEDS = {'investor_name': '...investors(investor_name:name)',
+                     'product_name': '...products(product_name:name)'}
+
+# 内存净值面板加载的列
+NAV_PANEL_PARAMS = {"select": "strategy_id,date,nav_value", "order": "strategy_id,date"}
+
+# gather 的工作线程中产生的错误信息，返回前在调用线程中显示（Streamlit 的调用只能在脚本线程中执行）
+_pending_errors: ContextVar[Optional[List[str]]] = ContextVar("supabase_pending_errors", default=None)
+
+def _report_error(message: str):
+    """显示错误信息；在 gather 的工作线程中先收集，由 gather 在调用线程中显示"""
+    errors = _pending_errors.get()
+    if errors is None:
+        st.error(message)
+    else:
+        errors.append(message)
+
+def create_session(pool_size: int = 10, retries: int = 3, backoff_factor: float = 0.3,
+                   backoff_jitter: float = 0.2) -> requests.Session:
+    """创建复用连接的 HTTP 会话
+    
+    同一主机最多保持 pool_size 个长连接（keep-alive），避免每次请求重新握手。
+    幂等请求在网络错误或 RETRY_STATUS_CODES 时按指数退避重试：第 n 次重试前等待
+    backoff_factor * 2^(n-1) 秒再加上 0~backoff_jitter 秒的随机抖动，并遵守 Retry-After 响应头；
+    POST/PATCH 只在连接尚未建立时重试。
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        backoff_jitter=backoff_jitter,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def _json_records(rows) -> List[Dict]:
+    """DataFrame 或字典列表转为可 JSON 序列化的记录：日期转为 ISO 字符串，缺失值转为 null"""
+    df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+    if df.empty:
+        return []
+    df = df.copy()
+    for column in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = df[column].dt.strftime('%Y-%m-%d')
+        elif df[column].dtype == object:
+            df[column] = df[column].map(lambda value: value.isoformat() if hasattr(value, 'isoformat') else value)
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict('records')
+
+def _records_frame(rows: List[Dict]) -> pd.DataFrame:
+    """JSON 记录按列构建 DataFrame
+
+    FLOAT_COLUMNS / INT_COLUMNS 中的列直接转为 float64 / int64 数组（null 转为 NaN，
+    整数列含 null 时保持原值），其余列保持 JSON 中的原值。
+    """
+    if not rows:
+        return pd.DataFrame()
+    data = {}
+    for key in rows[0]:
+        values = [row.get(key) for row in rows]
+        try:
+            if key in FLOAT_COLUMNS:
+                values = np.array(values, dtype='float64')
+            elif key in INT_COLUMNS:
+                values = np.array(values, dtype='int64')
+        except (TypeError, ValueError):
+            pass
+        data[key] = values
+    return pd.DataFrame(data)
+
+def _decode_frame(content: bytes) -> pd.DataFrame:
+    """解码 JSON 数组响应为 DataFrame，空响应返回空 DataFrame"""
+    return _records_frame(_json_loads(content)) if content else pd.DataFrame()
+
+def _select(columns: Optional[List[str]] = None, embeds: Optional[Dict[str, str]] = None) -> str:
+    """PostgREST select 参数
+
+    columns 为 None 时选择全部列及 embeds 中的全部联表列；否则只选择 columns，
+    其中属于 embeds 的列（如 strategy_name）替换为对应的联表展开表达式。
+    """
+    embeds = embeds or {}
+    if columns is None:
+        return ",".join(["*"] + list(embeds.values()))
+    return ",".join(embeds.get(column, column) for column in columns)
+
+def _portfolio_frame(rows: List[Dict]) -> pd.DataFrame:
+    """investor_portfolios 函数的结果转为与 value_portfolios 相同的列和类型"""
+    portfolio = pd.DataFrame(rows)
+    numeric = ['total_investment', 'total_shares', 'current_nav', 'current_value', 'profit_loss', 'profit_rate']
+    portfolio[numeric] = portfolio[numeric].astype('float64')
+    return portfolio[['investor_id', 'investor_name', 'product_name', 'product_id', 'total_investment',
+                      'total_shares', 'transaction_count', 'current_nav', 'current_value', 'profit_loss', 'profit_rate']]
 
 class SupabaseManager:
-    def __init__(self):
-        """初始化Supabase连接"""
+    def __init__(self, supabase_url: Optional[str] = None, supabase_key: Optional[str] = None,
+                 pool_size: int = 10, timeout=(5, 30), retries: int = 3,
+                 session: Optional[requests.Session] = None,
+                 page_size: int = 1000, max_workers: int = 4,
+                 rest_prefix: str = "/rest/v1", use_rpc: bool = True):
+        """初始化Supabase连接
+        
+        supabase_url / supabase_key 未指定时从 st.secrets 读取。
+        timeout 为 (连接超时, 读取超时) 秒；pool_size、retries 见 create_session，
+        也可以直接传入已配置好的 session 以在多个管理器之间共享连接。
+        page_size 为分页读取时每页的记录数（PostgREST 默认单次最多返回 1000 条），
+        max_workers 为并发获取分页的线程数。
+        rest_prefix 为 REST 接口路径前缀（直接连接 PostgREST 时为 ""）；
+        use_rpc 为 True 时产品净值和持仓估值优先调用数据库函数（见 supabase_product_nav.sql）。
+        """
         try:
-            self.supabase_url = st.secrets["SUPABASE_URL"]
-            self.supabase_key = st.secrets["SUPABASE_ANON_KEY"]
+            self.supabase_url = supabase_url or st.secrets["SUPABASE_URL"]
+            self.supabase_key = supabase_key or st.secrets["SUPABASE_ANON_KEY"]
             
             # 验证配置是否有效
             if not self.supabase_url or not self.supabase_key:
                 raise KeyError("配置为空")
                 
-        except (KeyError, AttributeError) as e:
+        except (KeyError, AttributeError, FileNotFoundError) as e:
             # 如果无法获取密钥，抛出异常让应用回退到本地数据库
             raise Exception(f"Supabase配置错误: {str(e)}")
         
+        self.supabase_url = self.supabase_url.rstrip("/")
         self.headers = {
             "apikey": self.supabase_key,
             "Authorization": f"Bearer {self.supabase_key}",
             "Content-Type": "application/json",
             "Prefer": "return=representation"
         }
+        self.timeout = timeout
+        self.session = session or create_session(pool_size=pool_size, retries=retries)
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.rest_url = f"{self.supabase_url}{rest_prefix}"
+        # 数据库中不存在的 RPC 函数，之后直接走客户端计算
+        self.use_rpc = use_rpc
+        self._missing_rpc = set()
+        
+        self.nav_panel = None
+        self.nav_panel_max_age = None
     
-    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> pd.DataFrame:
-        """发送HTTP请求到Supabase"""
-        url = f"{self.supabase_url}/rest/v1/{endpoint}"
+    def close(self):
+        """关闭 HTTP 会话中的连接"""
+        self.session.close()
+    
+    def gather(self, *calls) -> List[Any]:
+        """并发执行多个互不依赖的读取，按参数顺序返回结果
         
+        calls 为无参数的可调用对象，如 db.gather(db.get_strategies, lambda: db.get_nav_records(strategy_id=1))。
+        各调用在最多 max_workers 个线程中执行，共用同一个会话的连接池和重试设置；
+        执行期间的错误信息在返回前统一用 st.error 显示。
+        """
+        errors = []
+        
+        def run(call):
+            _pending_errors.set(errors)
+            return call()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(calls)))) as executor:
+                return list(executor.map(run, calls))
+        finally:
+            for message in errors:
+                _report_error(message)
+    
+    def _send(self, method: str, endpoint: str, data: Optional[Union[Dict, List[Dict]]] = None,
+              params: Optional[Dict] = None, headers: Optional[Dict] = None) -> requests.Response:
+        """通过共享会话发送请求，返回原始响应"""
+        url = f"{self.rest_url}/{endpoint}"
+        headers = {**self.headers, **headers} if headers else self.headers
+        response = self.session.request(
+            method, url, headers=headers, params=params,
+            json=data if method in ("POST", "PATCH") else None,
+            timeout=self.timeout
+        )
+        return response
+    
+    def _make_request(self, method: str, endpoint: str, data: Optional[Union[Dict, List[Dict]]] = None,
+                      params: Optional[Dict] = None, headers: Optional[Dict] = None) -> pd.DataFrame:
+        """发送HTTP请求到Supabase"""
         try:
-            if method == "GET":
-                response = requests.get(url, headers=self.headers, params=params)
-            elif method == "POST":
-                response = requests.post(url, headers=self.headers, json=data)
-            elif method == "PATCH":
-                response = requests.patch(url, headers=self.headers, json=data, params=params)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=self.headers, params=params)
+            response = self._send(method, endpoint, data, params, headers)
             
             if response.status_code in [200, 201]:
-                result = response.json()
-                return pd.DataFrame(result) if result else pd.DataFrame()
+                return _decode_frame(response.content)
             else:
-                st.error(f"数据库操作失败: {response.status_code} - {response.text}")
+                _report_error(f"数据库操作失败: {response.status_code} - {response.text}")
                 return pd.DataFrame()
                 
         except requests.exceptions.RequestException as e:
-            st.error(f"网络连接失败: {str(e)}")
+            _report_error(f"网络连接失败: {str(e)}")
             return pd.DataFrame()
         except Exception as e:
-            st.error(f"未知错误: {str(e)}")
+            _report_error(f"未知错误: {str(e)}")
             import traceback
-            st.error(f"详细错误信息: {traceback.format_exc()}")
+            _report_error(f"详细错误信息: {traceback.format_exc()}")
+            return pd.DataFrame()
+    
+    def _rpc(self, function: str, params: Dict):
+        """调用数据库函数（POST /rpc/<函数名>），返回解析后的 JSON
+        
+        函数不可用或调用失败时返回 None，由调用方回退到客户端计算；
+        数据库中不存在的函数会被记住，之后不再请求。
+        """
+        if not self.use_rpc or function in self._missing_rpc:
+            return None
+        try:
+            response = self._send("POST", f"rpc/{function}", params, headers={"Prefer": "return=representation"})
+        except requests.exceptions.RequestException:
+            return None
+        if response.status_code == 200:
+            return _json_loads(response.content)
+        # PGRST202: 函数不存在（尚未在数据库中执行 supabase_product_nav.sql）
+        if response.status_code == 404 or "PGRST202" in response.text:
+            self._missing_rpc.add(function)
+        return None
+    
+    def _fetch_page(self, endpoint: str, params: Dict, start: int, end: int, count: bool = False) -> requests.Response:
+        """用 Range 请求头读取第 start~end 条（含），count=True 时同时请求精确总数"""
+        headers = {"Range-Unit": "items", "Range": f"{start}-{end}"}
+        if count:
+            headers["Prefer"] = "count=exact"
+        response = self._send("GET", endpoint, params=params, headers=headers)
+        if response.status_code not in (200, 206):
+            raise requests.exceptions.HTTPError(f"{response.status_code} - {response.text}", response=response)
+        return response
+    
+    def _fetch_rows(self, endpoint: str, params: Optional[Dict] = None, key: str = "id") -> pd.DataFrame:
+        """分页读取查询的全部结果，请求失败时抛出 requests.exceptions.RequestException
+        
+        首页同时请求精确总数（Content-Range 形如 "0-999/5234"），其余分页按首页实际返回的条数
+        （服务端 max-rows 可能小于 page_size）划分，用最多 max_workers 个线程并发获取后按顺序拼接。
+        排序条件末尾会追加唯一键 key，保证分页之间不重不漏。
+        """
+        params = dict(params or {})
+        if key:
+            order = params.get("order")
+            order_columns = [item.split(".")[0].strip() for item in order.split(",")] if order else []
+            if key not in order_columns:
+                params["order"] = f"{order},{key}.asc" if order else f"{key}.asc"
+        
+        first = self._fetch_page(endpoint, params, 0, self.page_size - 1, count=True)
+        rows = _json_loads(first.content) if first.content else []
+        total = first.headers.get("Content-Range", "").split("/")[-1]
+        if not rows or not total.isdigit() or len(rows) >= int(total):
+            return _records_frame(rows)
+        
+        step = len(rows)
+        starts = range(step, int(total), step)
+        
+        def fetch(start):
+            return _json_loads(self._fetch_page(endpoint, params, start, start + step - 1).content)
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(starts)))) as executor:
+            pages = list(executor.map(fetch, starts))
+        return _records_frame(list(chain(rows, *pages)))
+    
+    def _fetch_all(self, endpoint: str, params: Optional[Dict] = None, key: str = "id") -> pd.DataFrame:
+        """分页读取查询的全部结果（见 _fetch_rows），失败时显示错误并返回空 DataFrame"""
+        try:
+            return self._fetch_rows(endpoint, params, key)
+        except requests.exceptions.HTTPError as e:
+            _report_error(f"数据库操作失败: {str(e)}")
+            return pd.DataFrame()
+        except requests.exceptions.RequestException as e:
+            _report_error(f"网络连接失败: {str(e)}")
             return pd.DataFrame()
     
+    def _count_rows(self, table: str) -> int:
+        """用 HEAD 请求获取表的记录数，只返回响应头，不传输数据"""
+        url = f"{self.rest_url}/{table}"
+        headers = {**self.headers, "Prefer": "count=exact"}
+        
+        try:
+            response = self.session.head(url, headers=headers, timeout=self.timeout)
+            if response.status_code in [200, 206]:
+                # Content-Range 形如 "0-24/3573" 或 "*/0"
+                total = response.headers.get("Content-Range", "").split("/")[-1]
+                if total.isdigit():
+                    return int(total)
+            _report_error(f"获取记录数失败: {table} - {response.status_code}")
+        except requests.exceptions.RequestException as e:
+            _report_error(f"网络连接失败: {str(e)}")
+        return 0
+    
+    def get_table_counts(self, tables=("strategies", "investors", "products", "nav_records")) -> Dict[str, int]:
+        """获取各表记录数（各表的 HEAD 请求并发发送），返回 {表名: 记录数}"""
+        return dict(zip(tables, self.gather(*[partial(self._count_rows, table) for table in tables])))
+    
+    # 批量写入
+    def bulk_upsert(self, table: str, rows, on_conflict: Optional[str] = None,
+                    batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """分批写入多条记录
+        
+        rows 为 DataFrame 或字典列表（各条记录需包含相同的列）。每 batch_size 条（默认 page_size）
+        作为一个 JSON 数组 POST；指定 on_conflict（如 "strategy_id,date"）时按该唯一约束合并重复
+        （resolution=merge-duplicates），否则直接插入。某一批失败不影响其他批次。
+        写入 nav_records 的 nav_value 时，受影响策略此后各条的收益率随后按已存储的净值重新计算。
+        返回 {'written': 成功写入条数, 'failed': 失败条数, 'errors': 各失败批次的说明}。
+        """
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+        result = self._upsert_chunks(table, df, on_conflict, batch_size)
+        if table == 'nav_records' and 'nav_value' in df.columns and result['written']:
+            self._after_nav_upsert(df)
+        return result
+    
+    def _upsert_chunks(self, table: str, rows, on_conflict: Optional[str] = None,
+                       batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """bulk_upsert 的分批写入部分，不修复收益率（供已计算好收益率的净值写入使用）"""
+        records = _json_records(rows)
+        batch_size = batch_size or self.page_size
+        params = {"on_conflict": on_conflict} if on_conflict else None
+        prefer = "resolution=merge-duplicates,return=minimal" if on_conflict else "return=minimal"
+        result = {'written': 0, 'failed': 0, 'errors': []}
+        
+        for start in range(0, len(records), batch_size):
+            chunk = records[start:start + batch_size]
+            try:
+                response = self._send("POST", table, chunk, params=params, headers={"Prefer": prefer})
+                if response.status_code in (200, 201, 204):
+                    result['written'] += len(chunk)
+                    continue
+                error = f"{response.status_code} - {response.text}"
+            except requests.exceptions.RequestException as e:
+                error = f"网络连接失败: {str(e)}"
+            result['failed'] += len(chunk)
+            result['errors'].append(f"{table} 第{start + 1}-{start + len(chunk)}条写入失败: {error}")
+        
+        for error in result['errors']:
+            _report_error(error)
+        return result
+    
+    def _after_nav_upsert(self, df: pd.DataFrame):
+        """bulk_upsert 直接写入净值后，修复受影响策略此后的收益率并同步内存面板
+        
+        没有 strategy_id / date 列（如按 id 更新）时无法确定范围，重新计算全部收益率。
+        """
+        if not {'strategy_id', 'date'}.issubset(df.columns):
+            self.recompute_return_rates()
+            if self.nav_panel is not None:
+                self.nav_panel.load(self._nav_panel_records())
+            return
+        
+        navs = normalize_nav_frame(df.dropna(subset=['strategy_id', 'date', 'nav_value']))
+        if navs.empty:
+            return
+        self.recompute_return_rates(strategy_ids=navs['strategy_id'].unique(), since=navs['date'].min())
+        if self.nav_panel is not None:
+            self.nav_panel.update_many(navs)
+    
     # 策略管理
     def add_strategy(self, name: str, description: str = "", start_date: Optional[str] = None, initial_nav: float = 1.000) -> bool:
         """添加新策略"""
@@ -85,9 +415,9 @@ class SupabaseManager:
         result = self._make_request("POST", "strategies", data)
         return not result.empty
     
-    def get_strategies(self) -> pd.DataFrame:
-        """获取所有策略"""
-        return self._make_request("GET", "strategies", params={"order": "created_at"})
+    def get_strategies(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """获取所有策略，columns 指定只读取的列（默认全部列）"""
+        return self._fetch_all("strategies", {"select": _select(columns), "order": "created_at"})
     
     def get_strategy_by_id(self, strategy_id: int) -> pd.DataFrame:
         """根据ID获取策略"""
@@ -103,8 +433,8 @@ class SupabaseManager:
         else:
             date = str(date)
             
-        # 计算收益率
-        last_nav = self.get_last_nav(strategy_id, date)
+        # 计算收益率（始终按数据库中的净值计算，不使用可能过期的内存面板）
+        last_nav = self._query_last_nav(strategy_id, date)
         return_rate = None
         if last_nav is not None:
             return_rate = (nav_value - last_nav) / last_nav * 100
@@ -118,10 +448,176 @@ class SupabaseManager:
         
         # 直接添加记录
         result = self._make_request("POST", "nav_records", data)
-        return not result.empty
+        if result.empty:
+            return False
+        
+        # 补录历史净值时修复下一条净值的收益率（REST 接口无法与上面的写入放在同一事务中）
+        next_record = self._query_next_nav_record(strategy_id, date)
+        if next_record is not None:
+            self._make_request(
+                "PATCH", "nav_records",
+                {"return_rate": float((next_record['nav_value'] - nav_value) / nav_value * 100)},
+                params={"id": f"eq.{next_record['id']}"}
+            )
+        
+        if self.nav_panel is not None:
+            self.nav_panel.update(strategy_id, date, nav_value)
+        return True
+    
+    def add_nav_records_bulk(self, df: pd.DataFrame) -> int:
+        """批量添加净值记录
+        
+        df 需包含 strategy_id, date, nav_value 三列。收益率按每个策略已存储的净值向量化计算，
+        紧跟在新记录之后的已有净值的收益率也会重新计算，所有记录按 bulk_upsert 的方式分批写入
+        （按 strategy_id,date 合并重复），结果与逐条调用 add_nav_record 相同。返回写入的新记录数。
+        """
+        batch = normalize_nav_frame(df)
+        if batch.empty:
+            return 0
+        
+        strategy_ids = batch['strategy_id'].unique()
+        lo, hi = batch['date'].min(), batch['date'].max()
+        
+        # 本批日期范围内的已有净值，与各策略在范围前后的相邻净值并发读取；已有净值覆盖了
+        # [lo, hi] 内的全部记录，再加上范围外的相邻净值，即包含每个策略自身日期范围前后的相邻净值
+        params = {
+            "select": "strategy_id,date,nav_value",
+            "strategy_id": f"in.({','.join(str(sid) for sid in strategy_ids)})",
+            "and": f"(date.gte.{lo},date.lte.{hi})"
+        }
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            in_range = executor.submit(self._fetch_rows, "nav_records", params)
+            neighbors = executor.submit(self._nav_neighbors, strategy_ids, lo, hi)
+            try:
+                frames = [in_range.result(), neighbors.result()]
+            except requests.exceptions.RequestException as e:
+                # 无法确定已有净值时不写入，避免写入错误的收益率
+                _report_error(f"读取已有净值失败: {str(e)}")
+                return 0
+        
+        frames = [frame for frame in frames if not frame.empty]
+        existing = pd.concat(frames or [pd.DataFrame()], ignore_index=True)
+        
+        records, repairs = compute_return_rates(batch, existing)
+        
+        result = self._upsert_chunks("nav_records", records, on_conflict="strategy_id,date")
+        # 修复紧跟在新记录之后的已有记录的收益率
+        if not repairs.empty:
+            self._upsert_chunks("nav_records", repairs, on_conflict="strategy_id,date")
+        
+        if self.nav_panel is not None:
+            if result['failed']:
+                # 部分批次失败时无法确定哪些记录已写入，直接重新加载面板
+                self.nav_panel.load(self._nav_panel_records())
+            else:
+                self.nav_panel.update_many(records)
+        return result['written']
+    
+    def _nav_neighbors(self, strategy_ids, before: str, after: Optional[str] = None) -> pd.DataFrame:
+        """各策略在 before 之前的最后一条净值，以及 after 不为 None 时 after 之后的第一条净值
+        
+        优先调用数据库函数 nav_record_neighbors（见 supabase_nav_neighbors.sql），一次请求取回全部策略的相邻净值；
+        函数不可用时用一次 in 查询读取日期范围外的净值，在本地按策略取首尾。
+        返回 strategy_id, date, nav_value, return_rate 四列，请求失败时抛出 requests.exceptions.RequestException。
+        """
+        strategy_ids = [int(sid) for sid in strategy_ids]
+        columns = ['strategy_id', 'date', 'nav_value', 'return_rate']
+        if not strategy_ids:
+            return pd.DataFrame(columns=columns)
+        
+        result = self._rpc("nav_record_neighbors", {
+            "p_strategy_ids": strategy_ids, "p_before": before, "p_after": after
+        })
+        if result is not None:
+            return _records_frame(result) if result else pd.DataFrame(columns=columns)
+        
+        params = {
+            "select": ",".join(columns),
+            "strategy_id": f"in.({','.join(str(sid) for sid in strategy_ids)})",
+            "order": "strategy_id.asc,date.asc"
+        }
+        if after is None:
+            params["date"] = f"lt.{before}"
+        else:
+            params["or"] = f"(date.lt.{before},date.gt.{after})"
+        navs = self._fetch_rows("nav_records", params)
+        if navs.empty:
+            return pd.DataFrame(columns=columns)
+        
+        neighbors = [navs[navs['date'] < before].groupby('strategy_id').tail(1)]
+        if after is not None:
+            neighbors.append(navs[navs['date'] > after].groupby('strategy_id').head(1))
+        return pd.concat(neighbors, ignore_index=True)[columns]
+    
+    def _query_next_nav_record(self, strategy_id: int, after_date: str) -> Optional[Dict]:
+        """从数据库查询指定日期后的第一条净值记录（id, nav_value）"""
+        params = {
+            "select": "id,nav_value",
+            "strategy_id": f"eq.{strategy_id}",
+            "date": f"gt.{after_date}",
+            "order": "date.asc",
+            "limit": 1
+        }
+        result = self._make_request("GET", "nav_records", params=params)
+        if result.empty:
+            return None
+        return {"id": int(result.iloc[0]['id']), "nav_value": float(result.iloc[0]['nav_value'])}
+    
+    def recompute_return_rates(self, strategy_id: Optional[int] = None, since: Optional[str] = None,
+                               strategy_ids: Optional[List[int]] = None) -> int:
+        """按已存储的净值重新计算收益率
+        
+        strategy_id 为 None 时处理全部策略（strategy_ids 为策略 id 列表时只处理这些策略）；
+        since 为 None 时处理全部历史，否则只修复该日期及之后的记录。
+        只写回与净值序列不一致的记录，返回更新的记录数。
+        """
+        if since is not None and hasattr(since, 'isoformat'):
+            since = since.isoformat()
+        
+        params = {"select": "strategy_id,date,nav_value,return_rate", "order": "strategy_id.asc,date.asc"}
+        filters = []
+        if strategy_id is not None:
+            filters.append(f"strategy_id.eq.{strategy_id}")
+        if strategy_ids is not None:
+            filters.append(f"strategy_id.in.({','.join(str(int(sid)) for sid in strategy_ids)})")
+        if since is not None:
+            filters.append(f"date.gte.{since}")
+        if filters:
+            params["and"] = f"({','.join(filters)})"
+        navs = self._fetch_all("nav_records", params)
+        if navs.empty:
+            return 0
+        
+        if since is not None:
+            # 每个策略在 since 之前的最后一条净值（一次请求），作为第一条的上期净值
+            try:
+                prior = self._nav_neighbors(navs['strategy_id'].unique(), since)
+            except requests.exceptions.RequestException as e:
+                _report_error(f"读取上期净值失败: {str(e)}")
+                return 0
+            if not prior.empty:
+                navs = pd.concat([navs, prior], ignore_index=True)
+        
+        stale = stale_return_rates(navs, since)
+        if stale.empty:
+            return 0
+        
+        records = stale.merge(
+            navs.assign(strategy_id=navs['strategy_id'].astype('int64'),
+                        date=pd.to_datetime(navs['date']).dt.strftime('%Y-%m-%d'))[['strategy_id', 'date', 'nav_value']],
+            on=['strategy_id', 'date']
+        )
+        return self._upsert_chunks("nav_records", records, on_conflict="strategy_id,date")['written']
     
     def get_last_nav(self, strategy_id: int, before_date: str) -> Optional[float]:
         """获取指定日期前的最后一个净值"""
+        panel = self._active_nav_panel()
+        if panel is not None:
+            return panel.nav_asof(strategy_id, before_date, inclusive=False)
+        return self._query_last_nav(strategy_id, before_date)
+    
+    def _query_last_nav(self, strategy_id: int, before_date: str) -> Optional[float]:
+        """从数据库查询指定日期前的最后一个净值"""
         params = {
             "strategy_id": f"eq.{strategy_id}",
             "date": f"lt.{before_date}",
@@ -134,13 +630,20 @@ class SupabaseManager:
             return float(result.iloc[0]['nav_value'])
         return None
     
-    def get_nav_records(self, strategy_id: Optional[int] = None, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
-        """获取净值记录"""
+    def get_nav_records(self, strategy_id: Optional[int] = None, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                        columns: Optional[List[str]] = None, strategy_ids: Optional[List[int]] = None) -> pd.DataFrame:
+        """获取净值记录（超过单页上限时自动分页读取）
+        
+        columns 指定只读取的列（可包含 strategy_name），默认为全部列加 strategy_name；
+        strategy_ids 为策略 id 列表时只读取这些策略的记录（in 过滤）。
+        """
         params = {"order": "date.asc"}
         
         filters = []
         if strategy_id:
             filters.append(f"strategy_id.eq.{strategy_id}")
+        if strategy_ids is not None:
+            filters.append(f"strategy_id.in.({','.join(str(int(sid)) for sid in strategy_ids)})")
         if start_date:
             filters.append(f"date.gte.{start_date}")
         if end_date:
@@ -150,16 +653,44 @@ class SupabaseManager:
             params["and"] = f"({','.join(filters)})"
         
         # 联表查询获取策略名称
-        params["select"] = "*, strategies(name)"
-        
-        result = self._make_request("GET", "nav_records", params=params)
+        params["select"] = _select(columns, STRATEGY_EMBEDS)
         
-        # 处理联表结果
-        if not result.empty and 'strategies' in result.columns:
-            result['strategy_name'] = result['strategies'].apply(lambda x: x['name'] if x else '')
-            result = result.drop('strategies', axis=1)
+        return self._fetch_all("nav_records", params)
+    
+    def get_latest_navs(self) -> pd.DataFrame:
+        """获取每个策略的最新净值（读取触发器维护的 strategy_latest_nav 汇总表，见 supabase_latest_nav.sql）"""
+        params = {
+            "select": _select(['strategy_id', 'strategy_name', 'date', 'nav_value', 'return_rate'], STRATEGY_EMBEDS),
+            "order": "strategy_id"
+        }
+        return self._make_request("GET", "strategy_latest_nav", params=params)
+    
+    # 内存净值面板
+    def enable_nav_panel(self, max_age: Optional[float] = None) -> NavPanel:
+        """启用内存净值面板
         
-        return result
+        启用后 get_last_nav / get_strategy_nav_at_date 等 as-of 查询直接读内存，不再发送HTTP请求；
+        经本实例写入的净值会增量更新到面板。其他客户端写入的数据在 max_age 秒后
+        面板于后台自动重新加载时生效（None 表示不自动重新加载）。
+        """
+        self.nav_panel_max_age = max_age
+        self.nav_panel = NavPanel(self._nav_panel_records())
+        return self.nav_panel
+    
+    def get_nav_panel(self) -> NavPanel:
+        """获取内存净值面板，未启用时先启用"""
+        return self._active_nav_panel() or self.enable_nav_panel()
+    
+    def _active_nav_panel(self) -> Optional[NavPanel]:
+        """返回已启用的面板，超过 max_age 时在后台重新加载（本次仍读取现有面板）"""
+        panel = self.nav_panel
+        if panel is not None:
+            # 后台线程中不能显示错误，失败时保留现有面板
+            panel.refresh_if_stale(lambda: self._fetch_rows("nav_records", NAV_PANEL_PARAMS), self.nav_panel_max_age)
+        return panel
+    
+    def _nav_panel_records(self) -> pd.DataFrame:
+        return self._fetch_all("nav_records", NAV_PANEL_PARAMS)
     
     # 投资人管理
     def add_investor(self, name: str, contact: str = "") -> bool:
@@ -168,9 +699,9 @@ class SupabaseManager:
         result = self._make_request("POST", "investors", data)
         return not result.empty
     
-    def get_investors(self) -> pd.DataFrame:
-        """获取所有投资人"""
-        return self._make_request("GET", "investors", params={"order": "name"})
+    def get_investors(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """获取所有投资人，columns 指定只读取的列（默认全部列）"""
+        return self._fetch_all("investors", {"select": _select(columns), "order": "name"})
     
     # 产品管理
     def add_product(self, name: str, description: str = "") -> bool:
@@ -179,9 +710,9 @@ class SupabaseManager:
         result = self._make_request("POST", "products", data)
         return not result.empty
     
-    def get_products(self) -> pd.DataFrame:
-        """获取所有产品"""
-        return self._make_request("GET", "products", params={"order": "name"})
+    def get_products(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """获取所有产品，columns 指定只读取的列（默认全部列）"""
+        return self._fetch_all("products", {"select": _select(columns), "order": "name"})
     
     def set_product_strategy_weight(self, product_id: int, strategy_id: int, weight: float, effective_date: Optional[str] = None) -> bool:
         """设置产品策略权重"""
@@ -214,6 +745,29 @@ class SupabaseManager:
         result = self._make_request("POST", "product_strategy_weights", data)
         return not result.empty
     
+    def set_product_strategy_weights_bulk(self, df: pd.DataFrame) -> int:
+        """批量设置产品策略权重
+        
+        df 需包含 product_id, strategy_id, weight, effective_date 四列。与 set_product_strategy_weight 相同，
+        先删除涉及的 (产品, 策略) 的旧权重配置（每个产品一次请求），再通过 bulk_upsert 写入。返回写入的记录数。
+        """
+        if df.empty:
+            return 0
+        weights = df[['product_id', 'strategy_id', 'weight', 'effective_date']].copy()
+        weights['product_id'] = weights['product_id'].astype('int64')
+        weights['strategy_id'] = weights['strategy_id'].astype('int64')
+        weights['weight'] = weights['weight'].astype('float64')
+        weights['effective_date'] = pd.to_datetime(weights['effective_date']).dt.strftime('%Y-%m-%d')
+        
+        for product_id, group in weights.groupby('product_id'):
+            strategy_ids = ",".join(str(sid) for sid in group['strategy_id'].unique())
+            self._make_request("DELETE", "product_strategy_weights", params={
+                "product_id": f"eq.{product_id}",
+                "strategy_id": f"in.({strategy_ids})"
+            })
+        
+        return self.bulk_upsert("product_strategy_weights", weights)['written']
+    
     def get_product_weights(self, product_id: int, date: Optional[str] = None) -> pd.DataFrame:
         """获取产品策略权重"""
         if date is None:
@@ -226,18 +780,13 @@ class SupabaseManager:
         params = {
             "product_id": f"eq.{product_id}",
             "effective_date": f"lte.{date}",
-            "select": "*, strategies(name)",
+            "select": _select(None, STRATEGY_EMBEDS),
             "order": "strategy_id,effective_date.desc"
         }
         
         result = self._make_request("GET", "product_strategy_weights", params=params)
         
         if not result.empty:
-            # 处理联表结果
-            if 'strategies' in result.columns:
-                result['strategy_name'] = result['strategies'].apply(lambda x: x['name'] if x else '')
-                result = result.drop('strategies', axis=1)
-            
             # 获取每个策略的最新权重
             latest_weights = result.groupby('strategy_id').first().reset_index()
             return latest_weights
@@ -277,10 +826,43 @@ class SupabaseManager:
         result = self._make_request("POST", "investments", data)
         return not result.empty
     
-    def get_investor_investments(self, investor_id: Optional[int] = None, product_id: Optional[int] = None) -> pd.DataFrame:
-        """获取投资记录"""
+    def add_investments_bulk(self, df: pd.DataFrame) -> int:
+        """批量添加投资记录
+        
+        df 需包含 investor_id, product_id, amount, investment_date 列，可选 type 列（默认 investment）。
+        投资时的产品净值按日期批量计算（每个日期一次 get_product_navs），份额 = 金额 / 净值，
+        与 add_investment 一致。通过 bulk_upsert 写入，返回写入的记录数。
+        """
+        if df.empty:
+            return 0
+        investments = df.copy()
+        if 'type' not in investments.columns:
+            investments['type'] = 'investment'
+        investments['investor_id'] = investments['investor_id'].astype('int64')
+        investments['product_id'] = investments['product_id'].astype('int64')
+        investments['amount'] = investments['amount'].astype('float64')
+        investments['investment_date'] = pd.to_datetime(investments['investment_date']).dt.strftime('%Y-%m-%d')
+        
+        navs = []
+        for investment_date, group in investments.groupby('investment_date', sort=False):
+            product_navs = self.get_product_navs(group['product_id'].unique(), investment_date)
+            navs.append(group['product_id'].map(product_navs))
+        nav_at_investment = pd.concat(navs).reindex(investments.index).astype('float64')
+        # 无法获取净值时按 1.0 计算
+        investments['nav_at_investment'] = nav_at_investment.where(nav_at_investment > 0, 1.0)
+        investments['shares'] = investments['amount'] / investments['nav_at_investment']
+        
+        columns = ['investor_id', 'product_id', 'investment_date', 'amount', 'shares', 'nav_at_investment', 'type']
+        return self.bulk_upsert("investments", investments[columns])['written']
+    
+    def get_investor_investments(self, investor_id: Optional[int] = None, product_id: Optional[int] = None,
+                                 columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """获取投资记录（超过单页上限时自动分页读取）
+        
+        columns 指定只读取的列（可包含 investor_name, product_name），默认为全部列加这两列。
+        """
         params = {
-            "select": "*, investors(name), products(name)",
+            "select": _select(columns, INVESTMENT_EMBEDS),
             "order": "investment_date.desc"
         }
         
@@ -293,18 +875,7 @@ class SupabaseManager:
         if filters:
             params["and"] = f"({','.join(filters)})"
         
-        result = self._make_request("GET", "investments", params=params)
-        
-        # 处理联表结果
-        if not result.empty:
-            if 'investors' in result.columns:
-                result['investor_name'] = result['investors'].apply(lambda x: x['name'] if x else '')
-                result = result.drop('investors', axis=1)
-            if 'products' in result.columns:
-                result['product_name'] = result['products'].apply(lambda x: x['name'] if x else '')
-                result = result.drop('products', axis=1)
-        
-        return result
+        return self._fetch_all("investments", params)
     
     def calculate_product_nav(self, product_id: int, date: Optional[str] = None) -> float:
         """计算产品净值"""
@@ -315,6 +886,11 @@ class SupabaseManager:
         else:
             date = str(date)
         
+        # 优先在数据库中一次算完
+        result = self._rpc("product_nav_at", {"p_product_id": int(product_id), "p_date": date})
+        if result is not None:
+            return float(result)
+        
         # 获取产品权重
         weights = self.get_product_weights(product_id, date)
         
@@ -337,8 +913,78 @@ class SupabaseManager:
         
         return total_nav / total_weight if total_weight > 0 else 1.0
     
+    def get_product_nav_series(self, product_id: int, start_date: Optional[str] = None, end_date: Optional[str] = None) -> pd.DataFrame:
+        """获取产品在日期区间内的净值序列
+        
+        优先调用数据库函数 product_nav_series；不可用时权重、区间内的策略净值和各策略开始日期之前的最后一条净值
+        （_nav_neighbors）各用一次请求读取，在本地按日期对齐计算，结果与逐日调用 calculate_product_nav 相同。
+        返回 date, nav_value 两列。
+        """
+        if end_date is None:
+            end_date = datetime.now().date().isoformat()
+        elif hasattr(end_date, 'isoformat'):
+            end_date = end_date.isoformat()
+        else:
+            end_date = str(end_date)
+        if start_date is not None:
+            start_date = start_date.isoformat() if hasattr(start_date, 'isoformat') else str(start_date)
+        
+        result = self._rpc("product_nav_series", {
+            "p_product_id": int(product_id), "p_start_date": start_date, "p_end_date": end_date
+        })
+        if result is not None:
+            series = pd.DataFrame(result, columns=['date', 'nav_value'])
+            series['nav_value'] = series['nav_value'].astype('float64')
+            return series
+        
+        params = {
+            "select": "id,strategy_id,weight,effective_date",
+            "product_id": f"eq.{product_id}",
+            "effective_date": f"lte.{end_date}"
+        }
+        weights = self._make_request("GET", "product_strategy_weights", params=params)
+        if weights.empty:
+            weights = pd.DataFrame(columns=['id', 'strategy_id', 'weight', 'effective_date'])
+        
+        strategy_ids = [int(sid) for sid in weights['strategy_id'].unique()]
+        frames = []
+        if strategy_ids:
+            date_filter = f"(date.gte.{start_date},date.lte.{end_date})" if start_date else f"(date.lte.{end_date})"
+            params = {
+                "select": "strategy_id,date,nav_value",
+                "strategy_id": f"in.({','.join(str(sid) for sid in strategy_ids)})",
+                "and": date_filter,
+                "order": "date.asc"
+            }
+            frames.append(self._fetch_all("nav_records", params))
+            
+            # 开始日期当天的 as-of 净值：当天的净值已在区间内，另取各策略之前的最后一条
+            if start_date:
+                try:
+                    prior = self._nav_neighbors(strategy_ids, start_date)
+                except requests.exceptions.RequestException as e:
+                    _report_error(f"读取开始日期净值失败: {str(e)}")
+                    prior = pd.DataFrame()
+                if not prior.empty:
+                    frames.append(prior[['strategy_id', 'date', 'nav_value']])
+        
+        frames = [frame for frame in frames if not frame.empty]
+        if frames:
+            navs = pd.concat(frames, ignore_index=True).drop_duplicates(subset=['strategy_id', 'date'])
+        else:
+            navs = pd.DataFrame(columns=['strategy_id', 'date', 'nav_value'])
+        
+        dates = navs['date']
+        if start_date:
+            dates = dates[pd.to_datetime(dates) >= pd.to_datetime(start_date)]
+        return compute_product_nav_series(weights, navs, dates)
+    
     def get_strategy_nav_at_date(self, strategy_id: int, date: str) -> Optional[float]:
         """获取策略在指定日期的净值"""
+        panel = self._active_nav_panel()
+        if panel is not None:
+            return panel.nav_asof(strategy_id, date)
+        
         params = {
             "strategy_id": f"eq.{strategy_id}",
             "date": f"lte.{date}",
@@ -353,7 +999,15 @@ class SupabaseManager:
     
     def get_investor_portfolio(self, investor_id: int) -> pd.DataFrame:
         """获取投资人持仓信息"""
-        # 由于Supabase的限制，我们需要在应用层进行聚合计算
+        result = self._rpc("investor_portfolios", {"p_investor_id": int(investor_id)})
+        if result is not None:
+            if not result:
+                return pd.DataFrame()
+            portfolio = _portfolio_frame(result)
+            return portfolio[['product_name', 'product_id', 'total_investment', 'total_shares', 'current_nav',
+                              'current_value', 'profit_loss', 'profit_rate', 'transaction_count']]
+        
+        # 数据库函数不可用时在应用层进行聚合计算
         investments = self.get_investor_investments(investor_id)
         
         if investments.empty:
@@ -391,3 +1045,107 @@ class SupabaseManager:
                 })
         
         return pd.DataFrame(portfolio_data)
+    
+    def get_product_navs(self, product_ids, date: Optional[str] = None) -> Dict[int, float]:
+        """批量计算多个产品在指定日期的净值，返回 {product_id: 净值}
+        
+        优先调用数据库函数 product_navs_at；不可用时所有产品的权重用一次请求读取，相关策略在该日期的净值
+        读内存净值面板（已启用时）或用 _nav_neighbors 一次取回。
+        """
+        if date is None:
+            date = datetime.now().date().isoformat()
+        elif hasattr(date, 'isoformat'):
+            date = date.isoformat()
+        else:
+            date = str(date)
+        
+        product_ids = [int(pid) for pid in product_ids]
+        if not product_ids:
+            return {}
+        
+        result = self._rpc("product_navs_at", {"p_product_ids": product_ids, "p_date": date})
+        if result is not None:
+            return {int(row['product_id']): float(row['nav_value']) for row in result}
+        
+        params = {
+            "select": "id,product_id,strategy_id,weight,effective_date",
+            "product_id": f"in.({','.join(str(pid) for pid in product_ids)})",
+            "effective_date": f"lte.{date}"
+        }
+        weights = self._make_request("GET", "product_strategy_weights", params=params)
+        if weights.empty:
+            return {pid: 1.0 for pid in product_ids}
+        
+        strategy_ids = [int(sid) for sid in weights['strategy_id'].unique()]
+        panel = self._active_nav_panel()
+        if panel is not None:
+            navs = [{"strategy_id": sid, "date": date, "nav_value": panel.nav_asof(sid, date)} for sid in strategy_ids]
+            navs = pd.DataFrame([nav for nav in navs if nav['nav_value'] is not None],
+                                columns=['strategy_id', 'date', 'nav_value'])
+        else:
+            # 当天及之前的最后一条净值，即次日之前的最后一条
+            next_day = (pd.Timestamp(date) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+            try:
+                navs = self._nav_neighbors(strategy_ids, next_day)[['strategy_id', 'date', 'nav_value']]
+            except requests.exceptions.RequestException as e:
+                _report_error(f"读取策略净值失败: {str(e)}")
+                navs = pd.DataFrame(columns=['strategy_id', 'date', 'nav_value'])
+        
+        product_navs = compute_product_navs_at(weights, navs, date)
+        return {pid: product_navs.get(pid, 1.0) for pid in product_ids}
+    
+    def get_all_portfolios(self, as_of: Optional[str] = None) -> pd.DataFrame:
+        """获取所有投资人的持仓信息
+        
+        数据库中已创建 investor_portfolios 函数时一次 RPC 完成；否则一次请求读取全部投资记录，
+        在本地按 (投资人, 产品) 向量化汇总，每个产品只估值一次。
+        as_of 为估值日期（默认今天），同时只统计该日期及之前的交易。
+        各列含义与 get_investor_portfolio 相同，另含 investor_id, investor_name。
+        """
+        if as_of is not None:
+            as_of = as_of.isoformat() if hasattr(as_of, 'isoformat') else str(as_of)
+        
+        result = self._rpc("investor_portfolios", {"p_investor_id": None, "p_as_of": as_of})
+        if result is not None:
+            return _portfolio_frame(result) if result else pd.DataFrame()
+        
+        params = {"select": _select(['investor_id', 'product_id', 'type', 'amount', 'shares',
+                                     'investor_name', 'product_name'], INVESTMENT_EMBEDS)}
+        if as_of is not None:
+            params["investment_date"] = f"lte.{as_of}"
+        
+        investments = self._fetch_all("investments", params)
+        if investments.empty:
+            return pd.DataFrame()
+        
+        is_investment = investments['type'] == 'investment'
+        is_redemption = investments['type'] == 'redemption'
+        investments['invested_amount'] = investments['amount'].where(is_investment, 0.0)
+        investments['redeemed_amount'] = investments['amount'].where(is_redemption, 0.0)
+        investments['invested_shares'] = investments['shares'].where(is_investment, 0.0)
+        investments['redeemed_shares'] = investments['shares'].where(is_redemption, 0.0)
+        
+        grouped = investments.groupby(['investor_id', 'product_id'], sort=False)
+        holdings = grouped.agg(
+            investor_name=('investor_name', 'first'),
+            product_name=('product_name', 'first'),
+            invested_amount=('invested_amount', 'sum'),
+            redeemed_amount=('redeemed_amount', 'sum'),
+            invested_shares=('invested_shares', 'sum'),
+            redeemed_shares=('redeemed_shares', 'sum'),
+            transaction_count=('type', 'size')
+        ).reset_index()
+        
+        # 与 get_investor_portfolio 相同：赎回金额和份额取绝对值后扣减
+        holdings['total_investment'] = holdings['invested_amount'] - holdings['redeemed_amount'].abs()
+        holdings['total_shares'] = holdings['invested_shares'] - holdings['redeemed_shares'].abs()
+        holdings = holdings[holdings['total_shares'] > 0]
+        if holdings.empty:
+            return pd.DataFrame()
+        
+        holdings = holdings.sort_values(['investor_name', 'investor_id', 'product_name'])
+        holdings = holdings[['investor_id', 'investor_name', 'product_name', 'product_id',
+                             'total_investment', 'total_shares', 'transaction_count']].reset_index(drop=True)
+        
+        product_navs = self.get_product_navs(holdings['product_id'].unique(), as_of)
+        return value_portfolios(holdings, product_navs)
@@ -35,19 +35,21 @@ class SupabaseManager:
             "Prefer": "return=representation"
         }
     
-    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> pd.DataFrame:
+    def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None,
+                      headers: Optional[Dict] = None) -> pd.DataFrame:
         """发送HTTP请求到Supabase"""
         url = f"{self.supabase_url}/rest/v1/{endpoint}"
+        headers = {**self.headers, **headers} if headers else self.headers
         
         try:
             if method == "GET":
-                response = requests.get(url, headers=self.headers, params=params)
+                response = requests.get(url, headers=headers, params=params)
             elif method == "POST":
-                response = requests.post(url, headers=self.headers, json=data)
+                response = requests.post(url, headers=headers, json=data, params=params)
             elif method == "PATCH":
-                response = requests.patch(url, headers=self.headers, json=data, params=params)
+                response = requests.patch(url, headers=headers, json=data, params=params)
             elif method == "DELETE":
-                response = requests.delete(url, headers=self.headers, params=params)
+                response = requests.delete(url, headers=headers, params=params)
             
             if response.status_code in [200, 201]:
                 result = response.json()
@@ -117,7 +119,8 @@ class SupabaseManager:
         # 使用upsert避免重复数据
         endpoint = "nav_records"
         params = {"on_conflict": "strategy_id,date"}
-        result = self._make_request("POST", endpoint, data)
+        headers = {"Prefer": "resolution=merge-duplicates,return=representation"}
+        result = self._make_request("POST", endpoint, data, params=params, headers=headers)
         return not result.empty
     
     def get_last_nav(self, strategy_id: int, before_date: str) -> Optional[float]:
@@ -0,0 +1,64 @@
+-- 策略最新净值汇总表
+-- 由 nav_records 上的触发器维护，首页读取最新净值时无需扫描全部历史
+-- 在Supabase的SQL Editor中运行一次即可（可重复执行）
+
+CREATE TABLE IF NOT EXISTS strategy_latest_nav (
+    strategy_id INTEGER PRIMARY KEY REFERENCES strategies(id) ON DELETE CASCADE,
+    date DATE NOT NULL,
+    nav_value DECIMAL(10,4) NOT NULL,
+    return_rate DECIMAL(8,4)
+);
+
+ALTER TABLE strategy_latest_nav DISABLE ROW LEVEL SECURITY;
+
+-- 按策略重新取最新一条净值
+CREATE OR REPLACE FUNCTION refresh_strategy_latest_nav(p_strategy_id INTEGER)
+RETURNS void AS $$
+BEGIN
+    DELETE FROM strategy_latest_nav WHERE strategy_id = p_strategy_id;
+    INSERT INTO strategy_latest_nav (strategy_id, date, nav_value, return_rate)
+    SELECT strategy_id, date, nav_value, return_rate
+    FROM nav_records
+    WHERE strategy_id = p_strategy_id
+    ORDER BY date DESC
+    LIMIT 1;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE OR REPLACE FUNCTION trg_nav_records_latest()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        -- 新增净值：日期不早于当前最新净值时替换
+        INSERT INTO strategy_latest_nav (strategy_id, date, nav_value, return_rate)
+        VALUES (NEW.strategy_id, NEW.date, NEW.nav_value, NEW.return_rate)
+        ON CONFLICT (strategy_id) DO UPDATE SET
+            date = EXCLUDED.date,
+            nav_value = EXCLUDED.nav_value,
+            return_rate = EXCLUDED.return_rate
+        WHERE EXCLUDED.date >= strategy_latest_nav.date;
+    ELSE
+        -- 修改（包括upsert合并）或删除净值：按策略重新计算
+        IF TG_OP = 'UPDATE' AND NEW.strategy_id IS DISTINCT FROM OLD.strategy_id THEN
+            PERFORM refresh_strategy_latest_nav(NEW.strategy_id);
+        END IF;
+        PERFORM refresh_strategy_latest_nav(OLD.strategy_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS nav_records_latest ON nav_records;
+CREATE TRIGGER nav_records_latest
+AFTER INSERT OR UPDATE OR DELETE ON nav_records
+FOR EACH ROW EXECUTE FUNCTION trg_nav_records_latest();
+
+-- 用已有数据初始化
+INSERT INTO strategy_latest_nav (strategy_id, date, nav_value, return_rate)
+SELECT DISTINCT ON (strategy_id) strategy_id, date, nav_value, return_rate
+FROM nav_records
+ORDER BY strategy_id, date DESC
+ON CONFLICT (strategy_id) DO UPDATE SET
+    date = EXCLUDED.date,
+    nav_value = EXCLUDED.nav_value,
+    return_rate = EXCLUDED.return_rate;
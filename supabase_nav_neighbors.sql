@@ -0,0 +1,31 @@
+-- 批量写入净值时的相邻净值查询
+-- 通过 PostgREST 以 /rest/v1/rpc/nav_record_neighbors 调用，一次请求取回多个策略的相邻净值，
+-- 代替每个策略各发一次 limit=1 的查询（批量录入净值、重新计算收益率时使用）
+-- 在Supabase的SQL Editor中运行一次即可（可重复执行）
+
+-- 每个策略在 p_before 之前的最后一条净值，以及 p_after 不为空时 p_after 之后的第一条净值
+CREATE OR REPLACE FUNCTION nav_record_neighbors(
+    p_strategy_ids INTEGER[],
+    p_before DATE,
+    p_after DATE DEFAULT NULL
+)
+RETURNS TABLE (strategy_id INTEGER, date DATE, nav_value DECIMAL(10,3), return_rate DECIMAL(8,4)) AS $$
+    SELECT n.strategy_id, n.date, n.nav_value, n.return_rate
+    FROM unnest(p_strategy_ids) AS s(id)
+    CROSS JOIN LATERAL (
+        (
+            SELECT nr.strategy_id, nr.date, nr.nav_value, nr.return_rate FROM nav_records nr
+            WHERE nr.strategy_id = s.id AND nr.date < p_before
+            ORDER BY nr.date DESC
+            LIMIT 1
+        )
+        UNION ALL
+        (
+            SELECT nr.strategy_id, nr.date, nr.nav_value, nr.return_rate FROM nav_records nr
+            WHERE nr.strategy_id = s.id AND p_after IS NOT NULL AND nr.date > p_after
+            ORDER BY nr.date
+            LIMIT 1
+        )
+    ) n
+    ORDER BY n.strategy_id, n.date;
+$$ LANGUAGE sql STABLE;
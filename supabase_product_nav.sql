@@ -0,0 +1,123 @@
+-- 产品净值与持仓估值函数
+-- 通过 PostgREST 以 /rest/v1/rpc/<函数名> 调用，一次请求完成原本需要逐条查询权重和净值的计算
+-- 计算规则与 nav_engine.py 一致：
+--   每个策略取生效日期不晚于估值日的最新权重（同一生效日期取 id 最大的一条），
+--   以及日期不晚于估值日的最新净值，对有净值的策略按权重加权平均；没有可用权重或净值时为 1.0
+-- 在Supabase的SQL Editor中运行一次即可（可重复执行）
+
+-- 多个产品在同一日期的净值
+CREATE OR REPLACE FUNCTION product_navs_at(p_product_ids INTEGER[], p_date DATE DEFAULT CURRENT_DATE)
+RETURNS TABLE (product_id INTEGER, nav_value NUMERIC) AS $$
+    WITH latest_weights AS (
+        SELECT DISTINCT ON (w.product_id, w.strategy_id) w.product_id, w.strategy_id, w.weight
+        FROM product_strategy_weights w
+        WHERE w.product_id = ANY(p_product_ids) AND w.effective_date <= p_date
+        ORDER BY w.product_id, w.strategy_id, w.effective_date DESC, w.id DESC
+    ),
+    totals AS (
+        SELECT lw.product_id,
+               SUM(lw.weight) AS total_weight,
+               SUM(lw.weight * nav.nav_value) AS total_nav
+        FROM latest_weights lw
+        CROSS JOIN LATERAL (
+            SELECT nr.nav_value FROM nav_records nr
+            WHERE nr.strategy_id = lw.strategy_id AND nr.date <= p_date
+            ORDER BY nr.date DESC
+            LIMIT 1
+        ) nav
+        GROUP BY lw.product_id
+    )
+    SELECT p.id,
+           CASE WHEN t.total_weight > 0 THEN t.total_nav / t.total_weight ELSE 1.0 END
+    FROM unnest(p_product_ids) AS p(id)
+    LEFT JOIN totals t ON t.product_id = p.id;
+$$ LANGUAGE sql STABLE;
+
+-- 单个产品在指定日期的净值
+CREATE OR REPLACE FUNCTION product_nav_at(p_product_id INTEGER, p_date DATE DEFAULT CURRENT_DATE)
+RETURNS NUMERIC AS $$
+    SELECT n.nav_value FROM product_navs_at(ARRAY[p_product_id], p_date) n;
+$$ LANGUAGE sql STABLE;
+
+-- 产品在日期区间内的净值序列，日期取相关策略在区间内的全部净值日期
+CREATE OR REPLACE FUNCTION product_nav_series(
+    p_product_id INTEGER,
+    p_start_date DATE DEFAULT NULL,
+    p_end_date DATE DEFAULT CURRENT_DATE
+)
+RETURNS TABLE (date DATE, nav_value NUMERIC) AS $$
+    WITH product_strategies AS (
+        SELECT DISTINCT w.strategy_id
+        FROM product_strategy_weights w
+        WHERE w.product_id = p_product_id AND w.effective_date <= p_end_date
+    ),
+    nav_dates AS (
+        SELECT DISTINCT nr.date AS nav_date
+        FROM nav_records nr
+        JOIN product_strategies ps ON ps.strategy_id = nr.strategy_id
+        WHERE nr.date <= p_end_date
+          AND (p_start_date IS NULL OR nr.date >= p_start_date)
+    )
+    SELECT d.nav_date, n.nav_value
+    FROM nav_dates d
+    CROSS JOIN LATERAL product_navs_at(ARRAY[p_product_id], d.nav_date) n
+    ORDER BY d.nav_date;
+$$ LANGUAGE sql STABLE;
+
+-- 投资人持仓估值
+-- p_investor_id 为 NULL 时返回全部投资人；p_as_of 为 NULL 时统计全部交易并按当天净值估值，
+-- 否则只统计该日期及之前的交易并按该日期的净值估值。赎回金额和份额取绝对值后扣减
+CREATE OR REPLACE FUNCTION investor_portfolios(p_investor_id INTEGER DEFAULT NULL, p_as_of DATE DEFAULT NULL)
+RETURNS TABLE (
+    investor_id INTEGER,
+    investor_name VARCHAR,
+    product_id INTEGER,
+    product_name VARCHAR,
+    total_investment NUMERIC,
+    total_shares NUMERIC,
+    transaction_count BIGINT,
+    current_nav NUMERIC,
+    current_value NUMERIC,
+    profit_loss NUMERIC,
+    profit_rate NUMERIC
+) AS $$
+    WITH holdings AS (
+        SELECT i.investor_id,
+               i.product_id,
+               COALESCE(SUM(i.amount) FILTER (WHERE i.type = 'investment'), 0)
+                   - ABS(COALESCE(SUM(i.amount) FILTER (WHERE i.type = 'redemption'), 0)) AS total_investment,
+               COALESCE(SUM(i.shares) FILTER (WHERE i.type = 'investment'), 0)
+                   - ABS(COALESCE(SUM(i.shares) FILTER (WHERE i.type = 'redemption'), 0)) AS total_shares,
+               COUNT(*) AS transaction_count
+        FROM investments i
+        WHERE (p_investor_id IS NULL OR i.investor_id = p_investor_id)
+          AND (p_as_of IS NULL OR i.investment_date <= p_as_of)
+        GROUP BY i.investor_id, i.product_id
+    ),
+    open_holdings AS (
+        SELECT * FROM holdings h WHERE h.total_shares > 0
+    ),
+    navs AS (
+        SELECT n.product_id, n.nav_value
+        FROM product_navs_at(
+            (SELECT array_agg(DISTINCT oh.product_id) FROM open_holdings oh),
+            COALESCE(p_as_of, CURRENT_DATE)
+        ) n
+    ),
+    valued AS (
+        SELECT oh.*, n.nav_value AS current_nav, oh.total_shares * n.nav_value AS current_value
+        FROM open_holdings oh
+        JOIN navs n ON n.product_id = oh.product_id
+    )
+    SELECT v.investor_id, inv.name, v.product_id, p.name,
+           v.total_investment, v.total_shares, v.transaction_count,
+           v.current_nav, v.current_value,
+           v.current_value - v.total_investment,
+           CASE WHEN v.total_investment > 0
+                THEN (v.current_value - v.total_investment) / v.total_investment * 100
+                ELSE 0 END
+    FROM valued v
+    LEFT JOIN investors inv ON inv.id = v.investor_id
+    LEFT JOIN products p ON p.id = v.product_id
+    ORDER BY inv.name, v.investor_id, p.name;
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,71 @@
+-- 云端数据库基础表结构（与 云端部署完整指南.md 第二步相同）
+-- 可在Supabase的SQL Editor中运行，也用于 docker-compose.postgrest.yml 初始化本地数据库（可重复执行）
+
+-- 策略表
+CREATE TABLE IF NOT EXISTS strategies (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL UNIQUE,
+    description TEXT,
+    start_date DATE,
+    initial_nav DECIMAL(10,3) DEFAULT 1.000,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 净值记录表
+CREATE TABLE IF NOT EXISTS nav_records (
+    id SERIAL PRIMARY KEY,
+    strategy_id INTEGER REFERENCES strategies(id),
+    date DATE NOT NULL,
+    nav_value DECIMAL(10,3) NOT NULL,
+    return_rate DECIMAL(8,4),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(strategy_id, date)
+);
+
+-- 投资人表
+CREATE TABLE IF NOT EXISTS investors (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    contact VARCHAR(255),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 产品表
+CREATE TABLE IF NOT EXISTS products (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL UNIQUE,
+    description TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 产品策略权重表
+CREATE TABLE IF NOT EXISTS product_strategy_weights (
+    id SERIAL PRIMARY KEY,
+    product_id INTEGER REFERENCES products(id),
+    strategy_id INTEGER REFERENCES strategies(id),
+    weight DECIMAL(5,4) NOT NULL,
+    effective_date DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 投资记录表
+CREATE TABLE IF NOT EXISTS investments (
+    id SERIAL PRIMARY KEY,
+    investor_id INTEGER REFERENCES investors(id),
+    product_id INTEGER REFERENCES products(id),
+    investment_date DATE NOT NULL,
+    amount DECIMAL(15,2) NOT NULL,
+    shares DECIMAL(15,6),
+    nav_at_investment DECIMAL(10,3),
+    type VARCHAR(20) CHECK(type IN ('investment', 'redemption')),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 创建索引
+CREATE INDEX IF NOT EXISTS idx_nav_records_date ON nav_records(date);
+CREATE INDEX IF NOT EXISTS idx_nav_records_strategy ON nav_records(strategy_id);
+CREATE INDEX IF NOT EXISTS idx_investments_investor ON investments(investor_id);
+CREATE INDEX IF NOT EXISTS idx_investments_product ON investments(product_id);
+CREATE INDEX IF NOT EXISTS idx_investments_investor_date ON investments(investor_id, investment_date);
+CREATE INDEX IF NOT EXISTS idx_investments_product_date ON investments(product_id, investment_date);
+CREATE INDEX IF NOT EXISTS idx_psw_product_date ON product_strategy_weights(product_id, effective_date);
@@ -0,0 +1,8 @@
+-- 离线优先模式（HybridDatabaseManager）推送本地新记录用的幂等键
+-- 没有唯一约束的表（投资人、产品权重、投资记录）由客户端为每条新记录生成 UUID，
+-- 推送时按 on_conflict=sync_key 合并：响应丢失后重试推送不会重复插入，并按该列对应云端分配的 id
+-- 在Supabase的SQL Editor中运行一次即可（可重复执行）
+
+ALTER TABLE investors ADD COLUMN IF NOT EXISTS sync_key UUID UNIQUE;
+ALTER TABLE product_strategy_weights ADD COLUMN IF NOT EXISTS sync_key UUID UNIQUE;
+ALTER TABLE investments ADD COLUMN IF NOT EXISTS sync_key UUID UNIQUE;
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+测试公共配置：把项目根目录加入导入路径，提供基于 mock_postgrest 的 Supabase 测试服务
+"""
+
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import DatabaseManager
+from mock_postgrest import MockPostgREST
+from supabase_database import SupabaseManager
+
+# 测试不在 streamlit 中运行，屏蔽 st.error 等调用的上下文警告
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    db = DatabaseManager(str(tmp_path / "fund.db"))
+    yield db
+    db.close()
+
+@pytest.fixture(params=["rpc", "no_rpc"])
+def supabase_db(request, tmp_path):
+    """连接 PostgREST 模拟服务的 SupabaseManager，分别在数据库函数可用和不可用时运行"""
+    mock = MockPostgREST(str(tmp_path / "mock.db"), rpc=None if request.param == "rpc" else {})
+    mock.start()
+    db = SupabaseManager(mock.url, "anon")
+    db.mock = mock
+    yield db
+    db.close()
+    mock.stop()
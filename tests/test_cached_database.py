@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+读取缓存的写入失效：经缓存层写入后，所有读取的结果都与直接读取数据库一致
+"""
+
+import pandas as pd
+import pytest
+
+from cached_database import CachedDatabaseManager, READ_DEPENDENCIES
+
+# 读取方法及参数（覆盖 READ_DEPENDENCIES 中的全部方法）
+READS = {
+    'get_strategies': ((), {}),
+    'get_strategy_by_id': ((1,), {}),
+    'get_investors': ((), {}),
+    'get_products': ((), {}),
+    'get_table_counts': ((), {}),
+    'get_nav_records': ((), {}),
+    'get_latest_navs': ((), {}),
+    'get_last_nav': ((1, "2024-01-09"), {}),
+    'get_strategy_nav_at_date': ((1, "2024-01-09"), {}),
+    'get_product_weights': ((1,), {}),
+    'calculate_product_nav': ((1, "2024-01-09"), {}),
+    'get_product_navs': (([1],), {'date': "2024-01-09"}),
+    'get_product_nav_series': ((1,), {}),
+    'get_investor_investments': ((), {}),
+    'get_investor_portfolio': ((1,), {}),
+    'get_all_portfolios': ((), {}),
+}
+
+# 写入方法及参数：净值、产品权重、投资记录各自的单条和批量写入
+WRITES = {
+    'add_nav_record': lambda db: db.add_nav_record(1, "2024-01-08", 1.30),
+    'add_nav_records_bulk': lambda db: db.add_nav_records_bulk(pd.DataFrame({
+        'strategy_id': [1, 2], 'date': ["2024-01-05", "2024-01-09"], 'nav_value': [0.95, 2.20]})),
+    'bulk_upsert_nav_records': lambda db: db.bulk_upsert("nav_records", pd.DataFrame({
+        'strategy_id': [1], 'date': ["2024-01-06"], 'nav_value': [1.08]}), on_conflict="strategy_id,date"),
+    'set_product_strategy_weight': lambda db: db.set_product_strategy_weight(1, 2, 0.5, "2024-01-03"),
+    'set_product_strategy_weights_bulk': lambda db: db.set_product_strategy_weights_bulk(pd.DataFrame({
+        'product_id': [1, 1], 'strategy_id': [1, 2], 'weight': [0.2, 0.8], 'effective_date': ["2024-01-05"] * 2})),
+    'add_investment': lambda db: db.add_investment(1, 1, 50000, "2024-01-09"),
+    'add_investments_bulk': lambda db: db.add_investments_bulk(pd.DataFrame({
+        'investor_id': [1, 1], 'product_id': [1, 1], 'amount': [20000.0, 30000.0],
+        'investment_date': ["2024-01-04", "2024-01-10"]})),
+}
+
+def _seed(db):
+    db.add_strategy("策略A", start_date="2024-01-01")
+    db.add_strategy("策略B", start_date="2024-01-01")
+    for nav_date, nav_a, nav_b in (("2024-01-02", 1.00, 2.00), ("2024-01-04", 1.05, 2.10),
+                                   ("2024-01-10", 1.10, 2.05)):
+        db.add_nav_record(1, nav_date, nav_a)
+        db.add_nav_record(2, nav_date, nav_b)
+    db.add_investor("张三")
+    db.add_product("产品甲")
+    db.set_product_strategy_weight(1, 1, 1.0, "2024-01-02")
+    db.add_investment(1, 1, 100000, "2024-01-03")
+
+def _read(db, name):
+    args, kwargs = READS[name]
+    return getattr(db, name)(*args, **kwargs)
+
+def _assert_same(cached, direct, name):
+    if isinstance(direct, pd.DataFrame):
+        pd.testing.assert_frame_equal(cached, direct, obj=name)
+    else:
+        assert cached == direct, name
+
+def test_reads_cover_every_cached_method():
+    assert set(READS) == set(READ_DEPENDENCIES)
+
+@pytest.mark.parametrize("write", list(WRITES))
+def test_write_invalidates_every_dependent_read(sqlite_db, write):
+    _seed(sqlite_db)
+    cached = CachedDatabaseManager(sqlite_db)
+    before = {name: _read(cached, name) for name in READS}
+    assert cached.cache_stats()['size'] == len(READS)
+
+    WRITES[write](cached)
+
+    # 结果变化的读取必须失效（缓存结果与直接读取一致），结果不变的读取可以继续命中缓存
+    changed = []
+    for name in READS:
+        direct = _read(sqlite_db, name)
+        _assert_same(_read(cached, name), direct, name)
+        try:
+            _assert_same(before[name], direct, name)
+        except AssertionError:
+            changed.append(name)
+    # 写入确实改变了依赖该表的读取结果，上面的比较不是空操作
+    assert changed
+
+def test_write_drops_stale_entries_and_keeps_unrelated_ones(sqlite_db):
+    _seed(sqlite_db)
+    cached = CachedDatabaseManager(sqlite_db)
+    for name in READS:
+        _read(cached, name)
+
+    cached.add_investment(1, 1, 50000, "2024-01-09")
+
+    stale = {name for name, tables in READ_DEPENDENCIES.items() if 'investments' in tables}
+    assert cached.cache_stats()['size'] == len(READS) - len(stale)
+    hits = cached.cache_stats()['hits']
+    _read(cached, 'get_strategies')
+    _read(cached, 'get_product_weights')
+    assert cached.cache_stats()['hits'] == hits + 2
+
+def test_lru_evicts_least_recently_used(sqlite_db):
+    _seed(sqlite_db)
+    cached = CachedDatabaseManager(sqlite_db, maxsize=2)
+    cached.get_strategies()
+    cached.get_investors()
+    cached.get_strategies()
+    cached.get_products()
+
+    stats = cached.cache_stats()
+    assert (stats['size'], stats['evictions']) == (2, 1)
+    cached.get_strategies()
+    assert cached.cache_stats()['hits'] == 2
+    cached.get_investors()
+    assert cached.cache_stats()['misses'] == 4
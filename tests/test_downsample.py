@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+图表降采样与 WebGL 切换
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from downsample import MAX_POINTS, WEBGL_THRESHOLD, downsample, line_trace
+
+def _curve(points, seed=3):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2000-01-03", periods=points)
+    return dates, np.cumprod(1 + rng.normal(0.0003, 0.01, points))
+
+def test_long_curve_is_downsampled_and_drawn_with_webgl():
+    x, y = _curve(20000)
+
+    trace = line_trace(x, y, "净值", mode='lines+markers', marker=dict(size=4))
+
+    assert isinstance(trace, go.Scattergl)
+    assert len(trace.y) <= MAX_POINTS + 4
+    assert trace.mode == 'lines'
+
+def test_short_curve_stays_svg_with_markers():
+    x, y = _curve(WEBGL_THRESHOLD)
+
+    trace = line_trace(x, y, "净值", mode='lines+markers', marker=dict(size=4))
+
+    assert isinstance(trace, go.Scatter)
+    assert len(trace.y) == WEBGL_THRESHOLD
+    assert trace.mode == 'lines+markers'
+
+def test_dropping_only_nans_keeps_markers():
+    x, y = _curve(200)
+    y[::10] = np.nan
+
+    trace = line_trace(x, y, "净值", mode='lines+markers', marker=dict(size=4))
+
+    assert isinstance(trace, go.Scatter)
+    assert len(trace.y) == 180
+    assert trace.mode == 'lines+markers'
+    assert trace.marker.size == 4
+
+def test_downsample_keeps_extremes():
+    x, y = _curve(20000)
+
+    _, sampled = downsample(x, y)
+
+    assert sampled.max() == y.max() and sampled.min() == y.min()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+离线优先混合数据库的推送幂等性、后台首次同步和云端缺少 sync_key 列时的处理
+"""
+
+import time
+
+import pytest
+import requests
+
+from database import DatabaseManager
+from hybrid_database import SYNC_KEY, HybridDatabaseManager
+from mock_postgrest import MockPostgREST
+from supabase_database import SupabaseManager
+
+@pytest.fixture
+def mock(tmp_path):
+    server = MockPostgREST(str(tmp_path / "mock.db"))
+    server.start()
+    yield server
+    server.stop()
+
+def _hybrid(mock, tmp_path, **kwargs):
+    return HybridDatabaseManager(SupabaseManager(mock.url, "anon"), str(tmp_path / "replica.db"), **kwargs)
+
+def _remote(mock, table):
+    return mock.conn.execute(f"SELECT * FROM {table} ORDER BY id").fetchall()
+
+def test_retry_after_lost_response_does_not_duplicate(mock, tmp_path):
+    db = _hybrid(mock, tmp_path, start=False)
+    db.add_investor("张三", "13800000000")
+    db.add_investor("李四")
+    db.add_product("产品甲")
+
+    # 第一次推送投资人时云端已写入，但响应在返回途中丢失
+    send = db.remote._send
+    lost = []
+
+    def flaky_send(method, table, *args, **kwargs):
+        response = send(method, table, *args, **kwargs)
+        if method == "POST" and table == "investors" and not lost:
+            lost.append(response)
+            raise requests.exceptions.ConnectionError("响应丢失")
+        return response
+
+    db.remote._send = flaky_send
+    assert db.sync() is False
+    assert db.sync_status()['pending'] == 3
+    assert len(_remote(mock, "investors")) == 2
+
+    # 期间拉取到的云端记录不会与待推送的本地记录重复
+    db.pull()
+    assert db.sync() is True
+    investors = db.get_investors()
+    assert len(_remote(mock, "investors")) == 2
+    assert sorted(investors['name']) == ["张三", "李四"]
+    assert set(investors['id']) == {row[0] for row in _remote(mock, "investors")}
+
+    # 子表引用的是替换后的云端 id
+    investor_id = int(investors.loc[investors['name'] == "张三", 'id'].iloc[0])
+    product_id = int(db.get_products()['id'].iloc[0])
+    db.add_investment(investor_id, product_id, 100000, "2024-01-02")
+    assert db.sync() is True
+    assert [(row['investor_id'], row['product_id']) for row in _remote(mock, "investments")] == [(investor_id, product_id)]
+    status = db.sync_status()
+    assert (status['pending'], status['conflicts']) == (0, 0)
+    db.close()
+
+def test_first_sync_runs_in_background(tmp_path):
+    server = MockPostgREST(str(tmp_path / "mock.db"), latency=0.2)
+    server.conn.execute("INSERT INTO strategies (name) VALUES ('策略A')")
+    server.start()
+    try:
+        started = time.time()
+        db = _hybrid(server, tmp_path)
+        # 构造时不等待首次全量拉取（每个请求 0.2 秒）
+        assert time.time() - started < 0.2
+        assert db.sync_status()['online'] is None
+
+        deadline = time.time() + 20
+        while db.sync_status()['online'] is None and time.time() < deadline:
+            time.sleep(0.05)
+        assert db.sync_status()['online'] is True
+        assert list(db.get_strategies()['name']) == ["策略A"]
+        db.close()
+    finally:
+        server.stop()
+
+def test_sync_key_only_in_replica(mock, tmp_path):
+    plain = DatabaseManager(str(tmp_path / "plain.db"))
+    plain.add_investor("张三")
+    assert SYNC_KEY not in plain.get_investors().columns
+    plain.close()
+
+    db = _hybrid(mock, tmp_path, start=False)
+    assert SYNC_KEY in db._table_columns("investors")
+    db.close()
+
+def test_missing_remote_sync_key_is_reported(tmp_path):
+    server = MockPostgREST(str(tmp_path / "mock.db"), sync_keys=False)
+    server.conn.execute("INSERT INTO strategies (name) VALUES ('策略A')")
+    server.start()
+    try:
+        db = _hybrid(server, tmp_path, start=False)
+        db.add_investor("张三")
+        db.add_product("产品甲")
+
+        # 投资人留在 outbox 中（不记为冲突），其他表照常推送和拉取
+        assert db.sync(full=True) is True
+        status = db.sync_status()
+        assert (status['pending'], status['conflicts']) == (1, 0)
+        assert "investors" in status['schema_error'] and "supabase_sync_keys.sql" in status['schema_error']
+        assert [row['name'] for row in _remote(server, "products")] == ["产品甲"]
+        assert list(db.get_strategies()['name']) == ["策略A"]
+        assert list(db.get_investors()['name']) == ["张三"]
+
+        # 执行 supabase_sync_keys.sql 后自动补推
+        server.conn.execute(f"ALTER TABLE investors ADD COLUMN {SYNC_KEY} TEXT")
+        server.conn.execute(f"CREATE UNIQUE INDEX idx_investors_sync_key ON investors({SYNC_KEY})")
+        server._columns.clear()
+        assert db.sync() is True
+        status = db.sync_status()
+        assert (status['pending'], status['schema_error']) == (0, None)
+        assert [row['name'] for row in _remote(server, "investors")] == ["张三"]
+        db.close()
+    finally:
+        server.stop()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+批量写入净值（add_nav_records_bulk）与逐条写入（add_nav_record）的结果一致性
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from database import DatabaseManager
+
+STRATEGIES = ["策略A", "策略B", "策略C"]
+
+def _stored():
+    """写入批量数据前已存储的净值（策略C没有历史净值）"""
+    dates = pd.bdate_range("2024-01-01", periods=20).strftime('%Y-%m-%d')
+    rows = []
+    for sid, base in ((1, 1.0), (2, 2.0)):
+        for i, nav_date in enumerate(dates[::2]):
+            rows.append({'strategy_id': sid, 'date': nav_date, 'nav_value': round(base + 0.01 * i, 4)})
+    return pd.DataFrame(rows)
+
+def _batch(overlap):
+    """打乱顺序的批量数据：补录已存储日期之间的净值、追加新日期，overlap 为 True 时还覆盖部分已存储日期"""
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range("2023-12-25", periods=30).strftime('%Y-%m-%d')
+    stored = set(_stored()['date'])
+    rows = []
+    for sid in (1, 2, 3):
+        for nav_date in dates:
+            if nav_date in stored and not overlap:
+                continue
+            if rng.random() < 0.6:
+                rows.append({'strategy_id': sid, 'date': nav_date, 'nav_value': round(rng.uniform(0.8, 2.5), 4)})
+    batch = pd.DataFrame(rows)
+    return batch.sample(frac=1, random_state=3).reset_index(drop=True)
+
+def _setup(db):
+    for name in STRATEGIES:
+        db.add_strategy(name, start_date="2023-12-01")
+    for row in _stored().itertuples(index=False):
+        db.add_nav_record(row.strategy_id, row.date, row.nav_value)
+
+def _navs(db):
+    navs = db.get_nav_records(columns=['strategy_id', 'date', 'nav_value', 'return_rate'])
+    navs = navs.sort_values(['strategy_id', 'date']).reset_index(drop=True)
+    navs['strategy_id'] = navs['strategy_id'].astype('int64')
+    navs['return_rate'] = navs['return_rate'].astype('float64')
+    return navs
+
+def _row_by_row(tmp_path, batch):
+    """逐条写入的结果，作为对照"""
+    db = DatabaseManager(str(tmp_path / "row_by_row.db"))
+    _setup(db)
+    for row in batch.itertuples(index=False):
+        db.add_nav_record(row.strategy_id, row.date, row.nav_value)
+    navs = _navs(db)
+    db.close()
+    return navs
+
+@pytest.mark.parametrize("overlap", [False, True], ids=["new_dates", "overlapping_dates"])
+def test_sqlite_bulk_matches_row_by_row(tmp_path, sqlite_db, overlap):
+    batch = _batch(overlap)
+    expected = _row_by_row(tmp_path, batch)
+
+    _setup(sqlite_db)
+    assert sqlite_db.add_nav_records_bulk(batch) == len(batch)
+
+    pd.testing.assert_frame_equal(_navs(sqlite_db), expected)
+
+@pytest.mark.parametrize("overlap", [False, True], ids=["new_dates", "overlapping_dates"])
+def test_supabase_bulk_matches_row_by_row(tmp_path, supabase_db, overlap):
+    batch = _batch(overlap)
+    expected = _row_by_row(tmp_path, batch)
+
+    _setup(supabase_db)
+    assert supabase_db.add_nav_records_bulk(batch) == len(batch)
+
+    pd.testing.assert_frame_equal(_navs(supabase_db), expected)
+
+def test_supabase_bulk_reads_neighbors_in_one_request(supabase_db):
+    _setup(supabase_db)
+    supabase_db.mock.reset_stats()
+
+    supabase_db.add_nav_records_bulk(_batch(overlap=True))
+
+    # 读取：范围内已有净值一次、各策略相邻净值一次（数据库函数或 in 查询）；写入：新记录和需修复的记录各一批。
+    # 数据库函数不存在时第一次调用返回 404，之后直接使用 in 查询
+    probes = 0 if supabase_db.mock.rpc else 1
+    assert supabase_db.mock.stats['requests'] <= 4 + probes
+
+def _upsert_repairs_return_rates(db):
+    _setup(db)
+    # 直接改写已存储的净值（含补录一条新日期），后续各条的收益率应随之修复
+    rows = pd.DataFrame({'strategy_id': [1, 1, 2], 'date': ['2024-01-03', '2024-01-04', '2024-01-09'],
+                         'nav_value': [1.5, 1.45, 2.5]})
+    result = db.bulk_upsert("nav_records", rows, on_conflict="strategy_id,date")
+    assert result['written'] == 3
+
+    navs = _navs(db)
+    expected = navs.groupby('strategy_id')['nav_value'].pct_change() * 100
+    pd.testing.assert_series_equal(navs['return_rate'], expected, check_names=False)
+    # 最新净值汇总表在 UPSERT 更新已有记录时同样保持正确
+    latest = db.get_latest_navs().set_index('strategy_id')['nav_value']
+    assert latest.to_dict() == navs.groupby('strategy_id')['nav_value'].last().to_dict()
+
+def test_sqlite_bulk_upsert_repairs_return_rates(sqlite_db):
+    _upsert_repairs_return_rates(sqlite_db)
+
+def test_supabase_bulk_upsert_repairs_return_rates(supabase_db):
+    _upsert_repairs_return_rates(supabase_db)
+
+def test_supabase_recompute_since_reads_prior_navs_in_one_request(supabase_db):
+    _setup(supabase_db)
+    # 绕过接口直接改写服务端的收益率，模拟其他客户端写入的过期数据
+    conn = supabase_db.mock.conn
+    conn.execute("UPDATE nav_records SET return_rate = 99 WHERE date >= '2024-01-09'")
+    supabase_db.mock.reset_stats()
+
+    updated = supabase_db.recompute_return_rates(since="2024-01-10")
+    requests = supabase_db.mock.stats['requests']
+
+    navs = _navs(supabase_db)
+    expected = navs.groupby('strategy_id')['nav_value'].pct_change() * 100
+    after = navs['date'] >= '2024-01-10'
+    assert updated == int(after.sum())
+    pd.testing.assert_series_equal(navs.loc[after, 'return_rate'], expected[after], check_names=False)
+    # since 之前的记录不修改
+    assert (navs.loc[(navs['date'] == '2024-01-09'), 'return_rate'] == 99).all()
+    # 读取 since 之后的净值、各策略上期净值各一次（数据库函数不存在时多一次探测），写回一批
+    probes = 0 if supabase_db.mock.rpc else 1
+    assert requests <= 3 + probes
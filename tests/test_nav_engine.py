@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+产品净值序列（get_product_nav_series）与逐日计算（calculate_product_nav）的一致性
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mock_postgrest import MockPostgREST
+from nav_engine import strategy_stats
+from supabase_database import SupabaseManager
+
+def _seed(db):
+    """三个策略（净值日期错开、各自缺失部分交易日），产品权重在区间内两次调整，返回产品ID"""
+    rng = np.random.default_rng(11)
+    for name in ("策略A", "策略B", "策略C"):
+        db.add_strategy(name, start_date="2024-01-01")
+    dates = pd.bdate_range("2024-01-01", "2024-03-29")
+    navs = []
+    for sid, first in ((1, 0), (2, 5), (3, 20)):
+        nav = 1.0
+        for nav_date in dates[first:]:
+            nav *= 1 + rng.normal(0.001, 0.01)
+            # 每个策略随机缺失约两成交易日
+            if rng.random() < 0.8:
+                navs.append({'strategy_id': sid, 'date': nav_date.strftime('%Y-%m-%d'), 'nav_value': round(nav, 4)})
+    db.add_nav_records_bulk(pd.DataFrame(navs))
+
+    db.add_product("产品甲")
+    product_id = 1
+    db.set_product_strategy_weight(product_id, 1, 0.6, "2024-01-10")
+    db.set_product_strategy_weight(product_id, 2, 0.4, "2024-01-10")
+    # 策略C 在有净值之前已生效，策略A 的权重两次调整
+    db.set_product_strategy_weight(product_id, 3, 0.2, "2024-01-15")
+    db.set_product_strategy_weight(product_id, 1, 0.3, "2024-02-01")
+    db.set_product_strategy_weight(product_id, 1, 0.5, "2024-03-01")
+    return product_id
+
+def _scalar_navs(db, product_id, dates):
+    return [db.calculate_product_nav(product_id, nav_date) for nav_date in dates]
+
+@pytest.mark.parametrize("start, end", [
+    (None, "2024-03-29"),
+    ("2024-01-03", "2024-02-15"),
+    # 开始日期不是任何策略的净值日期，结束日期在权重调整当天
+    ("2024-01-13", "2024-03-01"),
+])
+def test_series_matches_scalar_sqlite(sqlite_db, start, end):
+    product_id = _seed(sqlite_db)
+
+    series = sqlite_db.get_product_nav_series(product_id, start, end)
+
+    assert not series.empty
+    assert series['date'].is_monotonic_increasing
+    expected = _scalar_navs(sqlite_db, product_id, series['date'])
+    np.testing.assert_allclose(series['nav_value'], expected, rtol=1e-12)
+
+    # NavPanel 路径：启用内存面板后 calculate_product_nav 的 as-of 净值改为读内存
+    sqlite_db.enable_nav_panel()
+    expected_panel = _scalar_navs(sqlite_db, product_id, series['date'])
+    np.testing.assert_allclose(series['nav_value'], expected_panel, rtol=1e-12)
+
+def test_series_dates_cover_all_strategy_nav_dates(sqlite_db):
+    product_id = _seed(sqlite_db)
+
+    series = sqlite_db.get_product_nav_series(product_id, "2024-01-03", "2024-02-15")
+
+    navs = sqlite_db.get_nav_records(start_date="2024-01-03", end_date="2024-02-15", columns=['date'])
+    assert list(series['date']) == sorted(navs['date'].unique())
+    # 第一次权重生效前按 1.0 计算
+    assert (series.loc[series['date'] < "2024-01-10", 'nav_value'] == 1.0).all()
+
+def test_series_matches_scalar_supabase(supabase_db):
+    product_id = _seed(supabase_db)
+
+    series = supabase_db.get_product_nav_series(product_id, "2024-01-13", "2024-03-01")
+
+    expected = _scalar_navs(supabase_db, product_id, series['date'])
+    np.testing.assert_allclose(series['nav_value'], expected, rtol=1e-12)
+
+@pytest.fixture
+def rpc_and_fallback(tmp_path):
+    """同一个模拟服务上的两个 SupabaseManager：调用数据库函数的和在客户端计算的"""
+    mock = MockPostgREST(str(tmp_path / "mock.db"))
+    mock.start()
+    rpc = SupabaseManager(mock.url, "anon")
+    fallback = SupabaseManager(mock.url, "anon", use_rpc=False)
+    yield rpc, fallback, mock
+    rpc.close()
+    fallback.close()
+    mock.stop()
+
+@pytest.mark.parametrize("start, end", [(None, "2024-03-29"), ("2024-01-13", "2024-03-01")])
+def test_product_nav_series_rpc_matches_fallback(rpc_and_fallback, start, end):
+    rpc, fallback, mock = rpc_and_fallback
+    product_id = _seed(rpc)
+
+    expected = rpc.get_product_nav_series(product_id, start, end)
+    mock.reset_stats()
+    series = fallback.get_product_nav_series(product_id, start, end)
+
+    # 权重、区间内净值、各策略开始日期之前的最后一条净值各一次请求
+    assert mock.stats['requests'] <= 3
+    assert list(series['date']) == list(expected['date'])
+    np.testing.assert_allclose(series['nav_value'], expected['nav_value'], rtol=1e-9)
+
+def test_product_navs_rpc_matches_fallback(rpc_and_fallback):
+    rpc, fallback, mock = rpc_and_fallback
+    product_id = _seed(rpc)
+    rpc.add_product("产品乙")
+
+    # 权重生效前、周末（策略均无当天净值）、权重调整当天、最后一个净值日之后
+    for nav_date in ("2024-01-05", "2024-01-13", "2024-02-01", "2024-03-01", "2024-04-15"):
+        expected = rpc.get_product_navs([product_id, 2], nav_date)
+        mock.reset_stats()
+        navs = fallback.get_product_navs([product_id, 2], nav_date)
+
+        # 权重一次、各策略当天的 as-of 净值一次
+        assert mock.stats['requests'] <= 2
+        assert navs.keys() == expected.keys()
+        np.testing.assert_allclose([navs[pid] for pid in expected], list(expected.values()), rtol=1e-9)
+        assert navs[2] == 1.0
+        assert navs[product_id] == pytest.approx(fallback.calculate_product_nav(product_id, nav_date), rel=1e-9)
+
+def _loop_stats(nav_df, initial_navs=None):
+    """逐策略用 pandas 计算的统计（收益率分析页原来的实现），作为 strategy_stats 的对照"""
+    rows = []
+    for strategy_id, navs in nav_df.sort_values(['strategy_id', 'date']).groupby('strategy_id'):
+        returns = navs['return_rate'].dropna()
+        initial = navs['nav_value'].iloc[0] if initial_navs is None else initial_navs[strategy_id]
+        rows.append({
+            'strategy_id': strategy_id,
+            'record_count': len(navs),
+            'return_count': len(returns),
+            'last_nav': navs['nav_value'].iloc[-1],
+            'cumulative_return': (navs['nav_value'].iloc[-1] / initial - 1) * 100,
+            'mean_return': returns.mean(),
+            'return_std': returns.std(),
+            'max_return': returns.max(),
+            'min_return': returns.min(),
+        })
+    return pd.DataFrame(rows)
+
+def _stats_navs():
+    """覆盖边界情况的净值记录（打乱顺序）"""
+    rng = np.random.default_rng(23)
+    dates = pd.bdate_range("2024-01-01", periods=40).strftime('%Y-%m-%d')
+    frames = []
+    # 策略1：普通的随机游走，第一条没有收益率
+    nav = 1 + np.cumsum(rng.normal(0, 0.01, len(dates)))
+    frames.append(pd.DataFrame({'strategy_id': 1, 'date': dates, 'nav_value': nav,
+                                'return_rate': np.r_[np.nan, (nav[1:] / nav[:-1] - 1) * 100]}))
+    # 策略2：只有一条记录（没有收益率）
+    frames.append(pd.DataFrame({'strategy_id': [2], 'date': [dates[5]], 'nav_value': [1.2], 'return_rate': [np.nan]}))
+    # 策略3：净值不变，收益率全为 0，中间夹有缺失的收益率
+    frames.append(pd.DataFrame({'strategy_id': 3, 'date': dates[:10], 'nav_value': 1.0,
+                                'return_rate': [np.nan, 0, 0, np.nan, 0, 0, 0, np.nan, 0, 0]}))
+    # 策略4：只有一条收益率（样本标准差为 NaN）
+    frames.append(pd.DataFrame({'strategy_id': 4, 'date': dates[:2], 'nav_value': [1.0, 1.1],
+                                'return_rate': [np.nan, 10.0]}))
+    # 策略5：全部收益率缺失
+    frames.append(pd.DataFrame({'strategy_id': 5, 'date': dates[:3], 'nav_value': [1.0, 0.9, 0.95],
+                                'return_rate': np.nan}))
+    navs = pd.concat(frames, ignore_index=True)
+    return navs.sample(frac=1, random_state=5).reset_index(drop=True)
+
+@pytest.mark.parametrize("initial_navs", [None, {1: 1.0, 2: 1.1, 3: 0.8, 4: 1.0, 5: 2.0}],
+                         ids=["first_nav", "initial_navs"])
+def test_strategy_stats_matches_per_strategy_loop(initial_navs):
+    navs = _stats_navs()
+
+    stats = strategy_stats(navs, initial_navs)
+
+    expected = _loop_stats(navs, initial_navs)
+    pd.testing.assert_frame_equal(stats, expected, check_dtype=False, rtol=1e-12)
+    assert stats.loc[stats['strategy_id'] == 2, ['record_count', 'return_count']].values.tolist() == [[1, 0]]
+    assert stats.loc[stats['strategy_id'] == 3, 'return_std'].iloc[0] == 0.0
+
+def test_strategy_stats_without_date_uses_row_order():
+    navs = _stats_navs().sort_values(['strategy_id', 'date']).drop(columns='date').reset_index(drop=True)
+
+    stats = strategy_stats(navs)
+
+    last = navs.groupby('strategy_id')['nav_value'].last()
+    np.testing.assert_allclose(stats.set_index('strategy_id')['last_nav'], last)
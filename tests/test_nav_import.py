@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Excel净值流式导入的统计与去重
+"""
+
+from datetime import date
+
+from openpyxl import Workbook
+
+from nav_import import import_nav_excel
+
+def _workbook(path, rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['策略名称', '日期', '净值'])
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return path
+
+def test_duplicates_across_chunks_keep_the_last_value(tmp_path, sqlite_db):
+    sqlite_db.add_strategy("策略A", start_date="2024-01-01")
+    sqlite_db.add_strategy("策略B", start_date="2024-01-01")
+    path = _workbook(tmp_path / "navs.xlsx", [
+        ["策略A", date(2024, 1, 2), 1.01],
+        ["策略A", date(2024, 1, 3), 1.02],
+        ["策略B", date(2024, 1, 2), 2.01],
+        # 下一块：与上一块重复的 (策略A, 2024-01-02)，以及块内重复
+        ["策略A", date(2024, 1, 2), 1.05],
+        ["策略B", date(2024, 1, 3), 2.02],
+        ["策略B", date(2024, 1, 3), 2.03],
+        # 再下一块：与第一块重复
+        ["策略B", date(2024, 1, 2), 2.00],
+        ["策略未知", date(2024, 1, 2), 1.00],
+    ])
+
+    result = import_nav_excel(sqlite_db, str(path), chunk_size=3)
+
+    stored = sqlite_db.get_nav_records(columns=['strategy_id', 'date', 'nav_value'])
+    assert result['processed'] == 8
+    assert len(stored) == 4
+    # 只在块内去重（内存与文件大小无关），跨块重复的记录由批量写入覆盖，计入写入条数
+    assert result['duplicates'] == 1
+    assert result['imported'] == 6
+    assert result['invalid'] == 1
+    # 同一策略同一日期以文件中最后一条为准
+    latest = {(row.strategy_id, row.date): row.nav_value for row in stored.itertuples(index=False)}
+    assert latest[(1, '2024-01-02')] == 1.05
+    assert latest[(2, '2024-01-02')] == 2.00
+    assert latest[(2, '2024-01-03')] == 2.03
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+内存净值面板的增量更新和后台重新加载
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from nav_panel import NavPanel
+
+def _records(strategies, dates, seed=5):
+    rng = np.random.default_rng(seed)
+    rows = [{'strategy_id': sid, 'date': nav_date, 'nav_value': float(rng.uniform(0.9, 1.1))}
+            for sid in strategies for nav_date in dates if rng.random() < 0.8]
+    return pd.DataFrame(rows)
+
+def _assert_same(panel, records):
+    expected = NavPanel(records)
+    np.testing.assert_array_equal(panel.dates, expected.dates)
+    assert panel.strategy_ids == expected.strategy_ids
+    np.testing.assert_array_equal(panel.matrix, expected.matrix)
+    pd.testing.assert_frame_equal(panel.records(), expected.records())
+
+def test_appending_later_dates_does_not_rebuild(monkeypatch):
+    dates = pd.bdate_range("2024-01-01", periods=60).strftime('%Y-%m-%d')
+    history = _records([1, 2, 3], dates[:40])
+    panel = NavPanel(history)
+
+    rebuilds = []
+    rebuild = panel._rebuild_matrix
+    monkeypatch.setattr(panel, "_rebuild_matrix", lambda: rebuilds.append(1) or rebuild())
+
+    appended = [history]
+    for nav_date in dates[40:]:
+        day = _records([1, 2, 3], [nav_date], seed=len(appended))
+        panel.update_many(day)
+        appended.append(day)
+    # 同一天再次写入（覆盖）也不需要重建
+    panel.update(2, dates[-1], 1.2345)
+    appended.append(pd.DataFrame({'strategy_id': [2], 'date': [dates[-1]], 'nav_value': [1.2345]}))
+
+    assert rebuilds == []
+    all_records = pd.concat(appended, ignore_index=True).drop_duplicates(['strategy_id', 'date'], keep='last')
+    _assert_same(panel, all_records)
+    assert panel.nav_asof(2, dates[-1]) == 1.2345
+
+def test_backfill_and_new_strategy_rebuild():
+    dates = pd.bdate_range("2024-01-01", periods=30).strftime('%Y-%m-%d')
+    history = _records([1, 2], dates[10:])
+    panel = NavPanel(history)
+
+    backfill = pd.DataFrame({'strategy_id': [1, 2], 'date': [dates[0], dates[5]], 'nav_value': [0.95, 1.05]})
+    new_strategy = pd.DataFrame({'strategy_id': [7], 'date': [dates[-1]], 'nav_value': [1.5]})
+    panel.update_many(backfill)
+    panel.update_many(new_strategy)
+
+    _assert_same(panel, pd.concat([history, backfill, new_strategy], ignore_index=True))
+
+def test_refresh_if_stale_runs_in_background_and_keeps_concurrent_writes():
+    dates = pd.bdate_range("2024-01-01", periods=10).strftime('%Y-%m-%d')
+    panel = NavPanel(_records([1], dates[:5]))
+    server = _records([1, 2], dates[:8])
+    started, release = threading.Event(), threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        return server
+
+    panel.built_at -= 100
+    panel.refresh_if_stale(fetch, max_age=10)
+    assert started.wait(5)
+    # 加载期间调用方不被阻塞，仍读取现有数据；期间的写入在加载完成后保留
+    assert panel.nav_asof(2, dates[7]) is None
+    panel.update(1, dates[9], 2.0)
+    release.set()
+    for thread in threading.enumerate():
+        if thread.name == "nav-panel-refresh":
+            thread.join(5)
+
+    assert panel.nav_asof(2, dates[7]) == server[server['strategy_id'] == 2]['nav_value'].iloc[-1]
+    assert panel.nav_asof(1, dates[9]) == 2.0
+    # 刚加载过，不会再次加载
+    panel.refresh_if_stale(lambda: (_ for _ in ()).throw(AssertionError("不应重新加载")), max_age=10)
+
+def test_refresh_failure_keeps_existing_panel():
+    dates = pd.bdate_range("2024-01-01", periods=5).strftime('%Y-%m-%d')
+    history = _records([1, 2], dates)
+    panel = NavPanel(history)
+    panel.built_at -= 100
+
+    def fetch():
+        raise ConnectionError("offline")
+
+    panel.refresh_if_stale(fetch, max_age=10)
+    for thread in threading.enumerate():
+        if thread.name == "nav-panel-refresh":
+            thread.join(5)
+
+    _assert_same(panel, history)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+页面读取经 DataAccess.gather 并发执行：在应用使用的各种后端上，页面内互不依赖的读取同时进行
+"""
+
+import threading
+import time
+
+import pytest
+import streamlit as st
+
+from app_pages import PAGES, render
+from cached_database import CachedDatabaseManager
+from data_access import DataAccess
+from database import DatabaseManager
+from hybrid_database import HybridDatabaseManager
+from mock_postgrest import MockPostgREST
+from supabase_database import SupabaseManager
+
+# 页面 -> 应同时进行的读取
+PAGE_READS = {
+    "overview": ('get_table_counts', 'get_latest_navs'),
+    "charts": ('get_strategies', 'get_nav_records'),
+    "investors": ('get_investors', 'get_all_portfolios', 'get_products'),
+}
+
+def _seed(db):
+    db.add_strategy("策略A", start_date="2024-01-01")
+    strategy_id = int(db.get_strategies()['id'].iloc[0])
+    db.add_nav_record(strategy_id, "2024-01-02", 1.01)
+    db.add_investor("张三")
+    db.add_product("产品甲")
+
+@pytest.fixture(params=["sqlite", "hybrid", "supabase"])
+def backend(request, tmp_path):
+    """返回 (app.py 中被缓存层包装的管理器, 实际执行读取的管理器)"""
+    if request.param == "sqlite":
+        db = DatabaseManager(str(tmp_path / "fund.db"))
+        _seed(db)
+        yield db, db
+        db.close()
+        return
+
+    mock = MockPostgREST(str(tmp_path / "mock.db"))
+    mock.start()
+    remote = SupabaseManager(mock.url, "anon")
+    _seed(remote)
+    if request.param == "supabase":
+        yield remote, remote
+        remote.close()
+    else:
+        db = HybridDatabaseManager(remote, str(tmp_path / "replica.db"), start=False)
+        db.sync(full=True)
+        yield db, db.local
+        db.close()
+    mock.stop()
+
+@pytest.mark.parametrize("page", list(PAGE_READS))
+def test_page_reads_run_concurrently(backend, page, monkeypatch):
+    db, reader = backend
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow(method):
+        def read(*args, **kwargs):
+            with lock:
+                active.append(threading.current_thread())
+                peak.append(len(active))
+            try:
+                time.sleep(0.2)
+                return method(*args, **kwargs)
+            finally:
+                with lock:
+                    active.remove(threading.current_thread())
+        return read
+
+    for name in PAGE_READS[page]:
+        monkeypatch.setattr(reader, name, slow(getattr(reader, name)))
+
+    st.cache_data.clear()
+    access = DataAccess(CachedDatabaseManager(db), ttl=None)
+    page_name = next(name for name, module in PAGES.items() if module == page)
+    render(page_name, access)
+
+    assert max(peak) == len(PAGE_READS[page])
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+SupabaseManager.gather 并发读取与错误信息显示
+"""
+
+import threading
+
+import streamlit as st
+
+def test_gather_matches_sequential_reads(supabase_db):
+    supabase_db.add_strategy("策略A", start_date="2024-01-01")
+    supabase_db.add_investor("张三")
+    supabase_db.add_product("产品甲")
+    reads = [supabase_db.get_strategies, supabase_db.get_investors, supabase_db.get_products,
+             lambda: supabase_db.get_table_counts()]
+
+    results = supabase_db.gather(*reads)
+
+    expected = [read() for read in reads]
+    for result, value in zip(results[:3], expected[:3]):
+        assert result.equals(value)
+    assert results[3] == expected[3] == {'strategies': 1, 'investors': 1, 'products': 1, 'nav_records': 0}
+
+def test_gather_reports_errors_in_calling_thread(supabase_db, monkeypatch):
+    shown = []
+    monkeypatch.setattr(st, "error", lambda message: shown.append((message, threading.current_thread())))
+
+    results = supabase_db.gather(supabase_db.get_strategies,
+                                 lambda: supabase_db._make_request("GET", "no_such_table"))
+
+    assert results[0].empty and results[1].empty
+    assert len(shown) == 1
+    assert "404" in shown[0][0]
+    assert shown[0][1] is threading.current_thread()
@@ -11,6 +11,65 @@ import psycopg2
 from database import DatabaseManager
 import pandas as pd
 
+# PostgreSQL结构迁移，版本 1、2 与 database.MIGRATIONS 对应，只能追加
+POSTGRES_MIGRATIONS = [
+    (1, "热点查询索引", [
+        "CREATE INDEX IF NOT EXISTS idx_investments_investor_date ON investments(investor_id, investment_date);",
+        "CREATE INDEX IF NOT EXISTS idx_investments_product_date ON investments(product_id, investment_date);",
+        "CREATE INDEX IF NOT EXISTS idx_psw_product_date ON product_strategy_weights(product_id, effective_date);",
+        "CREATE INDEX IF NOT EXISTS idx_nav_records_date ON nav_records(date);",
+        "ANALYZE;",
+    ]),
+    (2, "策略最新净值汇总表", [
+        lambda cursor: cursor.execute(_read_sql_file("supabase_latest_nav.sql")),
+    ]),
+    # SQLite 的版本 3 只修正其触发器，PostgreSQL 无需处理，这里从版本 3 开始为各自独立的迁移
+    (3, "产品净值与持仓估值函数", [
+        lambda cursor: cursor.execute(_read_sql_file("supabase_product_nav.sql")),
+    ]),
+    (4, "批量写入净值的相邻净值函数", [
+        lambda cursor: cursor.execute(_read_sql_file("supabase_nav_neighbors.sql")),
+    ]),
+    (5, "离线推送的幂等键", [
+        lambda cursor: cursor.execute(_read_sql_file("supabase_sync_keys.sql")),
+    ]),
+]
+
+def _read_sql_file(name):
+    """读取与本脚本同目录的SQL文件"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), name), encoding='utf-8') as f:
+        return f.read()
+
+def apply_postgresql_migrations(cursor):
+    """执行尚未应用的PostgreSQL结构迁移，返回迁移后的版本号"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+    # 防止多个进程同时迁移
+    cursor.execute("LOCK TABLE schema_migrations IN EXCLUSIVE MODE;")
+    cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations;")
+    current = cursor.fetchone()[0]
+    
+    for version, description, statements in POSTGRES_MIGRATIONS:
+        if version <= current:
+            continue
+        for sql in statements:
+            if callable(sql):
+                sql(cursor)
+            else:
+                cursor.execute(sql)
+        cursor.execute(
+            "INSERT INTO schema_migrations (version, description) VALUES (%s, %s);",
+            (version, description)
+        )
+        current = version
+    
+    return current
+
 def create_postgresql_database():
     """创建PostgreSQL数据库结构"""
     
@@ -116,11 +175,14 @@ def create_postgresql_database():
     for sql in indexes_sql:
         cursor.execute(sql)
     
+    # 执行结构迁移
+    version = apply_postgresql_migrations(cursor)
+    
     conn.commit()
     cursor.close()
     conn.close()
     
-    print("✅ PostgreSQL数据库创建完成")
+    print(f"✅ PostgreSQL数据库创建完成（结构版本 {version}）")
 
 def migrate_data_from_sqlite():
     """从SQLite迁移数据到PostgreSQL"""
@@ -58,6 +58,7 @@ def generate_sample_data():
             end_date = datetime.now().date()
             
             # 为每个策略生成净值数据
+            nav_rows = []
             for strategy_id in strategy_ids:
                 current_date = start_date
                 current_nav = 1.000
@@ -72,10 +73,13 @@ def generate_sample_data():
                         
                         # 每周五录入净值
                         if current_date.weekday() == 4:  # 周五
-                            db.add_nav_record(strategy_id, current_date.isoformat(), round(current_nav, 3))
+                            nav_rows.append((strategy_id, current_date.isoformat(), round(current_nav, 3)))
                     
                     current_date += timedelta(days=1)
             
+            # 全部净值一次批量写入（按批次分块提交）
+            db.add_nav_records_bulk(pd.DataFrame(nav_rows, columns=['strategy_id', 'date', 'nav_value']))
+            
             st.success("✅ 净值数据生成完成")
             progress_bar.progress(50)
             
@@ -154,9 +158,14 @@ def generate_sample_data():
                 (product_ids[6], [(strategy_ids[3], 0.8), (strategy_ids[6], 0.2)])
             ]
             
-            for product_id, strategies in product_strategies:
-                for strategy_id, weight in strategies:
-                    db.set_product_strategy_weight(product_id, strategy_id, weight, "2023-01-01")
+            weight_rows = [
+                (product_id, strategy_id, weight, "2023-01-01")
+                for product_id, strategies in product_strategies
+                for strategy_id, weight in strategies
+            ]
+            db.set_product_strategy_weights_bulk(
+                pd.DataFrame(weight_rows, columns=['product_id', 'strategy_id', 'weight', 'effective_date'])
+            )
             
             st.success("✅ 产品策略权重配置完成")
             progress_bar.progress(85)
@@ -167,6 +176,7 @@ def generate_sample_data():
             # 为每个投资人生成投资记录
             investment_amounts = [100000, 200000, 500000, 1000000, 2000000, 5000000, 10000000]
             
+            investment_rows = []
             for investor_id in investor_ids[:12]:  # 前12个投资人
                 # 每个投资人投资1-3个产品
                 num_products = random.randint(1, 3)
@@ -183,21 +193,25 @@ def generate_sample_data():
                         "2024-05-01", "2024-06-01", "2024-07-01", "2024-08-01"
                     ])
                     
-                    db.add_investment(investor_id, product_id, amount, investment_date, "investment")
+                    investment_rows.append((investor_id, product_id, amount, investment_date, "investment"))
                     
                     # 50%概率有追加投资
                     if random.random() < 0.5:
                         additional_amount = amount * random.uniform(0.2, 0.8)
                         later_date = (datetime.strptime(investment_date, "%Y-%m-%d") + timedelta(days=random.randint(30, 180))).strftime("%Y-%m-%d")
                         if datetime.strptime(later_date, "%Y-%m-%d").date() <= datetime.now().date():
-                            db.add_investment(investor_id, product_id, additional_amount, later_date, "investment")
+                            investment_rows.append((investor_id, product_id, additional_amount, later_date, "investment"))
                     
                     # 20%概率有部分赎回
                     if random.random() < 0.2:
                         redemption_amount = amount * random.uniform(0.1, 0.3)
                         redemption_date = (datetime.strptime(investment_date, "%Y-%m-%d") + timedelta(days=random.randint(90, 270))).strftime("%Y-%m-%d")
                         if datetime.strptime(redemption_date, "%Y-%m-%d").date() <= datetime.now().date():
-                            db.add_investment(investor_id, product_id, -redemption_amount, redemption_date, "redemption")
+                            investment_rows.append((investor_id, product_id, -redemption_amount, redemption_date, "redemption"))
+            
+            db.add_investments_bulk(pd.DataFrame(
+                investment_rows, columns=['investor_id', 'product_id', 'amount', 'investment_date', 'type']
+            ))
             
             st.success("✅ 投资交易记录生成完成")
             progress_bar.progress(100)
@@ -208,21 +222,19 @@ def generate_sample_data():
             st.subheader("📊 数据统计")
             col1, col2, col3, col4 = st.columns(4)
             
+            counts = db.get_table_counts()
+            
             with col1:
-                strategies = db.get_strategies()
-                st.metric("策略数量", len(strategies))
+                st.metric("策略数量", counts['strategies'])
             
             with col2:
-                investors = db.get_investors()
-                st.metric("投资人数量", len(investors))
+                st.metric("投资人数量", counts['investors'])
             
             with col3:
-                products = db.get_products()
-                st.metric("产品数量", len(products))
+                st.metric("产品数量", counts['products'])
             
             with col4:
-                nav_records = db.get_nav_records()
-                st.metric("净值记录数", len(nav_records))
+                st.metric("净值记录数", counts['nav_records'])
             
             st.success("🎉 云端示例数据生成完成！现在您可以体验完整的私募基金管理系统了！")
             st.info("💡 建议：现在可以访问各个功能页面查看数据，体验系统的完整功能。")